@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Load test for todoist-mcp-server
+
+Starts a fake Todoist API and the MCP server, then drives a mix of tool calls from many
+simulated agents and reports throughput, latency percentiles, server memory and open
+connections every few seconds.
+
+Usage:
+    python load_test.py                                    # 100 agents over stdio for 30s
+    python load_test.py --transport streamable-http --workers 4 --agents 500
+    python load_test.py --mix list_active_tasks=5,create_task=1 --api-latency 0.05
+    python load_test.py --help                             # Show help
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from tests.fake_api import PROJECT_NAMES
+from todoist_mcp_server.recording import percentile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MIX = {
+    "list_active_tasks": 4,
+    "find_project": 2,
+    "agenda": 2,
+    "task_stats": 1,
+    "get_task_tree": 1,
+    "list_completed_tasks": 1,
+    "create_task": 1,
+}
+
+
+def tool_arguments(tool, rng):
+    """Plausible arguments for one call to `tool`"""
+    project = rng.choice(PROJECT_NAMES)
+    if tool == "create_task":
+        return {"content": f"Load test task {rng.randrange(10 ** 6)}", "project_name": project}
+    if tool == "find_project":
+        return {"name": project.lower()}
+    if tool == "list_active_tasks":
+        return {"project_name": project} if rng.random() < 0.5 else {}
+    if tool == "task_stats":
+        return {"group_by": ["project", "priority"]}
+    return {}
+
+
+def is_error(result):
+    """Whether a tool call failed or returned an {"error": ...} payload"""
+    if result.isError:
+        return True
+    try:
+        payload = json.loads(result.content[0].text) if result.content else {}
+    except (ValueError, AttributeError):
+        return False
+    return isinstance(payload, dict) and "error" in payload
+
+
+def parse_mix(text):
+    """Parse "tool=weight,tool=weight" into a dict"""
+    mix = {}
+    for part in text.split(","):
+        tool, _, weight = part.partition("=")
+        mix[tool.strip()] = float(weight or 1)
+    return mix
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout:g}s")
+
+
+def descendants(pid):
+    """PIDs of all processes below `pid` (Linux only)"""
+    found = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as children:
+                for child in children.read().split():
+                    found.append(int(child))
+                    found.extend(descendants(int(child)))
+    except OSError:
+        pass
+    return found
+
+
+def rss_mb(pids):
+    """Combined resident memory of `pids` in MB, or None where /proc isn't available"""
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            return None
+    return round(total / 1024, 1)
+
+
+def established(port):
+    """Established TCP connections accepted on local `port` (Linux only)"""
+    count = 0
+    for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(table) as connections:
+                next(connections)
+                for line in connections:
+                    fields = line.split()
+                    if int(fields[1].rsplit(":", 1)[1], 16) == port and fields[3] == "01":
+                        count += 1
+        except (OSError, StopIteration):
+            pass
+    return count
+
+
+class Metrics:
+    """Call latencies, bucketed per reporting interval"""
+
+    def __init__(self):
+        self.window = []
+        self.latencies = []
+        self.errors = {}
+        self.samples = []
+
+    def record(self, tool, latency, error):
+        self.window.append(latency)
+        self.latencies.append(latency)
+        if error:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+
+    def sample(self, elapsed, interval, **gauges):
+        window, self.window = self.window, []
+        sample = {
+            "t": round(elapsed, 1),
+            "calls": len(window),
+            "throughput": round(len(window) / interval, 1),
+            "p50": round(percentile(window, 50) * 1000, 1),
+            "p95": round(percentile(window, 95) * 1000, 1),
+            "p99": round(percentile(window, 99) * 1000, 1),
+            **gauges,
+        }
+        self.samples.append(sample)
+        return sample
+
+
+async def agent(session, number, mix, deadline, metrics, think_time):
+    rng = random.Random(number)
+    tools, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        tool = rng.choices(tools, weights)[0]
+        started = time.perf_counter()
+        try:
+            result = await session.call_tool(tool, tool_arguments(tool, rng))
+            error = is_error(result)
+        except Exception:
+            error = True
+        metrics.record(tool, time.perf_counter() - started, error)
+        if think_time:
+            await asyncio.sleep(rng.expovariate(1 / think_time))
+
+
+async def open_sessions(stack, args, env, server_port):
+    """One session per agent over HTTP; over stdio, agents share `--sessions` server processes"""
+    sessions = []
+    if args.transport == "stdio":
+        params = StdioServerParameters(command=sys.executable, args=["-m", "todoist_mcp_server.todoist"], env=env)
+        for _ in range(args.sessions):
+            read, write = await stack.enter_async_context(stdio_client(params, errlog=stack.enter_context(
+                open(os.devnull, "w"))))
+            sessions.append(await stack.enter_async_context(ClientSession(read, write)))
+    else:
+        url = f"http://127.0.0.1:{server_port}/mcp"
+        for _ in range(args.agents):
+            read, write, _ = await stack.enter_async_context(streamablehttp_client(url, timeout=60))
+            sessions.append(await stack.enter_async_context(ClientSession(read, write)))
+    for session in sessions:
+        await session.initialize()
+    return sessions
+
+
+async def run(args):
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    api_port, server_port = free_port(), free_port()
+    env = {**os.environ, "TODOIST_API_TOKEN": "load-test", "TODOIST_API_BASE_URL": f"http://127.0.0.1:{api_port}"}
+
+    processes = [subprocess.Popen(
+        [sys.executable, "-m", "tests.fake_api", "--port", str(api_port), "--tasks", str(args.tasks),
+         "--latency", str(args.api_latency)], cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)]
+    try:
+        await wait_for_port(api_port)
+        if args.transport == "streamable-http":
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "todoist_mcp_server.todoist", "--transport", "streamable-http",
+                 "--port", str(server_port), "--workers", str(args.workers)], env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+            await wait_for_port(server_port)
+
+        async with AsyncExitStack() as stack:
+            sessions = await open_sessions(stack, args, env, server_port)
+            server_pids = [pid for pid in descendants(os.getpid())
+                           if pid not in [processes[0].pid] + descendants(processes[0].pid)]
+            metrics = Metrics()
+            started = time.monotonic()
+            deadline = started + args.duration
+
+            async def report():
+                while True:
+                    await asyncio.sleep(args.interval)
+                    sample = metrics.sample(
+                        time.monotonic() - started, args.interval,
+                        rss_mb=rss_mb(server_pids),
+                        api_connections=established(api_port),
+                        client_connections=established(server_port) if args.transport != "stdio" else None)
+                    print(json.dumps(sample), flush=True)
+
+            reporter = asyncio.create_task(report())
+            await asyncio.gather(*(agent(sessions[i % len(sessions)], i, mix, deadline, metrics, args.think_time)
+                                   for i in range(args.agents)))
+            reporter.cancel()
+            elapsed = time.monotonic() - started
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+    calls = len(metrics.latencies)
+    return {
+        "transport": args.transport,
+        "agents": args.agents,
+        "calls": calls,
+        "errors": sum(metrics.errors.values()),
+        "errors_by_tool": metrics.errors,
+        "throughput": round(calls / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(metrics.latencies, 50) * 1000, 1),
+            "p95": round(percentile(metrics.latencies, 95) * 1000, 1),
+            "p99": round(percentile(metrics.latencies, 99) * 1000, 1),
+            "max": round(max(metrics.latencies, default=0.0) * 1000, 1),
+        },
+        "peak_rss_mb": max((sample["rss_mb"] or 0 for sample in metrics.samples), default=None),
+        "peak_api_connections": max((sample["api_connections"] for sample in metrics.samples), default=None),
+        "samples": metrics.samples,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test todoist-mcp-server against a fake Todoist API")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio",
+                        help="How agents talk to the server (default stdio)")
+    parser.add_argument("--agents", type=int, default=100, help="Simulated agents calling tools concurrently")
+    parser.add_argument("--sessions", type=int, default=1, help="Server processes the stdio agents share")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for streamable-http")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to generate load for")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between reports")
+    parser.add_argument("--think-time", type=float, default=0, help="Mean seconds an agent waits between calls")
+    parser.add_argument("--mix", help="Tool weights like list_active_tasks=4,create_task=1")
+    parser.add_argument("--tasks", type=int, default=500, help="Active tasks in the fake account")
+    parser.add_argument("--api-latency", type=float, default=0.02, help="Seconds the fake API takes per request")
+    parser.add_argument("--output", help="Also write the summary as JSON to this file")
+
+    args = parser.parse_args()
+    summary = asyncio.run(run(args))
+
+    print(json.dumps({key: value for key, value in summary.items() if key != "samples"}, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(summary, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ def mock_api_token():
 def mock_env(monkeypatch, mock_api_token):
     """Mock environment variables for testing"""
     monkeypatch.setenv("TODOIST_API_TOKEN", mock_api_token)
+    monkeypatch.setenv("TODOIST_RETRY_BACKOFF", "0")
 
 
 @pytest.fixture
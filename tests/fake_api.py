@@ -0,0 +1,181 @@
+"""
+In-memory stand-in for the Todoist REST API, for load testing without touching api.todoist.com.
+Used by load_test.py and the tests; it isn't part of the installed package.
+
+Serves the endpoints TodoistClient uses, with cursor pagination and a configurable latency,
+over a generated account of projects, sections, labels, active and completed tasks:
+
+    python -m tests.fake_api --port 8765 --tasks 2000 --latency 0.05
+
+Point the server at it with TODOIST_API_BASE_URL=http://127.0.0.1:8765 (any API token works).
+"""
+import argparse
+import asyncio
+import itertools
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+PROJECT_NAMES = ["Work", "Personal", "Errands", "Reading", "Fitness", "Home", "Travel", "Finance",
+                 "Side Project", "Learning", "Garden", "Family"]
+LABEL_NAMES = ["urgent", "waiting", "phone", "email", "deep-work", "quick", "someday", "review"]
+MAX_PAGE_SIZE = 200
+
+
+class FakeTodoist:
+    """
+    A generated Todoist account behind an ASGI app.
+
+    Every response is delayed by `latency` seconds plus `item_latency` per returned item, which
+    is enough to see how page sizes, caching and concurrency behave against a slow API.
+    """
+
+    def __init__(self, projects: int = 12, tasks: int = 500, completed: int = 1000, comments: int = 2,
+                 latency: float = 0.0, item_latency: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.item_latency = item_latency
+        self.requests = 0
+        self._ids = itertools.count(1)
+        rng = random.Random(seed)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        names = [PROJECT_NAMES[i % len(PROJECT_NAMES)] + (f" {i}" if i >= len(PROJECT_NAMES) else "")
+                 for i in range(projects)]
+        self.projects = [{"id": "inbox", "name": "Inbox", "inbox_project": True}] + [
+            {"id": f"p{i}", "name": name} for i, name in enumerate(names)
+        ]
+        self.sections = [{"id": f"s{i}", "project_id": project["id"], "name": f"Section {i}"}
+                         for i, project in enumerate(self.projects[1:])]
+        self.labels = [{"id": f"l{i}", "name": name} for i, name in enumerate(LABEL_NAMES)]
+
+        self.tasks: Dict[str, Dict] = {}
+        for _ in range(tasks):
+            task = self._new_task({
+                "content": f"Task {next(self._ids)}",
+                "project_id": rng.choice(self.projects)["id"],
+                "priority": rng.randint(1, 4),
+                "labels": rng.sample(LABEL_NAMES, rng.randint(0, 2)),
+            })
+            if rng.random() < 0.6:
+                task["due"] = {"date": (today + timedelta(days=rng.randint(-5, 20))).date().isoformat(),
+                               "is_recurring": False, "string": ""}
+            task["note_count"] = rng.randint(0, comments)
+
+        self.completed: List[Dict] = sorted(
+            ({"id": f"c{i}", "content": f"Done {i}", "project_id": rng.choice(self.projects)["id"],
+              "completed_at": (today - timedelta(minutes=rng.randint(0, 60 * 24 * 365))).isoformat() + "Z"}
+             for i in range(completed)),
+            key=lambda task: task["completed_at"], reverse=True)
+
+        self.app = Starlette(routes=[
+            Route("/projects", self.list_projects),
+            Route("/projects/{project_id}/collaborators", self.list_collaborators),
+            Route("/sections", self.list_sections),
+            Route("/labels", self.list_labels),
+            Route("/tasks", self.list_tasks, methods=["GET"]),
+            Route("/tasks", self.create_task, methods=["POST"]),
+            Route("/tasks/completed/by_completion_date", self.list_completed),
+            Route("/tasks/{task_id}/close", self.close_task, methods=["POST"]),
+            Route("/comments", self.list_comments),
+        ])
+
+    def _new_task(self, fields: Dict) -> Dict:
+        task_id = f"t{next(self._ids)}"
+        now = datetime.now().isoformat() + "Z"
+        task = {"id": task_id, "content": "", "description": "", "project_id": "inbox", "section_id": None,
+                "parent_id": None, "priority": 1, "labels": [], "due": None, "note_count": 0,
+                "added_at": now, "updated_at": now, **fields}
+        self.tasks[task_id] = task
+        return task
+
+    async def _respond(self, request: Request, body, status_code: int = 200) -> Response:
+        self.requests += 1
+        if not request.headers.get("authorization", "").startswith("Bearer "):
+            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        items = len(body.get("results", body.get("items", []))) if isinstance(body, dict) else 0
+        delay = self.latency + self.item_latency * items
+        if delay:
+            await asyncio.sleep(delay)
+        if body is None:
+            return Response(status_code=204)
+        return JSONResponse(body, status_code=status_code)
+
+    @staticmethod
+    def _page(request: Request, items: List[Dict], items_key: str = "results") -> Dict:
+        limit = min(int(request.query_params.get("limit", 50)), MAX_PAGE_SIZE)
+        start = int(request.query_params.get("cursor") or 0)
+        end = start + limit
+        return {items_key: items[start:end], "next_cursor": str(end) if end < len(items) else None}
+
+    async def list_projects(self, request: Request) -> Response:
+        return await self._respond(request, self._page(request, self.projects))
+
+    async def list_collaborators(self, request: Request) -> Response:
+        return await self._respond(request, {"results": [], "next_cursor": None})
+
+    async def list_sections(self, request: Request) -> Response:
+        return await self._respond(request, self._page(request, self.sections))
+
+    async def list_labels(self, request: Request) -> Response:
+        return await self._respond(request, self._page(request, self.labels))
+
+    async def list_tasks(self, request: Request) -> Response:
+        # Filter queries aren't parsed; they return every task, like the broadest filter would
+        project_id = request.query_params.get("project_id")
+        tasks = [task for task in self.tasks.values() if not project_id or task["project_id"] == project_id]
+        return await self._respond(request, self._page(request, tasks))
+
+    async def create_task(self, request: Request) -> Response:
+        fields = await request.json()
+        for label in fields.get("labels", []):
+            if all(existing["name"] != label for existing in self.labels):
+                self.labels.append({"id": f"l{len(self.labels)}", "name": label})
+        return await self._respond(request, self._new_task(fields))
+
+    async def close_task(self, request: Request) -> Response:
+        task = self.tasks.pop(request.path_params["task_id"], None)
+        if task is None:
+            return await self._respond(request, {"error": "Task not found"}, status_code=404)
+        self.completed.insert(0, {**task, "completed_at": datetime.now().isoformat() + "Z"})
+        return await self._respond(request, None)
+
+    async def list_completed(self, request: Request) -> Response:
+        since = request.query_params.get("since", "")
+        until = request.query_params.get("until", "9999")
+        tasks = [task for task in self.completed if since <= task["completed_at"] <= until]
+        return await self._respond(request, self._page(request, tasks, "items"))
+
+    async def list_comments(self, request: Request) -> Response:
+        task = self.tasks.get(request.query_params.get("task_id"))
+        comments = [{"id": f"{task['id']}-n{i}", "task_id": task["id"], "posted_at": task["added_at"],
+                     "content": f"Comment {i} on {task['content']}"}
+                    for i in range(task["note_count"])] if task else []
+        return await self._respond(request, self._page(request, comments))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Todoist API for load testing")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--projects", type=int, default=12, help="Projects in the generated account")
+    parser.add_argument("--tasks", type=int, default=500, help="Active tasks in the generated account")
+    parser.add_argument("--completed", type=int, default=1000, help="Completed tasks in the generated account")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--item-latency", type=float, default=0.0, help="Seconds added per returned item")
+
+    args = parser.parse_args()
+
+    import uvicorn
+
+    fake = FakeTodoist(projects=args.projects, tasks=args.tasks, completed=args.completed,
+                       latency=args.latency, item_latency=args.item_latency)
+    uvicorn.run(fake.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
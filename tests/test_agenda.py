@@ -0,0 +1,66 @@
+import itertools
+import pytest
+from datetime import date
+from todoist_mcp_server.agenda import DueIndex, recurrence
+
+
+def occurrences(rule, first, count=4):
+    return [day.isoformat() for day in itertools.islice(recurrence(rule)(first), count)]
+
+
+class TestRecurrence:
+    """Test cases for recurrence expansion"""
+
+    @pytest.mark.parametrize("rule,expected", [
+        ("every day", ["2024-01-31", "2024-02-01", "2024-02-02", "2024-02-03"]),
+        ("every 3 days", ["2024-01-31", "2024-02-03", "2024-02-06", "2024-02-09"]),
+        ("every other week", ["2024-01-31", "2024-02-14", "2024-02-28", "2024-03-13"]),
+        ("every weekday", ["2024-01-31", "2024-02-01", "2024-02-02", "2024-02-05"]),
+        ("every mon, fri", ["2024-02-02", "2024-02-05", "2024-02-09", "2024-02-12"]),
+        ("monthly", ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]),
+        ("every! 2 years", ["2024-01-31", "2026-01-31", "2028-01-31", "2030-01-31"]),
+        ("every monday at 9am", ["2024-02-05", "2024-02-12", "2024-02-19", "2024-02-26"]),
+        ("every mon at 9", ["2024-02-05", "2024-02-12", "2024-02-19", "2024-02-26"]),
+        ("every weekday at 17:30", ["2024-01-31", "2024-02-01", "2024-02-02", "2024-02-05"]),
+        ("every day at noon", ["2024-01-31", "2024-02-01", "2024-02-02", "2024-02-03"]),
+    ])
+    def test_rules(self, rule, expected):
+        """Test the supported recurrence forms"""
+        assert occurrences(rule, date(2024, 1, 31)) == expected
+
+    def test_unsupported_rule(self):
+        """Test that unknown rules are not expanded"""
+        assert recurrence("every last day") is None
+        assert recurrence("every jan 5") is None
+        assert recurrence("every mon at the office") is None
+
+
+@pytest.fixture
+def index():
+    return DueIndex([
+        {"id": "a", "due": {"date": "2024-01-12"}},
+        {"id": "b", "due": {"date": "2024-01-10", "datetime": "2024-01-10T15:00:00"}},
+        {"id": "c", "due": {"date": "2024-01-10", "datetime": "2024-01-10T09:00:00"}},
+        {"id": "d", "due": {"date": "2024-01-03"}},
+        {"id": "e", "due": None},
+        {"id": "f", "due": {"date": "2024-01-09", "is_recurring": True, "string": "every 2 days"}},
+        {"id": "g", "due": {"date": "2024-01-11", "is_recurring": True, "string": "every last day"}},
+        {"id": "h", "due": {"date": "2024-02-01", "is_recurring": True, "string": "every day"}},
+    ])
+
+
+class TestDueIndex:
+    """Test cases for the due-date index"""
+
+    def test_between(self, index):
+        """Test range queries merge one-off and recurring tasks in date and time order"""
+        result = [(day.isoformat(), task["id"]) for day, task in index.between(date(2024, 1, 10), date(2024, 1, 13))]
+
+        assert result == [
+            ("2024-01-10", "c"), ("2024-01-10", "b"), ("2024-01-11", "g"), ("2024-01-11", "f"),
+            ("2024-01-12", "a"), ("2024-01-13", "f"),
+        ]
+
+    def test_overdue(self, index):
+        """Test tasks due before the window"""
+        assert [task["id"] for task in index.overdue(date(2024, 1, 10))] == ["d", "f"]
@@ -0,0 +1,68 @@
+import pytest
+from todoist_mcp_server import breaker as breaker_module
+from todoist_mcp_server.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock"""
+    now = [1000.0]
+    monkeypatch.setattr(breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestCircuitBreaker:
+    """Test cases for the circuit breaker"""
+
+    def test_opens_after_consecutive_failures(self, clock):
+        """Test that only consecutive failures open the circuit"""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+        assert breaker.retry_after() == 30
+
+    def test_half_open_lets_one_probe_through(self, clock):
+        """Test that after the reset timeout a single probe is allowed"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+        breaker.record_failure()
+
+        clock[0] += 30
+        assert breaker.state == HALF_OPEN
+        assert breaker.retry_after() == 0
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, clock):
+        """Test that a failed probe reopens the circuit for another reset timeout"""
+        breaker = CircuitBreaker(failure_threshold=5, reset_timeout=10)
+        for _ in range(5):
+            breaker.record_failure()
+
+        clock[0] += 10
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.retry_after() == 10
+
+    def test_released_probe_can_be_retried(self, clock):
+        """Test that a probe given up without an outcome frees the slot"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record_failure()
+        clock[0] += 10
+
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.allow()
@@ -0,0 +1,76 @@
+import asyncio
+import pytest
+from todoist_mcp_server.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for the TTL cache"""
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL"""
+        cache = TTLCache(ttl=0)
+        cache.set("key", "value")
+        assert cache.get("key") is None
+
+        cache = TTLCache(ttl=60)
+        cache.set("key", "value")
+        assert cache.get("key") == "value"
+
+    def test_invalidate(self):
+        """Test invalidating single keys and everything"""
+        cache = TTLCache(ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        cache.invalidate("a")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.invalidate()
+        assert cache.get("b") is None
+        assert cache.get("c") is None
+
+    def test_peek_returns_expired_entries(self):
+        """Test that peek still sees expired and invalidated values"""
+        cache = TTLCache(ttl=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert cache.peek("a") == 1
+
+        cache = TTLCache(ttl=60)
+        cache.set("b", 2)
+        cache.invalidate("b")
+        assert cache.get("b") is None
+        assert cache.peek("b") == 2
+        assert cache.peek("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_coalesces_concurrent_loads(self):
+        """Test that concurrent misses call the loader once"""
+        cache = TTLCache(ttl=60)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert len(calls) == 1
+        assert cache._locks[asyncio.get_running_loop()] == {}
+
+    @pytest.mark.asyncio
+    async def test_get_or_load_does_not_cache_errors(self):
+        """Test that a failing loader leaves the cache empty"""
+        cache = TTLCache(ttl=60)
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("key", failing)
+        assert cache.get("key") is None
+        assert cache._locks[asyncio.get_running_loop()] == {}
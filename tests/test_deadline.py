@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+import httpx
+import respx
+from todoist_mcp_server.deadline import deadline, remaining, reserve, tool_budget, with_deadline
+from todoist_mcp_server.todoist_client import TodoistClient
+
+
+class TestDeadline:
+    """Test cases for deadline budgets"""
+
+    def test_tool_budget_from_env(self, monkeypatch):
+        """Test the default and per-tool budgets"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT", "12")
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT_AGENDA", "3")
+        assert tool_budget("create_task") == 12.0
+        assert tool_budget("agenda") == 3.0
+
+    @pytest.mark.asyncio
+    async def test_nested_deadlines_only_shrink(self):
+        """Test that an inner deadline can't extend the outer one"""
+        assert remaining() is None
+        assert reserve() is None
+
+        async with deadline(1):
+            async with deadline(10):
+                assert remaining() <= 1
+            async with deadline(0.5):
+                assert remaining() <= 0.5
+            assert 0.8 < remaining() <= 1
+            assert reserve(0.5) <= 0.5
+
+        assert remaining() is None
+
+    @pytest.mark.asyncio
+    async def test_deadline_raises_timeout(self):
+        """Test that overrunning the budget raises TimeoutError"""
+        with pytest.raises(TimeoutError):
+            async with deadline(0.01):
+                await asyncio.sleep(1)
+
+    @pytest.mark.asyncio
+    async def test_with_deadline_returns_error(self, monkeypatch):
+        """Test that a tool overrunning its budget returns an error result"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT_SLOW_TOOL", "0.01")
+
+        @with_deadline
+        async def slow_tool(value: int) -> dict:
+            """A slow tool"""
+            await asyncio.sleep(1)
+            return {"value": value}
+
+        assert slow_tool.__name__ == "slow_tool"
+        assert slow_tool.__doc__ == "A slow tool"
+        result = await slow_tool(1)
+        assert result == {"error": "slow_tool timed out after 0.01s", "timed_out": True}
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_deadline_cancels_in_flight_request(self, mock_env, reset_singleton):
+        """Test that the HTTP request is cancelled when the budget runs out"""
+        cancelled = asyncio.Event()
+
+        async def hanging(request):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(side_effect=hanging)
+        client = TodoistClient()
+
+        with pytest.raises(TimeoutError):
+            async with deadline(0.05):
+                await client.get_tasks()
+
+        assert cancelled.is_set()
+        assert client._in_flight == set()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_request_timeouts_clamped_to_budget(self, mock_env, monkeypatch, reset_singleton):
+        """Test that retries stop when the backoff would not fit in the budget"""
+        monkeypatch.setenv("TODOIST_RETRY_BACKOFF", "5")
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(503))
+        client = TodoistClient()
+
+        async with deadline(1):
+            assert client._request_timeout().read <= 1
+            result = await client._make_request("GET", "tasks")
+
+        assert "error" in result
+        assert route.call_count == 1
+        assert client._request_timeout() is client.timeout
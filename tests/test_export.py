@@ -0,0 +1,179 @@
+import csv
+import json
+import os
+import pytest
+import httpx
+import respx
+from todoist_mcp_server.export import AccountExport, checkpoint_path, time_windows
+from todoist_mcp_server.todoist_client import TodoistAPIError, TodoistClient
+
+API = "https://api.todoist.com/api/v1"
+
+
+def mock_account(completed_side_effect=None):
+    """Mock an account with two projects, three active tasks over two pages and completed history"""
+    projects = respx.get(f"{API}/projects").mock(return_value=httpx.Response(200, json={
+        "results": [{"id": "1", "name": "Work"}, {"id": "2", "name": "Home"}], "next_cursor": None
+    }))
+    tasks = respx.get(f"{API}/tasks").mock(side_effect=[
+        httpx.Response(200, json={"results": [{"id": "t1", "content": "One", "labels": ["a", "b"]},
+                                              {"id": "t2", "content": "Two"}], "next_cursor": "page2"}),
+        httpx.Response(200, json={"results": [{"id": "t3", "content": "Three", "due": {"date": "2024-01-05"}}],
+                                  "next_cursor": None}),
+    ])
+    completed = respx.get(f"{API}/tasks/completed/by_completion_date").mock(
+        side_effect=completed_side_effect or (lambda request: httpx.Response(200, json={
+            "items": [{"id": f"c-{request.url.params['since'][:10]}", "completed_at": request.url.params["until"]}],
+            "next_cursor": None
+        }))
+    )
+    return projects, tasks, completed
+
+
+def read_ndjson(path):
+    with open(path, encoding="utf-8") as export_file:
+        return [json.loads(line) for line in export_file]
+
+
+class TestAccountExport:
+    """Test cases for the streaming account export"""
+
+    def test_time_windows(self):
+        """Test splitting a range into windows"""
+        assert list(time_windows("2024-01-01", "2024-02-15", 30)) == [
+            ("2024-01-01T00:00:00", "2024-01-31T00:00:00"),
+            ("2024-01-31T00:00:00", "2024-02-15T00:00:00"),
+        ]
+        assert list(time_windows("2024-01-01", "2024-01-01", 30)) == []
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_export_ndjson(self, mock_env, tmp_path, reset_singleton):
+        """Test exporting projects, paged active tasks and windowed completed tasks"""
+        _, tasks, completed = mock_account()
+        path = str(tmp_path / "backup.ndjson")
+        reports = []
+
+        async def progress(done, message):
+            reports.append(done)
+
+        export = AccountExport(TodoistClient(), path, since="2024-01-01", until="2024-02-15")
+        summary = await export.run(progress)
+
+        records = read_ndjson(path)
+        assert [(record["type"], record["id"]) for record in records] == [
+            ("project", "1"), ("project", "2"), ("task", "t1"), ("task", "t2"), ("task", "t3"),
+            ("completed_task", "c-2024-01-01"), ("completed_task", "c-2024-01-31"),
+        ]
+        assert summary["counts"] == {"project": 2, "task": 3, "completed_task": 2}
+        assert summary["bytes"] == os.path.getsize(path)
+        assert summary["resumed"] is False
+        assert reports == [2, 4, 5, 6, 7]
+        assert tasks.calls[1].request.url.params["cursor"] == "page2"
+        assert completed.call_count == 2
+        assert not os.path.exists(checkpoint_path(path))
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_export_resumes_from_checkpoint(self, mock_env, tmp_path, reset_singleton):
+        """Test that an interrupted export continues where it stopped"""
+        first_window = httpx.Response(200, json={"items": [{"id": "c1"}], "next_cursor": None})
+        projects, tasks, completed = mock_account(completed_side_effect=[
+            first_window, httpx.Response(401),
+            httpx.Response(200, json={"items": [{"id": "c2"}], "next_cursor": None}),
+        ])
+        path = str(tmp_path / "backup.ndjson")
+
+        export = AccountExport(TodoistClient(), path, since="2024-01-01", until="2024-02-15")
+        with pytest.raises(TodoistAPIError):
+            await export.run()
+        checkpoint = json.loads(open(checkpoint_path(path)).read())
+        assert checkpoint["stage"] == "completed"
+        assert checkpoint["window"] == 1
+
+        # Simulate a half-written page after the checkpoint
+        with open(path, "a", encoding="utf-8") as export_file:
+            export_file.write('{"type": "completed_task", "id": "parti')
+
+        export = AccountExport(TodoistClient(), path)
+        summary = await export.run()
+
+        assert summary["resumed"] is True
+        assert [record["id"] for record in read_ndjson(path)] == ["1", "2", "t1", "t2", "t3", "c1", "c2"]
+        assert summary["counts"] == {"project": 2, "task": 3, "completed_task": 2}
+        assert projects.call_count == 1
+        assert tasks.call_count == 2
+        assert completed.call_count == 3
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_export_csv(self, mock_env, tmp_path, reset_singleton):
+        """Test that a .csv path writes flattened rows"""
+        mock_account()
+        path = str(tmp_path / "backup.csv")
+
+        summary = await AccountExport(TodoistClient(), path, since="2024-01-01", until="2024-01-10").run()
+
+        with open(path, newline="", encoding="utf-8") as export_file:
+            rows = list(csv.DictReader(export_file))
+        assert summary["format"] == "csv"
+        assert len(rows) == 6
+        assert rows[0]["type"] == "project" and rows[0]["content"] == "Work"
+        assert rows[2]["labels"] == "a;b"
+        assert rows[4]["due"] == "2024-01-05"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_export_refuses_to_replace_existing_file(self, mock_env, tmp_path, reset_singleton):
+        """Test that a file without a checkpoint is only overwritten when restarting"""
+        mock_account()
+        path = tmp_path / "notes.ndjson"
+        path.write_text("not an export\n")
+
+        with pytest.raises(ValueError, match="already exists and is not an unfinished export"):
+            AccountExport(TodoistClient(), str(path))
+        assert path.read_text() == "not an export\n"
+
+        summary = await AccountExport(TodoistClient(), str(path), since="2024-01-01", until="2024-01-10",
+                                      resume=False).run()
+        assert summary["counts"]["project"] == 2
+        assert read_ndjson(str(path))[0]["type"] == "project"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_export_resumes_after_failing_first_page(self, mock_env, tmp_path, reset_singleton):
+        """Test that an export failing before its first page can be continued"""
+        projects, _, _ = mock_account()
+        projects.side_effect = [httpx.Response(401), projects.return_value]
+        path = str(tmp_path / "backup.csv")
+
+        export = AccountExport(TodoistClient(), path, since="2024-01-01", until="2024-01-10")
+        with pytest.raises(TodoistAPIError):
+            await export.run()
+        assert os.path.exists(checkpoint_path(path))
+
+        summary = await AccountExport(TodoistClient(), path).run()
+
+        with open(path, newline="", encoding="utf-8") as export_file:
+            rows = list(csv.DictReader(export_file))
+        assert summary["resumed"] is True
+        assert summary["counts"]["project"] == 2
+        assert len(rows) == 6
+
+    def test_export_rejects_conflicting_resume(self, mock_env, tmp_path, reset_singleton):
+        """Test that resuming with different settings is refused, and restart ignores the checkpoint"""
+        path = tmp_path / "backup.ndjson"
+        path.write_text("")
+        checkpoint = {"format": "ndjson", "since": "2024-01-01", "until": "2024-02-01", "window_days": 30,
+                      "stage": "tasks", "window": 0, "cursor": None, "offset": 0,
+                      "counts": {"project": 0, "task": 0, "completed_task": 0}}
+        open(checkpoint_path(str(path)), "w").write(json.dumps(checkpoint))
+
+        with pytest.raises(ValueError, match="different since"):
+            AccountExport(TodoistClient(), str(path), since="2023-01-01")
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            AccountExport(TodoistClient(), str(path), fmt="xml", resume=False)
+
+        export = AccountExport(TodoistClient(), str(path), since="2023-01-01", resume=False)
+        assert export.resumed is False
+        assert export.state["stage"] == "projects"
@@ -0,0 +1,63 @@
+import pytest
+import httpx
+from unittest.mock import patch
+from tests.fake_api import FakeTodoist
+from todoist_mcp_server.todoist_client import TodoistClient
+
+
+@pytest.fixture
+def fake_client(mock_env, monkeypatch, reset_singleton):
+    """TodoistClient talking to an in-process fake Todoist API"""
+    fake = FakeTodoist(projects=3, tasks=450, completed=30)
+    monkeypatch.setenv("TODOIST_API_BASE_URL", "http://fake-todoist/")
+    with patch("todoist_mcp_server.todoist_client.transport_from_env",
+               return_value=httpx.ASGITransport(app=fake.app)):
+        yield fake, TodoistClient()
+
+
+class TestFakeTodoist:
+    """Test cases for the fake Todoist API used by the load test"""
+
+    @pytest.mark.asyncio
+    async def test_client_pages_through_account(self, fake_client):
+        """Test that the client can read every listing through cursor pagination"""
+        fake, client = fake_client
+
+        assert client.base_url == "http://fake-todoist"
+        projects = await client.get_projects()
+        assert [project["name"] for project in projects] == ["Inbox", "Work", "Personal", "Errands"]
+        assert len(await client.get_sections()) == 3
+        assert len(await client.get_all_tasks()) == 450
+        assert len(await client.get_tasks(project_id="p0", limit=500)) == \
+            sum(task["project_id"] == "p0" for task in fake.tasks.values())
+        assert len((await client.get_completed_tasks(limit=100))["items"]) == 30
+
+    @pytest.mark.asyncio
+    async def test_create_complete_and_comment(self, fake_client):
+        """Test that writes change the fake account"""
+        fake, client = fake_client
+
+        task = await client.create_task(content="New task", project_id="p1", labels=["brand-new"])
+        assert task["content"] == "New task"
+        assert "brand-new" in [label["name"] for label in await client.get_labels()]
+
+        assert await client.complete_task(task["id"]) == {"success": True}
+        assert task["id"] not in fake.tasks
+        assert fake.completed[0]["id"] == task["id"]
+        assert "error" in await client.complete_task(task["id"])
+
+        commented = next(task for task in fake.tasks.values() if task["note_count"])
+        comments = await client.get_comments(commented["id"], commented["updated_at"])
+        assert len(comments) == commented["note_count"]
+
+    @pytest.mark.asyncio
+    async def test_latency_and_auth(self):
+        """Test the configured delay and the bearer token check"""
+        fake = FakeTodoist(projects=1, tasks=1, completed=0, latency=0.05)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app), base_url="http://fake") as http:
+            assert (await http.get("/projects")).status_code == 401
+
+            response = await http.get("/projects", headers={"Authorization": "Bearer x"})
+            assert response.status_code == 200
+            assert response.elapsed.total_seconds() >= 0.05
+        assert fake.requests == 2
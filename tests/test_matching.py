@@ -0,0 +1,71 @@
+import time
+from todoist_mcp_server.matching import NameIndex, fuzzy_find, normalize
+
+
+class TestMatching:
+    """Test cases for name matching"""
+
+    items = [{"name": "Work"}, {"name": "Deep-Work"}, {"name": "Groceries"}]
+
+    def test_normalize(self):
+        """Test that punctuation and case are ignored"""
+        assert normalize("  Deep-Work!! ") == "deep work"
+
+    def test_fuzzy_find(self):
+        """Test exact, normalized and close matches"""
+        assert fuzzy_find("work", self.items) == {"name": "Work"}
+        assert fuzzy_find("deep work", self.items) == {"name": "Deep-Work"}
+        assert fuzzy_find("grocerys", self.items) == {"name": "Groceries"}
+        assert fuzzy_find("taxes", self.items) is None
+
+    def test_name_index_ranking(self):
+        """Test that the trigram index ranks exact, typo and extra-word matches"""
+        index = NameIndex([{"id": "1", "name": "Work"}, {"id": "2", "name": "Personal"},
+                           {"id": "3", "name": "Deep Work"}, {"id": "4", "name": "Inbox"}])
+
+        ranked = index.search("work")
+        assert ranked[0] == ({"id": "1", "name": "Work"}, 1.0)
+        assert ranked[1][0]["name"] == "Deep Work"
+
+        assert index.best("work stuff")[0]["name"] == "Work"
+        assert index.best("persnal")[0]["name"] == "Personal"
+        assert index.best("taxes") is None
+        assert index.search("zzz") == []
+
+    def test_name_index_ambiguous_containment(self):
+        """Test that a query naming several items matches none of them confidently"""
+        index = NameIndex([{"name": "Work"}, {"name": "Personal"}, {"name": "Project"},
+                           {"name": "Side Project"}])
+
+        assert index.best("Personal Work") is None
+        assert max(score for _, score in index.search("Personal Work")) <= 0.6
+        # A longer contained name wins over the names inside it
+        assert index.best("my side project")[0]["name"] == "Side Project"
+        assert index.best("work stuff") == ({"name": "Work"}, 0.8)
+
+    def test_name_index_resolve(self):
+        """Test that resolving requires a clear winner"""
+        index = NameIndex([{"name": "Chris Park"}, {"name": "Chris Parker"}, {"name": "Backlog"},
+                           {"name": "Backlog"}, {"name": "Groceries"}])
+
+        assert index.resolve("Chris Parker") == (({"name": "Chris Parker"}, 1.0), [])
+        assert index.resolve("grocerys")[0][0] == {"name": "Groceries"}
+        assert index.resolve("chris parke") == (None, [{"name": "Chris Parker"}, {"name": "Chris Park"}])
+        assert index.resolve("chris p")[1] == [{"name": "Chris Park"}, {"name": "Chris Parker"}]
+        assert index.resolve("backlog")[1] == [{"name": "Backlog"}, {"name": "Backlog"}]
+        assert index.resolve("taxes") == (None, [])
+
+    def test_name_index_scales(self):
+        """Test lookups over thousands of names stay fast"""
+        names = [{"id": str(i), "name": f"Project {i} {word}"}
+                 for i, word in enumerate(["alpha", "beta", "gamma", "delta"] * 1000)]
+        names.append({"id": "target", "name": "Quarterly Planning"})
+        index = NameIndex(names)
+
+        started = time.perf_counter()
+        for _ in range(100):
+            match = index.best("quartrly planning")
+        elapsed = (time.perf_counter() - started) / 100
+
+        assert match[0]["id"] == "target"
+        assert elapsed < 0.05
@@ -1,7 +1,21 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
+from starlette.testclient import TestClient
 from todoist_mcp_server import todoist
 from todoist_mcp_server.todoist_client import TodoistClient
+from todoist_mcp_server.tree import TaskTree
+from todoist_mcp_server.agenda import DueIndex
+
+# Tool budget for the deadline fallback tests: far below the 1s the slow mocks take, but with
+# room for the fallback path itself on a loaded machine
+TIGHT_BUDGET = "0.3"
+
+
+async def async_iter(items):
+    """Turn a list into an async iterator, mimicking the client's streaming helpers"""
+    for item in items:
+        yield item
 
 
 class TestMCPServerEndpoints:
@@ -11,12 +25,23 @@ class TestMCPServerEndpoints:
     def mock_client(self):
         """Mock TodoistClient for testing"""
         mock = AsyncMock(spec=TodoistClient)
+        snapshots = {}
+
+        def save_snapshot(items, kind):
+            snapshot_id = f"snap{len(snapshots)}"
+            snapshots[(kind, snapshot_id)] = items
+            return snapshot_id
+
+        mock.save_snapshot = MagicMock(side_effect=save_snapshot)
+        mock.load_snapshot = MagicMock(side_effect=lambda snapshot_id, kind: snapshots.get((kind, snapshot_id)))
+        mock.circuit_open = MagicMock(return_value=False)
         return mock
 
     @pytest.mark.asyncio
     async def test_create_task_success(self, mock_client, sample_task_data):
         """Test successful task creation via MCP endpoint"""
-        mock_client.find_project_by_name.return_value = "123"
+        mock_client.resolve_project.return_value = {"id": "123", "name": "Work", "confidence": 1.0}
+        mock_client.resolve_labels.return_value = (["test"], {})
         mock_client.create_task.return_value = sample_task_data
         
         with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
@@ -31,7 +56,8 @@ class TestMCPServerEndpoints:
         
         assert result["success"] is True
         assert result["task"] == sample_task_data
-        assert "Test task" in result["message"]
+        assert result["project"] == {"id": "123", "name": "Work", "confidence": 1.0}
+        assert result["message"] == "Task 'Test task' created successfully in project 'Work'"
         mock_client.create_task.assert_called_once()
 
     @pytest.mark.asyncio
@@ -44,19 +70,23 @@ class TestMCPServerEndpoints:
         
         assert result["success"] is True
         assert result["task"] == sample_task_data
+        assert "project" not in result
         mock_client.create_task.assert_called_once_with(
             content="Simple task",
             description="",
             project_id=None,
             due_string=None,
             priority=1,
-            labels=None
+            labels=None,
+            section_id=None,
+            assignee_id=None
         )
 
     @pytest.mark.asyncio
     async def test_create_task_project_not_found_uses_inbox(self, mock_client, sample_task_data):
         """Test task creation when project not found, falls back to Inbox"""
-        mock_client.find_project_by_name.side_effect = [None, "inbox_id"]  # Project not found, then Inbox found
+        # Project not found, then Inbox found
+        mock_client.resolve_project.side_effect = [None, {"id": "inbox_id", "name": "Inbox", "confidence": 1.0}]
         mock_client.create_task.return_value = sample_task_data
         
         with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
@@ -66,14 +96,15 @@ class TestMCPServerEndpoints:
             )
         
         assert result["success"] is True
-        # Should have called find_project_by_name twice: once for the project, once for Inbox
-        assert mock_client.find_project_by_name.call_count == 2
+        assert result["project"]["name"] == "Inbox"
+        # Should have resolved twice: once for the project, once for Inbox
+        assert mock_client.resolve_project.call_count == 2
         mock_client.create_task.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_create_task_no_inbox_error(self, mock_client):
         """Test task creation when neither project nor Inbox found"""
-        mock_client.find_project_by_name.return_value = None  # Neither project nor Inbox found
+        mock_client.resolve_project.return_value = None  # Neither project nor Inbox found
         
         with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
             result = await todoist.create_task(
@@ -84,6 +115,81 @@ class TestMCPServerEndpoints:
         assert "error" in result
         assert "Something went wrong" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_create_task_resolves_section_assignee_and_labels(self, mock_client, sample_task_data):
+        """Test that section, assignee and labels are resolved before creating the task"""
+        mock_client.resolve_project.return_value = {"id": "123", "name": "Work", "confidence": 1.0}
+        mock_client.resolve_labels.return_value = (["Errands"], {})
+        mock_client.resolve_section.return_value = {"id": "sec_1", "name": "Backlog", "confidence": 1.0}
+        mock_client.resolve_collaborator.return_value = {"id": "user_1", "name": "Alice", "confidence": 1.0}
+        mock_client.create_task.return_value = sample_task_data
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.create_task(
+                content="Test task",
+                project_name="Work",
+                labels=["errands"],
+                section_name="Backlog",
+                assignee="alice@example.com"
+            )
+
+        assert result["success"] is True
+        mock_client.resolve_section.assert_called_once_with("Backlog", "123")
+        mock_client.resolve_collaborator.assert_called_once_with("alice@example.com", "123")
+        call_args = mock_client.create_task.call_args[1]
+        assert call_args["labels"] == ["Errands"]
+        assert call_args["section_id"] == "sec_1"
+        assert call_args["assignee_id"] == "user_1"
+
+    @pytest.mark.asyncio
+    async def test_create_task_unknown_labels(self, mock_client, sample_task_data):
+        """Test that unknown labels are rejected unless allow_new_labels is set"""
+        mock_client.resolve_labels.return_value = (["brand-new", "2025-goals"],
+                                                   {"brand-new": None, "2025-goals": "2024-goals"})
+        mock_client.create_task.return_value = sample_task_data
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.create_task(content="Test task", labels=["brand-new", "2025-goals"])
+            assert "Unknown labels: brand-new, 2025-goals (did you mean '2024-goals'?)" in result["error"]
+            mock_client.create_task.assert_not_called()
+
+            result = await todoist.create_task(content="Test task", labels=["brand-new", "2025-goals"],
+                                               allow_new_labels=True)
+            assert result["success"] is True
+            assert mock_client.create_task.call_args[1]["labels"] == ["brand-new", "2025-goals"]
+
+    @pytest.mark.asyncio
+    async def test_create_task_section_not_found(self, mock_client):
+        """Test task creation with an unknown section"""
+        mock_client.resolve_project.return_value = {"id": "123", "name": "Work", "confidence": 1.0}
+        mock_client.resolve_section.return_value = {"error": "Section 'Nope' not found"}
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.create_task(content="Test task", section_name="Nope")
+            assert "A section requires its project" in result["error"]
+            mock_client.resolve_section.assert_not_called()
+
+            result = await todoist.create_task(content="Test task", section_name="Nope", project_name="Work")
+            assert "Section 'Nope' not found" in result["error"]
+            mock_client.resolve_section.assert_called_once_with("Nope", "123")
+
+        mock_client.create_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_task_assignee_errors(self, mock_client):
+        """Test assignee resolution failures"""
+        mock_client.resolve_project.return_value = {"id": "123", "name": "Work", "confidence": 1.0}
+        mock_client.resolve_collaborator.return_value = {
+            "error": "Collaborator 'chris p' is ambiguous. Did you mean 'Chris Park' or 'Chris Parker'?"}
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.create_task(content="Test task", assignee="chris p")
+            assert "requires a shared project" in result["error"]
+
+            result = await todoist.create_task(content="Test task", assignee="chris p", project_name="Work")
+            assert "is ambiguous" in result["error"]
+            mock_client.create_task.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_create_task_client_error(self, mock_client):
         """Test task creation with client error"""
@@ -324,4 +430,493 @@ class TestMCPServerEndpoints:
         
         # Should return the same instance (singleton)
         client2 = todoist.get_client()
-        assert client is client2 
\ No newline at end of file
+        assert client is client2 
+
+    @pytest.mark.asyncio
+    async def test_task_stats_active(self, mock_client, sample_project_data, sample_tasks_list):
+        """Test aggregating active tasks without returning them"""
+        mock_client.get_projects.return_value = sample_project_data
+        mock_client.iter_tasks = MagicMock(return_value=async_iter(sample_tasks_list))
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.task_stats(group_by=["project", "priority"])
+
+        assert result["success"] is True
+        assert result["total"] == 2
+        assert result["groups"]["by_project"] == {"Work": 1, "Personal": 1}
+        assert result["groups"]["by_priority"] == {"2": 1, "1": 1}
+        assert "tasks" not in result
+
+    @pytest.mark.asyncio
+    async def test_task_stats_completed_with_project(self, mock_client, sample_completed_tasks):
+        """Test aggregating completed tasks for a single project"""
+        mock_client.find_project_by_name.return_value = "123"
+        mock_client.iter_completed_tasks = MagicMock(return_value=async_iter(sample_completed_tasks["items"]))
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.task_stats(group_by=["completed_day"], completed=True, project_name="Work")
+
+        assert result["total"] == 2
+        assert result["groups"]["by_completed_day"] == {"2024-01-01": 2}
+        call_args = mock_client.iter_completed_tasks.call_args[1]
+        assert call_args["project_id"] == "123"
+        assert call_args["since"] and call_args["until"]
+
+    @pytest.mark.asyncio
+    async def test_task_stats_invalid_dimension(self, mock_client):
+        """Test that unsupported dimensions are reported"""
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.task_stats(group_by=["completed_day"])
+
+        assert "error" in result
+        assert "completed_day" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_task_stats_project_not_found(self, mock_client):
+        """Test task stats for an unknown project"""
+        mock_client.find_project_by_name.return_value = None
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.task_stats(project_name="NonExistent")
+
+        assert "error" in result
+        assert "not found" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_get_task_tree(self, mock_client, sample_project_data, sample_tasks_list):
+        """Test the tree overview tool"""
+        mock_client.get_task_tree.return_value = TaskTree(sample_project_data, [], sample_tasks_list)
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.get_task_tree(root="project:123")
+
+        assert result["success"] is True
+        assert result["nodes"] == [{"id": "task:task_1", "content": "First task", "priority": 2}]
+        assert result["node_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_task_tree_unknown_root(self, mock_client, sample_project_data):
+        """Test the tree tool with an unknown node"""
+        mock_client.get_task_tree.return_value = TaskTree(sample_project_data, [], [])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.get_task_tree(root="project:nope")
+
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_get_task_tree_exception(self, mock_client):
+        """Test the tree tool when the client fails"""
+        mock_client.get_task_tree.side_effect = Exception("API error")
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.get_task_tree()
+
+        assert "Failed to build task tree" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_find_project(self, mock_client):
+        """Test the fuzzy project lookup tool"""
+        mock_client.match_project.return_value = {
+            "id": "123", "name": "Work", "confidence": 0.8,
+            "candidates": [{"id": "123", "name": "Work", "confidence": 0.8},
+                           {"id": "999", "name": "Deep Work", "confidence": 0.6}]
+        }
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.find_project("work stuff")
+
+        assert result["success"] is True
+        assert result["project"] == {"id": "123", "name": "Work", "confidence": 0.8}
+        assert result["candidates"] == [{"id": "999", "name": "Deep Work", "confidence": 0.6}]
+
+    @pytest.mark.asyncio
+    async def test_find_project_no_match(self, mock_client):
+        """Test the project lookup tool when nothing matches"""
+        mock_client.match_project.return_value = None
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.find_project("zzz")
+
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_find_project_exception(self, mock_client):
+        """Test the project lookup tool when the client fails"""
+        mock_client.match_project.side_effect = Exception("boom")
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.find_project("Work")
+
+        assert "Failed to find project" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_lifespan_shuts_down_client(self):
+        """Test that the server lifespan closes the shared client on exit"""
+        with patch.object(TodoistClient, 'shutdown', new_callable=AsyncMock) as shutdown:
+            async with todoist.lifespan(todoist.mcp):
+                shutdown.assert_not_called()
+            shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_client_scopes_are_reference_counted(self):
+        """Test that the client is only shut down when the last scope exits"""
+        with patch.object(TodoistClient, 'shutdown', new_callable=AsyncMock) as shutdown:
+            async with todoist.client_scope():
+                async with todoist.lifespan(todoist.mcp):
+                    pass
+                shutdown.assert_not_called()
+            shutdown.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_http_app_worker_mode(self, monkeypatch):
+        """Test that the HTTP app is stateless with several workers and holds a client scope"""
+        monkeypatch.setenv("TODOIST_WORKERS", "4")
+        monkeypatch.setattr(todoist.mcp, "_session_manager", None)
+        monkeypatch.setattr(todoist.mcp.settings, "stateless_http", False)
+
+        app = todoist.http_app()
+        assert todoist.mcp.settings.stateless_http is True
+
+        with patch.object(TodoistClient, 'shutdown', new_callable=AsyncMock) as shutdown:
+            async with app.router.lifespan_context(app):
+                assert todoist._client_scopes == 1
+            shutdown.assert_awaited_once()
+
+    @pytest.mark.parametrize("host, status", [("0.0.0.0", 200), ("127.0.0.1", 421)])
+    def test_http_app_host_header(self, monkeypatch, mock_env, host, status):
+        """Test that a server bound to a public interface accepts its real hostname"""
+        monkeypatch.setenv("TODOIST_HOST", host)
+        monkeypatch.setattr(todoist.mcp, "_session_manager", None)
+        monkeypatch.setattr(todoist.mcp.settings, "host", todoist.mcp.settings.host)
+        monkeypatch.setattr(todoist.mcp.settings, "transport_security", todoist.mcp.settings.transport_security)
+        monkeypatch.setattr(todoist.mcp.settings, "stateless_http", True)
+        initialize = {"jsonrpc": "2.0", "id": 1, "method": "initialize",
+                      "params": {"protocolVersion": "2025-06-18", "capabilities": {},
+                                 "clientInfo": {"name": "test", "version": "1"}}}
+
+        with patch.object(TodoistClient, 'shutdown', new_callable=AsyncMock), \
+             TestClient(todoist.http_app(), base_url="http://gateway.internal:8000") as http:
+            response = http.post("/mcp", json=initialize,
+                                 headers={"Accept": "application/json, text/event-stream"})
+
+        assert response.status_code == status
+
+    @pytest.mark.asyncio
+    async def test_list_active_tasks_paginates_with_cursor(self, mock_client):
+        """Test that large results are split into pages served from a snapshot"""
+        tasks = [{"id": f"task_{i}", "content": "x" * 100} for i in range(10)]
+        mock_client.get_tasks.return_value = tasks
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            first = await todoist.list_active_tasks(max_bytes=400)
+            assert first["count"] == 3
+            assert first["total"] == 10
+            assert first["next_cursor"]
+
+            seen = list(first["tasks"])
+            cursor = first["next_cursor"]
+            while cursor:
+                page = await todoist.list_active_tasks(cursor=cursor, max_bytes=400)
+                seen.extend(page["tasks"])
+                cursor = page["next_cursor"]
+
+        assert seen == tasks
+        assert mock_client.get_tasks.call_count == 1
+        assert mock_client.save_snapshot.call_count == 1
+        assert "returning 10-10" in page["message"]
+
+    @pytest.mark.asyncio
+    async def test_list_active_tasks_small_result_has_no_cursor(self, mock_client, sample_tasks_list):
+        """Test that results within budget are returned whole"""
+        mock_client.get_tasks.return_value = sample_tasks_list
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.list_active_tasks()
+
+        assert result["next_cursor"] is None
+        mock_client.save_snapshot.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_bad_or_expired_cursor(self, mock_client):
+        """Test malformed and expired cursors"""
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.list_active_tasks(cursor="not a cursor")
+            assert "Invalid cursor" in result["error"]
+
+            from todoist_mcp_server.pagination import encode_cursor
+            result = await todoist.list_completed_tasks(cursor=encode_cursor("completed_tasks", "gone", 3))
+            assert "Cursor expired" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_from_another_tool_is_rejected(self, mock_client):
+        """Test that a completed-tasks cursor can't be used to page active tasks"""
+        items = [{"id": f"done_{i}", "content": "y" * 100} for i in range(4)]
+        mock_client.get_completed_tasks.return_value = {"items": items}
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            first = await todoist.list_completed_tasks(max_bytes=300)
+            result = await todoist.list_active_tasks(cursor=first["next_cursor"])
+
+        assert result == {"error": "This cursor continues a list of completed tasks, not active tasks. "
+                                   "Pass it to the tool that returned it."}
+
+    @pytest.mark.asyncio
+    async def test_list_completed_tasks_paginates(self, mock_client):
+        """Test paging through completed tasks"""
+        items = [{"id": f"done_{i}", "content": "y" * 100} for i in range(4)]
+        mock_client.get_completed_tasks.return_value = {"items": items}
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            first = await todoist.list_completed_tasks(max_bytes=300)
+            second = await todoist.list_completed_tasks(cursor=first["next_cursor"], max_bytes=300)
+
+        assert first["completed_tasks"] == items[:2]
+        assert second["completed_tasks"] == items[2:]
+        assert second["next_cursor"] is None
+        assert mock_client.get_completed_tasks.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_agenda(self, mock_client):
+        """Test the agenda tool buckets tasks by day"""
+        mock_client.get_due_index.return_value = DueIndex([
+            {"id": "1", "content": "Standup", "project_id": "123", "priority": 3,
+             "due": {"date": "2024-01-10", "datetime": "2024-01-10T09:30:00", "is_recurring": True,
+                     "string": "every weekday"}},
+            {"id": "2", "content": "Report", "project_id": "456", "due": {"date": "2024-01-11"}},
+            {"id": "3", "content": "Old", "project_id": "123", "due": {"date": "2024-01-01"}},
+        ])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.agenda(start="2024-01-10", days=2)
+
+        assert result["success"] is True
+        assert result["end"] == "2024-01-11"
+        assert result["days"]["2024-01-10"] == [{"id": "1", "content": "Standup", "project_id": "123",
+                                                 "priority": 3, "time": "09:30", "recurring": "every weekday"}]
+        # All-day tasks come before timed ones
+        assert [task["id"] for task in result["days"]["2024-01-11"]] == ["2", "1"]
+        assert [task["id"] for task in result["overdue"]] == ["3"]
+        assert "3 tasks" in result["message"]
+
+    @pytest.mark.asyncio
+    async def test_agenda_project_filter(self, mock_client):
+        """Test restricting the agenda to one project"""
+        mock_client.find_project_by_name.return_value = "456"
+        mock_client.get_due_index.return_value = DueIndex([
+            {"id": "1", "project_id": "123", "due": {"date": "2024-01-10"}},
+            {"id": "2", "project_id": "456", "due": {"date": "2024-01-10"}},
+        ])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.agenda(start="2024-01-10", days=1, project_name="Personal",
+                                          include_overdue=False)
+
+        assert [task["id"] for task in result["days"]["2024-01-10"]] == ["2"]
+        assert "overdue" not in result
+
+    @pytest.mark.asyncio
+    async def test_agenda_errors(self, mock_client):
+        """Test agenda error handling"""
+        mock_client.find_project_by_name.return_value = None
+        mock_client.get_due_index.side_effect = Exception("API error")
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            assert "Invalid date" in (await todoist.agenda(start="next week"))["error"]
+            assert "not found" in (await todoist.agenda(project_name="Nope"))["error"]
+            assert "Failed to build agenda" in (await todoist.agenda())["error"]
+
+    @pytest.mark.asyncio
+    async def test_list_active_tasks_timeout_serves_cached_tasks(self, mock_client, monkeypatch):
+        """Test that running out of budget falls back to the cached task list"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT_LIST_ACTIVE_TASKS", TIGHT_BUDGET)
+
+        async def slow_get_tasks(**kwargs):
+            await asyncio.sleep(1)
+
+        mock_client.get_tasks.side_effect = slow_get_tasks
+        mock_client.cached_tasks = MagicMock(return_value=[{"id": "1", "project_id": "123"},
+                                                           {"id": "2", "project_id": "456"}])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.list_active_tasks(project_id="456")
+            assert result["stale"] is True
+            assert result["tasks"] == [{"id": "2", "project_id": "456"}]
+
+            result = await todoist.list_active_tasks(filter_string="today")
+            assert result["timed_out"] is True
+            assert result["error"] == ("Timed out listing tasks. Filtered queries can't be answered from "
+                                       "cached tasks; try again or leave out filter_string")
+
+            mock_client.cached_tasks.return_value = None
+            result = await todoist.list_active_tasks()
+            assert result["error"] == "Timed out listing tasks and no cached tasks are available"
+
+    @pytest.mark.asyncio
+    async def test_task_stats_timeout_returns_partial_counts(self, mock_client, monkeypatch):
+        """Test that task stats returns what was counted before the budget ran out"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT_TASK_STATS", TIGHT_BUDGET)
+
+        async def slow_stream(**kwargs):
+            yield {"id": "1", "priority": 4}
+            await asyncio.sleep(1)
+            yield {"id": "2", "priority": 4}
+
+        mock_client.iter_tasks = MagicMock(side_effect=slow_stream)
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.task_stats(group_by=["priority"])
+
+        assert result["partial"] is True
+        assert result["total"] == 1
+        assert "partial" in result["message"]
+
+    @pytest.mark.asyncio
+    async def test_agenda_and_tree_timeout_use_cached_indexes(self, mock_client, monkeypatch):
+        """Test that agenda and tree fall back to their last built index"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT", TIGHT_BUDGET)
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(1)
+
+        mock_client.get_due_index.side_effect = slow
+        mock_client.get_task_tree.side_effect = slow
+        mock_client.cached_due_index = MagicMock(return_value=DueIndex([]))
+        mock_client.cached_task_tree = MagicMock(return_value=TaskTree([{"id": "1", "name": "Work"}], [], []))
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            assert (await todoist.agenda())["stale"] is True
+            tree = await todoist.get_task_tree()
+            assert tree["stale"] is True
+            assert tree["nodes"] == [{"id": "project:1", "name": "Work"}]
+
+            mock_client.cached_due_index.return_value = None
+            mock_client.cached_task_tree.return_value = None
+            assert (await todoist.agenda())["timed_out"] is True
+            assert (await todoist.get_task_tree())["timed_out"] is True
+
+    @pytest.mark.asyncio
+    async def test_tool_hard_deadline(self, mock_client, monkeypatch):
+        """Test that a tool without a fallback returns an error when out of budget"""
+        monkeypatch.setenv("TODOIST_TOOL_TIMEOUT_CREATE_TASK", "0.01")
+
+        async def slow(**kwargs):
+            await asyncio.sleep(1)
+
+        mock_client.create_task.side_effect = slow
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.create_task(content="Test task")
+
+        assert result == {"error": "create_task timed out after 0.01s", "timed_out": True}
+
+    @pytest.mark.asyncio
+    async def test_list_active_tasks_circuit_open_serves_cached_tasks(self, mock_client):
+        """Test that an open circuit falls back to the cached task list"""
+        mock_client.get_tasks.return_value = {"error": "Todoist API unavailable", "circuit_open": True}
+        mock_client.cached_tasks = MagicMock(return_value=[{"id": "1", "project_id": "123"}])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.list_active_tasks()
+            assert result["stale"] is True
+            assert result["tasks"] == [{"id": "1", "project_id": "123"}]
+            assert "Todoist is unavailable" in result["message"]
+
+            mock_client.cached_tasks.return_value = None
+            result = await todoist.list_active_tasks()
+            assert result == {"error": "Todoist API unavailable", "circuit_open": True}
+
+    @pytest.mark.asyncio
+    async def test_reads_marked_stale_while_circuit_open(self, mock_client):
+        """Test that results built from cached listings are marked stale"""
+        mock_client.circuit_open.return_value = True
+        mock_client.match_project.return_value = {"id": "123", "name": "Work", "confidence": 1.0, "candidates": []}
+        mock_client.get_due_index.return_value = DueIndex([])
+        mock_client.get_task_tree.return_value = TaskTree([{"id": "123", "name": "Work"}], [], [])
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            assert (await todoist.find_project("work"))["stale"] is True
+            assert (await todoist.agenda())["stale"] is True
+            assert (await todoist.get_task_tree())["stale"] is True
+
+        mock_client.circuit_open.assert_any_call("projects", "sections", "tasks")
+
+    @pytest.mark.asyncio
+    async def test_list_active_tasks_include_comments(self, mock_client, sample_tasks_list):
+        """Test that comments are attached to listed tasks in one batch"""
+        mock_client.get_tasks.return_value = sample_tasks_list
+        mock_client.get_comments_for_tasks.return_value = {
+            "task_1": [{"id": "c1", "content": "Call first", "posted_at": "2024-01-01T10:00:00Z",
+                        "file_attachment": {"file_name": "notes.pdf", "file_url": "https://example.com/notes.pdf",
+                                            "file_type": "application/pdf", "upload_state": "completed"}}],
+            "task_2": {"error": "HTTP error: 500"}
+        }
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client):
+            result = await todoist.list_active_tasks(include_comments=True)
+
+        mock_client.get_comments_for_tasks.assert_awaited_once_with(sample_tasks_list)
+        first, second = result["tasks"]
+        assert first["comments"] == [{
+            "id": "c1", "content": "Call first", "posted_at": "2024-01-01T10:00:00Z",
+            "attachment": {"file_name": "notes.pdf", "file_type": "application/pdf",
+                           "file_url": "https://example.com/notes.pdf"}
+        }]
+        assert second["comments_error"] == "HTTP error: 500"
+        assert "comments" not in sample_tasks_list[0]
+
+    def test_with_comments_keeps_most_recent_within_budget(self):
+        """Test that comments are trimmed to a per-task size budget, newest first"""
+        comments = [{"id": str(i), "content": "x" * 40} for i in range(5)]
+
+        result = todoist.with_comments({"id": "1"}, comments, max_chars=100)
+
+        assert [comment["id"] for comment in result["comments"]] == ["2", "3", "4"]
+        assert result["comments"][0]["content"] == "x" * 20 + "…"
+        assert result["comments_omitted"] == 2
+
+        assert todoist.with_comments({"id": "1"}, [])["comments"] == []
+
+    @pytest.mark.asyncio
+    async def test_export_account(self, mock_client, tmp_path):
+        """Test a completed export and one that has to be continued"""
+        target = str(tmp_path / "backup.ndjson")
+        export = MagicMock(path=target, total=5,
+                           state={"counts": {"project": 1, "task": 4, "completed_task": 0}})
+        export.run = AsyncMock(return_value={"path": target, "format": "ndjson", "bytes": 100,
+                                             "counts": {"project": 1, "task": 4, "completed_task": 2},
+                                             "resumed": False})
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client), \
+             patch('todoist_mcp_server.todoist.EXPORT_DIR', str(tmp_path)), \
+             patch('todoist_mcp_server.todoist.AccountExport', return_value=export) as export_class:
+            result = await todoist.export_account(path="backup.ndjson", since="2024-01-01")
+
+            export_class.assert_called_once_with(mock_client, target, fmt=None,
+                                                 since="2024-01-01", until=None, resume=True)
+            assert result["complete"] is True
+            assert result["message"] == ("Exported 1 projects, 4 active tasks and 2 completed tasks "
+                                         f"to {target}")
+
+            export.run.side_effect = TimeoutError
+            result = await todoist.export_account(path="backup.ndjson")
+            assert result["complete"] is False
+            assert result["counts"]["task"] == 4
+            assert "ran out of time after 5 records" in result["message"]
+
+            export_class.side_effect = ValueError("Unsupported export format 'xml'. Supported: ndjson, csv")
+            result = await todoist.export_account(path="backup.xml", format="xml")
+            assert result == {"error": "Unsupported export format 'xml'. Supported: ndjson, csv"}
+
+    @pytest.mark.asyncio
+    async def test_export_account_stays_in_export_dir(self, mock_client, tmp_path):
+        """Test that exports outside the configured export directory are refused"""
+        export_dir = tmp_path / "exports"
+
+        with patch('todoist_mcp_server.todoist.get_client', return_value=mock_client), \
+             patch('todoist_mcp_server.todoist.EXPORT_DIR', str(export_dir)), \
+             patch('todoist_mcp_server.todoist.AccountExport') as export_class:
+            for path in ("../backup.ndjson", str(tmp_path / "backup.ndjson"), "/etc/passwd"):
+                result = await todoist.export_account(path=path)
+                assert result["error"].startswith(f"Exports can only be written inside {export_dir}")
+            export_class.assert_not_called()
@@ -0,0 +1,44 @@
+import json
+import pytest
+from todoist_mcp_server.pagination import encode_cursor, decode_cursor, paginate
+
+
+class TestPagination:
+    """Test cases for byte-budgeted pagination"""
+
+    items = [{"id": str(i), "content": "x" * 20} for i in range(10)]
+
+    def test_cursor_round_trip(self):
+        """Test that cursors are opaque but decodable"""
+        cursor = encode_cursor("active_tasks", "snap_1:x", 42)
+        assert "snap" not in cursor
+        assert decode_cursor(cursor) == ("active_tasks", "snap_1:x", 42)
+
+    @pytest.mark.parametrize("cursor", ["!!!", encode_cursor("tasks", "snap", 0)[:-2] + "@@", "bm9jb2xvbg",
+                                        "c25hcDo1"])
+    def test_invalid_cursor(self, cursor):
+        """Test that malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+    def test_paginate_within_budget(self):
+        """Test that whole items are packed until the budget is reached"""
+        size = len(json.dumps(self.items[0], separators=(",", ":")))
+
+        page, next_offset = paginate(self.items, 0, size * 3 + 1)
+        assert page == self.items[:3]
+        assert next_offset == 3
+
+        page, next_offset = paginate(self.items, 9, size * 3)
+        assert page == self.items[9:]
+        assert next_offset is None
+
+    def test_paginate_always_makes_progress(self):
+        """Test that an item larger than the budget is still returned on its own"""
+        page, next_offset = paginate(self.items, 0, 1)
+        assert page == self.items[:1]
+        assert next_offset == 1
+
+    def test_paginate_empty(self):
+        """Test paging an empty result"""
+        assert paginate([], 0, 100) == ([], None)
@@ -0,0 +1,93 @@
+import json
+import pytest
+import httpx
+import respx
+from todoist_mcp_server.recording import ReplayTransport, run_load, percentile
+from todoist_mcp_server.todoist_client import TodoistClient
+
+
+class TestRecordReplay:
+    """Test cases for the record/replay transports"""
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_record_then_replay(self, mock_env, mock_api_token, monkeypatch, tmp_path,
+                                      sample_project_data, sample_task_data, reset_singleton):
+        """Test that recorded traffic can be served back offline with the token redacted"""
+        cassette = tmp_path / "traffic.ndjson"
+        monkeypatch.setenv("TODOIST_RECORD_PATH", str(cassette))
+        respx.get("https://api.todoist.com/api/v1/projects").mock(
+            return_value=httpx.Response(200, json=sample_project_data)
+        )
+        respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json={**sample_task_data, "note": mock_api_token})
+        )
+
+        client = TodoistClient()
+        await client.get_projects()
+        await client.create_task(content="Test task", project_id="123")
+
+        lines = cassette.read_text().splitlines()
+        assert len(lines) == 2
+        assert mock_api_token not in cassette.read_text()
+        recorded = json.loads(lines[1])
+        assert recorded["method"] == "POST"
+        assert recorded["body"] == {"content": "Test task", "priority": 1, "project_id": "123"}
+        assert recorded["elapsed"] >= 0
+
+        respx.stop()
+        monkeypatch.delenv("TODOIST_RECORD_PATH")
+        monkeypatch.setenv("TODOIST_REPLAY_PATH", str(cassette))
+        monkeypatch.setenv("TODOIST_REPLAY_LATENCY_SCALE", "0")
+        TodoistClient._instance = None
+        TodoistClient._initialized = False
+
+        client = TodoistClient()
+        assert await client.get_projects() == sample_project_data
+        created = await client.create_task(content="Test task", project_id="123")
+        assert created["id"] == sample_task_data["id"]
+        assert created["note"] == "REDACTED"
+
+    @pytest.mark.asyncio
+    async def test_replay_matching_and_cycling(self, tmp_path):
+        """Test exact matching, path fallback and cycling through repeated responses"""
+        cassette = tmp_path / "traffic.ndjson"
+        interactions = [
+            {"method": "GET", "path": "/api/v1/tasks", "query": "limit=1", "body": None, "status": 200,
+             "content_type": "application/json", "response": '["first"]', "elapsed": 0.5},
+            {"method": "GET", "path": "/api/v1/tasks", "query": "limit=2", "body": None, "status": 200,
+             "content_type": "application/json", "response": '["second"]', "elapsed": 0.5},
+        ]
+        cassette.write_text("\n".join(json.dumps(i) for i in interactions) + "\n")
+        transport = ReplayTransport(str(cassette), latency_scale=0)
+
+        async with httpx.AsyncClient(transport=transport) as client:
+            assert (await client.get("https://x/api/v1/tasks?limit=2")).json() == ["second"]
+            assert (await client.get("https://x/api/v1/tasks?limit=9")).json() == ["first"]
+            assert (await client.get("https://x/api/v1/tasks?limit=9")).json() == ["second"]
+            assert (await client.get("https://x/api/v1/projects")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_run_load(self, mock_env, monkeypatch, tmp_path, sample_tasks_list, reset_singleton):
+        """Test replaying tool-call sequences concurrently against a cassette"""
+        cassette = tmp_path / "traffic.ndjson"
+        cassette.write_text(json.dumps({
+            "method": "GET", "path": "/api/v1/tasks", "query": "limit=50", "body": None, "status": 200,
+            "content_type": "application/json", "response": json.dumps(sample_tasks_list), "elapsed": 0.01
+        }) + "\n")
+        monkeypatch.setenv("TODOIST_REPLAY_PATH", str(cassette))
+
+        sequences = [[{"tool": "list_active_tasks", "arguments": {}}],
+                     [{"tool": "list_active_tasks", "arguments": {}}, {"tool": "no_such_tool"}]]
+        summary = await run_load(sequences, concurrency=2, iterations=2)
+
+        assert summary["calls"] == 6
+        assert summary["errors"] == 2
+        assert summary["latency"]["p50"] > 0
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 50) == 0.0
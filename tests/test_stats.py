@@ -0,0 +1,56 @@
+import pytest
+from datetime import date
+from todoist_mcp_server.stats import TaskStats, due_bucket
+
+
+class TestTaskStats:
+    """Test cases for task aggregation"""
+
+    today = date(2024, 1, 10)
+
+    @pytest.mark.parametrize("due_date,bucket", [
+        ("2024-01-09", "overdue"),
+        ("2024-01-10", "today"),
+        ("2024-01-10T18:00:00", "today"),
+        ("2024-01-11", "tomorrow"),
+        ("2024-01-15", "next_7_days"),
+        ("2024-02-01", "later"),
+    ])
+    def test_due_bucket(self, due_date, bucket):
+        """Test due-date bucketing relative to today"""
+        assert due_bucket({"due": {"date": due_date}}, self.today) == bucket
+
+    def test_due_bucket_no_date(self):
+        """Test tasks without a due date"""
+        assert due_bucket({"due": None}, self.today) == "no_date"
+        assert due_bucket({}, self.today) == "no_date"
+
+    def test_group_by_counts(self, sample_project_data):
+        """Test counting tasks across several dimensions"""
+        project_names = {project["id"]: project["name"] for project in sample_project_data}
+        stats = TaskStats(["project", "priority", "label", "due"], project_names=project_names, today=self.today)
+
+        stats.add({"project_id": "123", "priority": 4, "labels": ["a", "b"], "due": {"date": "2024-01-01"}})
+        stats.add({"project_id": "123", "priority": 1, "labels": [], "due": None})
+        stats.add({"project_id": "999", "priority": 4, "labels": ["a"]})
+
+        result = stats.result()
+        assert result["total"] == 3
+        assert result["groups"]["by_project"] == {"Work": 2, "999": 1}
+        assert result["groups"]["by_priority"] == {"4": 2, "1": 1}
+        assert result["groups"]["by_label"] == {"a": 2, "b": 1, "no_label": 1}
+        assert result["groups"]["by_due"] == {"no_date": 2, "overdue": 1}
+
+    def test_completed_day(self, sample_completed_tasks):
+        """Test grouping completed tasks by completion day"""
+        stats = TaskStats(["completed_day"])
+        for task in sample_completed_tasks["items"]:
+            stats.add(task)
+
+        assert stats.result()["groups"]["by_completed_day"] == {"2024-01-01": 2}
+
+    def test_unknown_dimension(self):
+        """Test that unknown dimensions are rejected"""
+        stats = TaskStats(["colour"])
+        with pytest.raises(ValueError):
+            stats.add({})
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+import stat
+import pytest
+from todoist_mcp_server.cache import TTLCache
+from todoist_mcp_server.store import SharedStore
+
+
+def _write_from_other_process(directory):
+    SharedStore(directory, "tenant").set("projects", [{"id": "1", "name": "Work"}], 60)
+
+
+class TestSharedStore:
+    """Test cases for the cross-process cache store"""
+
+    def test_set_get_delete(self, tmp_path):
+        """Test round-tripping, expiry and deletion"""
+        store = SharedStore(str(tmp_path), "tenant")
+
+        stamp = store.set("projects", [{"id": "1"}], 60)
+        assert store.get("projects") == (stamp, [{"id": "1"}])
+        assert store.stamp("projects") == stamp
+
+        store.set(("collaborators", "1"), [], 0)
+        assert store.get(("collaborators", "1")) is None
+        store.purge_expired()
+
+        store.delete("projects")
+        assert store.get("projects") is None
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+    def test_files_are_private(self, tmp_path):
+        """Test that the cache directory and database are only accessible to their owner"""
+        directory = tmp_path / "cache"
+        store = SharedStore(str(directory), "tenant")
+        store.set("projects", [], 60)
+
+        assert stat.S_IMODE(os.stat(directory).st_mode) & 0o077 == 0
+        assert stat.S_IMODE(os.stat(store.path).st_mode) & 0o077 == 0
+
+    def test_non_serializable_values_are_skipped(self, tmp_path):
+        """Test that values that aren't JSON are not stored"""
+        store = SharedStore(str(tmp_path), "tenant")
+        assert store.set("tree", object(), 60) is None
+        assert store.get("tree") is None
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test that tenants never see each other's entries"""
+        first = SharedStore(str(tmp_path), "first")
+        second = SharedStore(str(tmp_path), "second")
+
+        first.set("labels", ["a"], 60)
+        second.set("labels", ["b"], 60)
+        first.delete()
+
+        assert first.get("labels") is None
+        assert second.get("labels")[1] == ["b"]
+
+    def test_shared_across_processes(self, tmp_path):
+        """Test that an entry written by another process is visible"""
+        process = multiprocessing.get_context("spawn").Process(
+            target=_write_from_other_process, args=(str(tmp_path),))
+        process.start()
+        process.join(30)
+
+        assert SharedStore(str(tmp_path), "tenant").get("projects")[1] == [{"id": "1", "name": "Work"}]
+
+
+class TestTTLCacheWithStore:
+    """Test cases for the two-tier cache"""
+
+    def test_entries_shared_between_caches(self, tmp_path):
+        """Test that one worker's cache fill is visible to another"""
+        worker_a = TTLCache(60, store=SharedStore(str(tmp_path), "tenant"))
+        worker_b = TTLCache(60, store=SharedStore(str(tmp_path), "tenant"))
+
+        worker_a.set("projects", [{"id": "1"}])
+        first = worker_b.get("projects")
+        assert first == [{"id": "1"}]
+        assert worker_b.get("projects") is first
+
+    def test_invalidation_reaches_other_workers(self, tmp_path):
+        """Test that invalidating or replacing in one worker is seen by the others"""
+        worker_a = TTLCache(60, store=SharedStore(str(tmp_path), "tenant"))
+        worker_b = TTLCache(60, store=SharedStore(str(tmp_path), "tenant"))
+
+        worker_a.set("tasks", [1])
+        assert worker_b.get("tasks") == [1]
+
+        worker_a.set("tasks", [1, 2])
+        assert worker_b.get("tasks") == [1, 2]
+
+        worker_a.invalidate("tasks")
+        assert worker_b.get("tasks") is None
+
+        worker_a.set("tasks", [3])
+        worker_a.invalidate()
+        assert worker_b.get("tasks") is None
+
+    def test_local_only_values(self, tmp_path):
+        """Test that values the store can't hold stay in the local tier"""
+        cache = TTLCache(60, store=SharedStore(str(tmp_path), "tenant"))
+        value = object()
+        cache.set("tree", value)
+        assert cache.get("tree") is value
@@ -1,8 +1,9 @@
+import asyncio
 import pytest
 import httpx
 import respx
 from unittest.mock import AsyncMock, patch
-from todoist_mcp_server.todoist_client import TodoistClient
+from todoist_mcp_server.todoist_client import TodoistClient, TodoistAPIError
 
 
 class TestTodoistClient:
@@ -217,4 +218,663 @@ class TestTodoistClient:
         result = await client._make_request("GET", "tasks")
         
         assert "error" in result
-        assert "HTTP error" in result["error"] 
\ No newline at end of file
+        assert "HTTP error" in result["error"] 
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_make_request_sends_request_id(self, mock_env, reset_singleton):
+        """Test that every request carries an X-Request-Id header"""
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=[])
+        )
+
+        client = TodoistClient()
+        await client._make_request("GET", "tasks")
+
+        assert route.calls.last.request.headers["X-Request-Id"]
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_create_task_retries_with_same_request_id(self, mock_env, sample_task_data, reset_singleton):
+        """Test that a POST is retried on 5xx and network errors with a stable request id"""
+        route = respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            side_effect=[
+                httpx.ConnectError("Connection failed"),
+                httpx.Response(503),
+                httpx.Response(200, json=sample_task_data)
+            ]
+        )
+
+        client = TodoistClient()
+        result = await client.create_task(content="Test task", request_id="abc123")
+
+        assert result == sample_task_data
+        assert route.call_count == 3
+        request_ids = {call.request.headers["X-Request-Id"] for call in route.calls}
+        assert request_ids == {"abc123"}
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_make_request_gives_up_after_max_retries(self, mock_env, monkeypatch, reset_singleton):
+        """Test that retries stop after TODOIST_MAX_RETRIES attempts"""
+        monkeypatch.setenv("TODOIST_MAX_RETRIES", "1")
+        route = respx.post("https://api.todoist.com/api/v1/tasks/task_123/close").mock(
+            return_value=httpx.Response(500)
+        )
+
+        client = TodoistClient()
+        result = await client.complete_task("task_123")
+
+        assert "error" in result
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_make_request_does_not_retry_client_errors(self, mock_env, reset_singleton):
+        """Test that 4xx responses are returned without retrying"""
+        route = respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(400)
+        )
+
+        client = TodoistClient()
+        result = await client.create_task(content="Bad task")
+
+        assert "error" in result
+        assert route.call_count == 1
+
+    def test_client_timeouts_from_env(self, mock_env, monkeypatch, reset_singleton):
+        """Test that connect/read/write timeouts are configurable"""
+        monkeypatch.setenv("TODOIST_CONNECT_TIMEOUT", "1.5")
+        monkeypatch.setenv("TODOIST_READ_TIMEOUT", "3")
+        monkeypatch.setenv("TODOIST_WRITE_TIMEOUT", "2")
+
+        client = TodoistClient()
+
+        assert client.timeout.connect == 1.5
+        assert client.timeout.read == 3.0
+        assert client.timeout.write == 2.0
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_iter_tasks_follows_cursor(self, mock_env, reset_singleton):
+        """Test that iter_tasks streams every page of a paginated response"""
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            side_effect=[
+                httpx.Response(200, json={"results": [{"id": "1"}, {"id": "2"}], "next_cursor": "c1"}),
+                httpx.Response(200, json={"results": [{"id": "3"}], "next_cursor": None})
+            ]
+        )
+
+        client = TodoistClient()
+        tasks = [task async for task in client.iter_tasks(project_id="123", page_size=2)]
+
+        assert [task["id"] for task in tasks] == ["1", "2", "3"]
+        assert route.calls[1].request.url.params["cursor"] == "c1"
+        assert route.calls[0].request.url.params["project_id"] == "123"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_iter_tasks_unpaginated_list(self, mock_env, sample_tasks_list, reset_singleton):
+        """Test that iter_tasks handles a plain list response"""
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=sample_tasks_list)
+        )
+
+        client = TodoistClient()
+        tasks = [task async for task in client.iter_tasks()]
+
+        assert tasks == sample_tasks_list
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_iter_completed_tasks_error(self, mock_env, reset_singleton):
+        """Test that streaming raises TodoistAPIError on API errors"""
+        respx.get("https://api.todoist.com/api/v1/tasks/completed/by_completion_date").mock(
+            return_value=httpx.Response(401)
+        )
+
+        client = TodoistClient()
+        with pytest.raises(TodoistAPIError):
+            async for _ in client.iter_completed_tasks(since="2024-01-01", until="2024-01-02"):
+                pass
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_projects_is_cached(self, mock_env, sample_project_data, reset_singleton):
+        """Test that projects are fetched once and then served from cache"""
+        route = respx.get("https://api.todoist.com/api/v1/projects").mock(
+            return_value=httpx.Response(200, json={"results": sample_project_data, "next_cursor": None})
+        )
+
+        client = TodoistClient()
+        assert await client.get_projects() == sample_project_data
+        assert await client.find_project_by_name("Personal") == "456"
+        assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_task_tree_invalidated_on_create(self, mock_env, sample_project_data,
+                                                       sample_tasks_list, sample_task_data, reset_singleton):
+        """Test that the tree is built from cached listings and rebuilt after a write"""
+        respx.get("https://api.todoist.com/api/v1/projects").mock(
+            return_value=httpx.Response(200, json=sample_project_data)
+        )
+        respx.get("https://api.todoist.com/api/v1/sections").mock(
+            return_value=httpx.Response(200, json={"results": [], "next_cursor": None})
+        )
+        tasks_route = respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json={"results": sample_tasks_list, "next_cursor": None})
+        )
+        respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=sample_task_data)
+        )
+
+        client = TodoistClient()
+        tree = await client.get_task_tree()
+        assert await client.get_task_tree() is tree
+        assert "task:task_1" in tree
+
+        await client.create_task(content="Test task")
+        assert await client.get_task_tree() is not tree
+        assert tasks_route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_task_tree_error(self, mock_env, reset_singleton):
+        """Test that listing errors surface when building the tree"""
+        respx.get("https://api.todoist.com/api/v1/projects").mock(return_value=httpx.Response(500))
+        respx.get("https://api.todoist.com/api/v1/sections").mock(return_value=httpx.Response(200, json=[]))
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(200, json=[]))
+
+        client = TodoistClient()
+        with pytest.raises(TodoistAPIError):
+            await client.get_task_tree()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_resolve_labels(self, mock_env, reset_singleton):
+        """Test label resolution against the cached label list"""
+        route = respx.get("https://api.todoist.com/api/v1/labels").mock(
+            return_value=httpx.Response(200, json={"results": [{"id": "1", "name": "Errands"},
+                                                               {"id": "2", "name": "deep-work"}]})
+        )
+
+        client = TodoistClient()
+        resolved, unknown = await client.resolve_labels(["errands", "Deep Work", "errnads", "shopping"])
+
+        assert resolved == ["Errands", "deep-work", "errnads", "shopping"]
+        assert unknown == {"errnads": "Errands", "shopping": None}
+        await client.resolve_labels(["errands"])
+        assert route.call_count == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_resolve_labels_near_misses_stay_unknown(self, mock_env, reset_singleton):
+        """Test that labels resembling existing ones are reported, not substituted"""
+        respx.get("https://api.todoist.com/api/v1/labels").mock(
+            return_value=httpx.Response(200, json={"results": [{"id": "1", "name": "2024-goals"},
+                                                               {"id": "2", "name": "work"},
+                                                               {"id": "3", "name": "urgent"}]})
+        )
+
+        client = TodoistClient()
+        names = ["2025-goals", "work-urgent", "urgent call"]
+        resolved, unknown = await client.resolve_labels(names)
+
+        assert resolved == names
+        assert list(unknown) == names
+        assert unknown["2025-goals"] == "2024-goals"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_resolve_labels_api_error(self, mock_env, reset_singleton):
+        """Test that label resolution passes names through when labels can't be fetched"""
+        respx.get("https://api.todoist.com/api/v1/labels").mock(return_value=httpx.Response(500))
+
+        client = TodoistClient()
+        assert await client.resolve_labels(["a"]) == (["a"], {})
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_create_task_with_new_label_invalidates_labels(self, mock_env, sample_task_data, reset_singleton):
+        """Test that creating a task with a new label refreshes the label cache"""
+        labels_route = respx.get("https://api.todoist.com/api/v1/labels").mock(
+            return_value=httpx.Response(200, json=[{"id": "1", "name": "Errands"}])
+        )
+        create_route = respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=sample_task_data)
+        )
+
+        client = TodoistClient()
+        await client.get_labels()
+        await client.create_task(content="Test task", labels=["Errands"], section_id="s1", assignee_id="u1")
+        await client.get_labels()
+        assert labels_route.call_count == 1
+
+        await client.create_task(content="Test task", labels=["new"])
+        await client.get_labels()
+        assert labels_route.call_count == 2
+        sent = create_route.calls[0].request.content
+        assert b'"section_id":"s1"' in sent.replace(b" ", b"")
+        assert b'"assignee_id":"u1"' in sent.replace(b" ", b"")
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_find_section_by_name(self, mock_env, reset_singleton):
+        """Test fuzzy section lookup scoped to a project"""
+        respx.get("https://api.todoist.com/api/v1/sections").mock(
+            return_value=httpx.Response(200, json=[{"id": "s1", "name": "Backlog", "project_id": "123"},
+                                                   {"id": "s2", "name": "Backlog", "project_id": "456"}])
+        )
+
+        client = TodoistClient()
+        assert await client.find_section_by_name("backlog", "456") == "s2"
+        assert await client.find_section_by_name("Backlgo", "123") == "s1"
+        assert await client.find_section_by_name("Done", "123") is None
+        # The same section name in two projects can't be told apart without a project
+        assert await client.find_section_by_name("Backlgo") is None
+        assert "is ambiguous" in (await client.resolve_section("Backlog"))["error"]
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_find_collaborator_by_name(self, mock_env, reset_singleton):
+        """Test collaborator lookup by name or email, cached per project"""
+        route = respx.get("https://api.todoist.com/api/v1/projects/123/collaborators").mock(
+            return_value=httpx.Response(200, json={"results": [
+                {"id": "u1", "name": "Alice Smith", "email": "alice@example.com"},
+                {"id": "u2", "name": "Bob Jones", "email": "bob@example.com"}
+            ]})
+        )
+
+        client = TodoistClient()
+        assert await client.find_collaborator_by_name("BOB@example.com", "123") == "u2"
+        assert await client.find_collaborator_by_name("alice smith", "123") == "u1"
+        assert await client.find_collaborator_by_name("Carol", "123") is None
+        assert route.call_count == 1
+        index = client._name_indexes[("collaborators", "123")][1]
+        await client.find_collaborator_by_name("alice smith", "123")
+        assert client._name_indexes[("collaborators", "123")][1] is index
+
+        client.invalidate_cache(("collaborators", "123"))
+        await client.find_collaborator_by_name("Bob Jones", "123")
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_resolve_collaborator_ambiguous(self, mock_env, reset_singleton):
+        """Test that near-identical collaborator names are reported instead of guessed"""
+        respx.get("https://api.todoist.com/api/v1/projects/123/collaborators").mock(
+            return_value=httpx.Response(200, json={"results": [
+                {"id": "u1", "name": "Chris Park", "email": "park@example.com"},
+                {"id": "u2", "name": "Chris Parker", "email": "parker@example.com"}
+            ]})
+        )
+
+        client = TodoistClient()
+        assert await client.resolve_collaborator("chris parke", "123") == {
+            "error": "Collaborator 'chris parke' is ambiguous. Did you mean 'Chris Parker' or 'Chris Park'?"}
+        assert await client.resolve_collaborator("Chris P", "123") == {
+            "error": "Collaborator 'Chris P' is ambiguous. Did you mean 'Chris Park' or 'Chris Parker'?"}
+        assert await client.find_collaborator_by_name("Chris P", "123") is None
+        assert (await client.resolve_collaborator("Chris Parker", "123"))["id"] == "u2"
+        assert (await client.resolve_collaborator("park@example.com", "123"))["id"] == "u1"
+
+    @pytest.mark.asyncio
+    async def test_match_project_fuzzy(self, mock_env, sample_project_data, reset_singleton):
+        """Test fuzzy project matching with confidence and index reuse"""
+        client = TodoistClient()
+
+        with patch.object(client, 'get_projects', return_value=sample_project_data):
+            match = await client.match_project("work stuff")
+            assert match["id"] == "123"
+            assert match["confidence"] == 0.8
+            index = client._name_indexes["projects"][1]
+
+            assert await client.resolve_project("work stuff") == {"id": "123", "name": "Work", "confidence": 0.8}
+            assert await client.resolve_project("Personal Work") is None
+
+            assert await client.find_project_by_name("Persnal") == "456"
+            assert client._name_indexes["projects"][1] is index
+
+            match = await client.match_project("Work")
+            assert match["confidence"] == 1.0
+            assert await client.match_project("zzz") is None
+
+        with patch.object(client, 'get_projects', return_value=list(sample_project_data)):
+            await client.match_project("Work")
+            assert client._name_indexes["projects"][1] is not index
+
+    @pytest.mark.asyncio
+    async def test_resolve_project_requires_margin(self, mock_env, reset_singleton):
+        """Test that a fuzzy match tied with the runner-up is not accepted"""
+        client = TodoistClient()
+        projects = [{"id": "1", "name": "Work 1"}, {"id": "2", "name": "Work 2"}]
+
+        with patch.object(client, 'get_projects', return_value=projects):
+            assert (await client.match_project("work"))["confidence"] >= client.match_threshold
+            assert await client.resolve_project("work") is None
+            assert await client.find_project_by_name("Work 2") == "2"
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_pool_reused_within_loop(self, mock_env, reset_singleton):
+        """Test that requests on one event loop share a connection pool"""
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(200, json=[]))
+
+        client = TodoistClient()
+        await client._make_request("GET", "tasks")
+        pool = await client._get_http_client()
+        await client._make_request("GET", "tasks")
+
+        assert await client._get_http_client() is pool
+        assert len(client._http_clients) == 1
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_context_manager_drains_in_flight_requests(self, mock_env, reset_singleton):
+        """Test that closing waits for in-flight requests and rejects new ones"""
+        async def slow_response(request):
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=[{"id": "1"}])
+
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(side_effect=slow_response)
+
+        async with TodoistClient() as client:
+            in_flight = asyncio.create_task(client._make_request("GET", "tasks"))
+            await asyncio.sleep(0.01)
+            closing = asyncio.create_task(client.aclose())
+            await asyncio.sleep(0)
+            rejected = await client._make_request("GET", "tasks")
+            await closing
+
+        assert in_flight.result() == [{"id": "1"}]
+        assert "shutting down" in rejected["error"]
+        assert len(client._http_clients) == 0
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_aclose_cancels_requests_past_timeout(self, mock_env, reset_singleton):
+        """Test that requests outliving the drain timeout are cancelled"""
+        async def hanging(request):
+            await asyncio.sleep(10)
+
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(side_effect=hanging)
+
+        client = TodoistClient()
+        in_flight = asyncio.create_task(client._make_request("GET", "tasks"))
+        await asyncio.sleep(0.01)
+        await client.aclose(timeout=0.01)
+
+        assert in_flight.cancelled()
+
+    def test_pools_are_per_loop_and_leaks_detected(self, mock_env, reset_singleton):
+        """Test that each event loop gets its own pool and abandoned pools are reported"""
+        client = TodoistClient()
+
+        first_loop = asyncio.new_event_loop()
+        first_pool = first_loop.run_until_complete(client._get_http_client())
+        first_loop.close()
+
+        second_loop = asyncio.new_event_loop()
+        with pytest.warns(ResourceWarning, match="leaked"):
+            second_pool = second_loop.run_until_complete(client._get_http_client())
+        assert second_pool is not first_pool
+        assert len(client._http_clients) == 1
+
+        second_loop.run_until_complete(client.aclose())
+        second_loop.close()
+        assert second_pool.is_closed
+
+    @pytest.mark.asyncio
+    async def test_shutdown_resets_singleton(self, mock_env, reset_singleton):
+        """Test that shutdown closes the shared client and a new one can be created"""
+        client = TodoistClient()
+        pool = await client._get_http_client()
+
+        await TodoistClient.shutdown()
+
+        assert pool.is_closed
+        assert TodoistClient() is not client
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_shared_cache_dir(self, mock_env, monkeypatch, tmp_path, sample_project_data, reset_singleton):
+        """Test that TODOIST_CACHE_DIR lets separate clients share cached listings"""
+        monkeypatch.setenv("TODOIST_CACHE_DIR", str(tmp_path))
+        route = respx.get("https://api.todoist.com/api/v1/projects").mock(
+            return_value=httpx.Response(200, json=sample_project_data)
+        )
+
+        await TodoistClient().get_projects()
+        TodoistClient._instance = None
+        TodoistClient._initialized = False
+
+        assert await TodoistClient().get_projects() == sample_project_data
+        assert route.call_count == 1
+
+    def test_snapshots(self, mock_env, monkeypatch, reset_singleton):
+        """Test saving and loading result snapshots with bounded retention"""
+        monkeypatch.setenv("TODOIST_MAX_SNAPSHOTS", "2")
+        client = TodoistClient()
+
+        first = client.save_snapshot([{"id": "1"}], "active_tasks")
+        second = client.save_snapshot([{"id": "2"}], "active_tasks")
+        assert client.load_snapshot(first, "active_tasks") == [{"id": "1"}]
+        assert client.load_snapshot(first, "completed_tasks") is None
+
+        client.save_snapshot([{"id": "3"}], "active_tasks")
+        assert client.load_snapshot(first, "active_tasks") is None
+        assert client.load_snapshot(second, "active_tasks") == [{"id": "2"}]
+        assert client.load_snapshot("missing", "active_tasks") is None
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_due_index_reused_until_tasks_change(self, mock_env, sample_task_data, reset_singleton):
+        """Test that the due index is built once per cached task list"""
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=[{"id": "1", "due": {"date": "2024-01-10"}}])
+        )
+        respx.post("https://api.todoist.com/api/v1/tasks").mock(
+            return_value=httpx.Response(200, json=sample_task_data)
+        )
+
+        client = TodoistClient()
+        index = await client.get_due_index()
+        assert await client.get_due_index() is index
+
+        await client.create_task(content="Test task")
+        assert await client.get_due_index() is not index
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_due_index_error(self, mock_env, reset_singleton):
+        """Test that task listing errors surface from the due index"""
+        respx.get("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(401))
+
+        client = TodoistClient()
+        with pytest.raises(TodoistAPIError):
+            await client.get_due_index()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_circuit_breaker_short_circuits_failing_endpoint(self, mock_env, monkeypatch, reset_singleton):
+        """Test that repeated failures stop requests to that endpoint class only"""
+        monkeypatch.setenv("TODOIST_MAX_RETRIES", "0")
+        monkeypatch.setenv("TODOIST_BREAKER_THRESHOLD", "2")
+        tasks = respx.get("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(503))
+        create = respx.post("https://api.todoist.com/api/v1/tasks").mock(return_value=httpx.Response(200, json={}))
+        respx.get("https://api.todoist.com/api/v1/projects").mock(return_value=httpx.Response(200, json=[]))
+
+        client = TodoistClient()
+        await client.get_tasks()
+        await client.get_tasks()
+        assert client.circuit_open("tasks")
+        assert not client.circuit_open("projects")
+
+        result = await client.get_tasks()
+        assert result["circuit_open"] is True
+        assert "tasks requests keep failing" in result["error"]
+        assert tasks.call_count == 2
+
+        # Writes to the same endpoint class fail fast too
+        result = await client.create_task(content="Test task")
+        assert result["circuit_open"] is True
+        assert create.call_count == 0
+
+        assert await client.get_projects() == []
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_circuit_breaker_ignores_client_errors(self, mock_env, monkeypatch, reset_singleton):
+        """Test that 4xx responses don't open the circuit"""
+        monkeypatch.setenv("TODOIST_BREAKER_THRESHOLD", "1")
+        respx.post("https://api.todoist.com/api/v1/tasks/1/close").mock(return_value=httpx.Response(404))
+
+        client = TodoistClient()
+        assert "error" in await client.complete_task("1")
+        assert not client.circuit_open()
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_circuit_breaker_recovers_through_probe(self, mock_env, monkeypatch, reset_singleton):
+        """Test that a successful half-open probe closes the circuit"""
+        monkeypatch.setenv("TODOIST_MAX_RETRIES", "0")
+        monkeypatch.setenv("TODOIST_BREAKER_THRESHOLD", "1")
+        monkeypatch.setenv("TODOIST_BREAKER_RESET", "0")
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(
+            side_effect=[httpx.ConnectError("Connection failed"), httpx.Response(200, json=[{"id": "1"}])]
+        )
+
+        client = TodoistClient()
+        await client.get_tasks()
+        assert client.circuit_open("tasks")
+
+        assert await client.get_tasks() == [{"id": "1"}]
+        assert not client.circuit_open("tasks")
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_cached_listings_served_while_circuit_open(self, mock_env, monkeypatch, sample_project_data,
+                                                             reset_singleton):
+        """Test that cached listings fall back to their last copy when the circuit is open"""
+        monkeypatch.setenv("TODOIST_MAX_RETRIES", "0")
+        monkeypatch.setenv("TODOIST_BREAKER_THRESHOLD", "1")
+        respx.get("https://api.todoist.com/api/v1/projects").mock(
+            side_effect=[httpx.Response(200, json=[sample_project_data]), httpx.Response(503)]
+        )
+        respx.get("https://api.todoist.com/api/v1/sections").mock(return_value=httpx.Response(503))
+
+        client = TodoistClient()
+        projects = await client.get_projects()
+        client.invalidate_cache()
+
+        assert "error" in await client.get_projects()
+        assert await client.get_projects() is projects
+
+        assert "error" in await client.get_sections()
+        result = await client.get_sections()
+        assert result["circuit_open"] is True
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_comments_cached_until_task_updates(self, mock_env, reset_singleton):
+        """Test that comments are cached per task and refetched when the task's updated_at changes"""
+        route = respx.get("https://api.todoist.com/api/v1/comments", params={"task_id": "1"}).mock(
+            return_value=httpx.Response(200, json={"results": [{"id": "c1", "content": "Note"}], "next_cursor": None})
+        )
+
+        client = TodoistClient()
+        assert await client.get_comments("1", "2024-01-01T10:00:00Z") == [{"id": "c1", "content": "Note"}]
+        await client.get_comments("1", "2024-01-01T10:00:00Z")
+        assert route.call_count == 1
+
+        await client.get_comments("1", "2024-01-02T10:00:00Z")
+        assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_comments_for_tasks_bounded_concurrency(self, mock_env, monkeypatch, reset_singleton):
+        """Test that comment fetches run concurrently but never more than the limit at once"""
+        monkeypatch.setenv("TODOIST_COMMENT_CONCURRENCY", "3")
+        active, peak = 0, 0
+
+        async def comments(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json=[{"id": f"c{request.url.params['task_id']}"}])
+
+        route = respx.get("https://api.todoist.com/api/v1/comments").mock(side_effect=comments)
+
+        client = TodoistClient()
+        tasks = [{"id": str(i)} for i in range(10)] + [{"id": "quiet", "note_count": 0}]
+        result = await client.get_comments_for_tasks(tasks)
+
+        assert peak == 3
+        assert route.call_count == 10
+        assert result["4"] == [{"id": "c4"}]
+        assert "quiet" not in result
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_tasks_pages_in_tuned_sizes(self, mock_env, reset_singleton):
+        """Test that get_tasks follows cursors in tuned page sizes until it has `limit` tasks"""
+        def tasks(request):
+            limit = int(request.url.params["limit"])
+            start = int(request.url.params.get("cursor", 0))
+            return httpx.Response(200, json={"results": [{"id": str(i)} for i in range(start, start + limit)],
+                                             "next_cursor": str(start + limit)})
+
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(side_effect=tasks)
+
+        client = TodoistClient()
+        result = await client.get_tasks(limit=250)
+
+        assert [task["id"] for task in result] == [str(i) for i in range(250)]
+        assert [call.request.url.params["limit"] for call in route.calls] == ["200", "50"]
+
+        stats = client.tuning_stats()["tasks"]
+        assert set(stats["sizes"]) == {"50", "200"}
+        assert stats["sizes"]["200"]["pages"] == 1
+        assert stats["sizes"]["200"]["bytes"] > 0
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_get_completed_tasks_beyond_api_maximum(self, mock_env, reset_singleton):
+        """Test that completed task listings are no longer capped at one page"""
+        respx.get("https://api.todoist.com/api/v1/tasks/completed/by_completion_date").mock(side_effect=[
+            httpx.Response(200, json={"items": [{"id": str(i)} for i in range(200)], "next_cursor": "next"}),
+            httpx.Response(200, json={"items": [{"id": str(i)} for i in range(200, 250)], "next_cursor": None}),
+        ])
+
+        client = TodoistClient()
+        result = await client.get_completed_tasks(limit=300)
+
+        assert len(result["items"]) == 250
+        assert client.tuning_stats()["tasks/completed/by_completion_date"]["typical_total"] == 250
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_streaming_prefetches_for_slow_consumers(self, mock_env, reset_singleton):
+        """Test that pages are fetched ahead once the caller is measured to be slow"""
+        def tasks(request):
+            cursor = int(request.url.params.get("cursor", 0))
+            return httpx.Response(200, json={"results": [{"id": str(cursor)}],
+                                             "next_cursor": str(cursor + 1) if cursor < 3 else None})
+
+        route = respx.get("https://api.todoist.com/api/v1/tasks").mock(side_effect=tasks)
+        client = TodoistClient()
+        tuner = client._tuner("tasks")
+        for size in (25, 50, 100, 200):
+            tuner.observe(size, 0.001, 100)
+        tuner.observe_consumer(1.0)
+
+        stream = client.iter_tasks()
+        assert (await anext(stream))["id"] == "0"
+        await asyncio.sleep(0.05)
+        # The next page was fetched while the caller was busy
+        assert route.call_count >= 2
+        assert [task["id"] async for task in stream] == ["1", "2", "3"]
@@ -0,0 +1,75 @@
+import pytest
+from todoist_mcp_server.tree import TaskTree
+
+
+@pytest.fixture
+def tree():
+    """A small account with a sub-project, a section and a subtask"""
+    projects = [
+        {"id": "1", "name": "Work", "child_order": 1},
+        {"id": "2", "name": "Inbox", "child_order": 0},
+        {"id": "3", "name": "Meetings", "parent_id": "1", "child_order": 0},
+    ]
+    sections = [{"id": "s1", "name": "Backlog", "project_id": "1", "section_order": 0}]
+    tasks = [
+        {"id": "t1", "content": "Write report", "project_id": "1", "section_id": "s1", "priority": 4,
+         "due": {"date": "2024-01-10"}},
+        {"id": "t2", "content": "Outline", "project_id": "1", "section_id": "s1", "parent_id": "t1"},
+        {"id": "t3", "content": "Loose task", "project_id": "1"},
+        {"id": "t4", "content": "Orphan subtask", "project_id": "2", "parent_id": "missing"},
+    ]
+    return TaskTree(projects, sections, tasks)
+
+
+class TestTaskTree:
+    """Test cases for the project/section/task tree"""
+
+    def test_full_tree(self, tree):
+        """Test that the hierarchy and ordering are reconstructed"""
+        result = tree.render(max_depth=5)
+
+        assert [node["name"] for node in result["nodes"]] == ["Inbox", "Work"]
+        work = result["nodes"][1]
+        assert [child["id"] for child in work["children"]] == ["project:3", "task:t3", "section:s1"]
+        report = work["children"][2]["children"][0]
+        assert report == {
+            "id": "task:t1", "content": "Write report", "priority": 4, "due": "2024-01-10",
+            "children": [{"id": "task:t2", "content": "Outline"}]
+        }
+        assert result["node_count"] == 8
+        assert result["truncated"] is False
+
+    def test_orphans_attach_to_project(self, tree):
+        """Test that subtasks with a missing parent are attached to their project"""
+        inbox = tree.render(root="project:2")
+        assert inbox["nodes"] == [{"id": "task:t4", "content": "Orphan subtask"}]
+
+    def test_depth_limit(self, tree):
+        """Test that nodes past max_depth report children_count instead of children"""
+        result = tree.render(max_depth=1)
+
+        work = result["nodes"][1]
+        assert "children" not in work
+        assert work["children_count"] == 3
+
+    def test_lazy_expansion(self, tree):
+        """Test expanding a subtree by node ID"""
+        result = tree.render(root="section:s1", max_depth=1)
+
+        assert result["nodes"] == [{"id": "task:t1", "content": "Write report", "priority": 4,
+                                    "due": "2024-01-10", "children_count": 1}]
+
+    def test_size_limit(self, tree):
+        """Test that the node budget truncates the tree"""
+        result = tree.render(max_depth=5, max_nodes=3)
+
+        assert result["node_count"] == 3
+        assert result["truncated"] is True
+        work = result["nodes"][1]
+        assert work["children_count"] == 3
+        assert "children" not in work
+
+    def test_contains(self, tree):
+        """Test node lookup"""
+        assert "task:t2" in tree
+        assert "task:nope" not in tree
@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from todoist_mcp_server.tuning import PageTuner, prefetched
+
+
+class TestPageTuner:
+    """Test cases for page-size autotuning"""
+
+    def test_explores_unmeasured_sizes_largest_first(self):
+        """Test that every useful size is tried once before estimates are trusted"""
+        tuner = PageTuner()
+        assert tuner.choose() == 200
+        assert tuner.choose(30) == 50
+        assert tuner.choose(10) == 25
+
+        tuner.observe(200, 0.5, 40000)
+        assert tuner.choose() == 100
+        tuner.observe(100, 0.3, 20000)
+        tuner.observe(50, 0.2, 10000)
+        tuner.observe(25, 0.2, 5000)
+        assert tuner.pages == {200: 1, 100: 1, 50: 1, 25: 1}
+
+    def test_chooses_fastest_size_for_remaining_items(self):
+        """Test that the size minimizing the estimated time to complete wins"""
+        tuner = PageTuner()
+        for size, latency in [(25, 0.1), (50, 0.12), (100, 0.5), (200, 0.9)]:
+            tuner.observe(size, latency, size * 100)
+
+        # 200 items: 4 pages of 50 (0.48s) beat 1 page of 200 (0.9s) and 8 pages of 25 (0.8s)
+        assert tuner.choose(200) == 50
+        assert tuner.estimate(50, 200) == pytest.approx(0.48)
+        # A small remainder only considers pages that just cover it
+        assert tuner.choose(20) == 25
+
+    def test_partial_pages_count_towards_covering_size(self):
+        """Test that a page requested with an odd limit is recorded under the size covering it"""
+        tuner = PageTuner()
+        tuner.observe(30, 0.2, 3000)
+        assert tuner.latency == {50: 0.2}
+        assert tuner.bucket(500) == 200
+
+    def test_prefetch_only_when_caller_does_work(self):
+        """Test the prefetch depth rules"""
+        tuner = PageTuner()
+        tuner.observe(200, 1.0, 1000)
+        assert tuner.prefetch(200) == 0
+
+        tuner.observe_consumer(0.01)
+        assert tuner.prefetch(200) == 0
+
+        tuner.consumer = 0.5
+        assert tuner.prefetch(200) == 1
+        assert tuner.prefetch(200, remaining=150) == 0
+
+        tuner.observe(200, 3.0, 1000)
+        assert tuner.prefetch(200) == 2
+
+    def test_snapshot(self):
+        """Test the instrumentation snapshot"""
+        tuner = PageTuner()
+        tuner.observe(200, 0.25, 1000)
+        tuner.observe_total(120)
+
+        snapshot = tuner.snapshot()
+        assert snapshot["typical_total"] == 120
+        assert snapshot["page_size"] == 100
+        assert snapshot["prefetch"] == 0
+        assert snapshot["sizes"] == {"200": {"pages": 1, "latency": 0.25, "bytes": 1000}}
+
+
+class TestPrefetched:
+    """Test cases for the prefetching iterator"""
+
+    @pytest.mark.asyncio
+    async def test_runs_ahead_of_consumer(self):
+        """Test that pages are fetched while the consumer is busy"""
+        fetched = []
+
+        async def pages():
+            for page in range(4):
+                fetched.append(page)
+                yield page
+
+        seen = []
+        async for page in prefetched(pages(), depth=2):
+            await asyncio.sleep(0.01)
+            seen.append((page, len(fetched)))
+
+        assert [page for page, _ in seen] == [0, 1, 2, 3]
+        assert seen[0][1] > 1
+
+    @pytest.mark.asyncio
+    async def test_propagates_errors_and_stops_producer(self):
+        """Test that producer errors reach the consumer and early exit cancels the producer"""
+        async def failing():
+            yield 1
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            async for _ in prefetched(failing(), depth=1):
+                pass
+
+        closed = asyncio.Event()
+
+        async def endless():
+            try:
+                page = 0
+                while True:
+                    page += 1
+                    yield page
+            finally:
+                closed.set()
+
+        pages = prefetched(endless(), depth=1)
+        assert await anext(pages) == 1
+        await pages.aclose()
+        assert closed.is_set()
@@ -0,0 +1,146 @@
+"""Sorted due-date index over active tasks, with lazy expansion of recurring tasks"""
+import bisect
+import heapq
+import re
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+_WEEKDAYS = {name: number for number, names in enumerate([
+    ("monday", "mon"), ("tuesday", "tue", "tues"), ("wednesday", "wed"), ("thursday", "thu", "thurs"),
+    ("friday", "fri"), ("saturday", "sat"), ("sunday", "sun")]) for name in names}
+
+_INTERVAL = re.compile(r"^every!?\s+(?:(\d+|other)\s+)?(day|week|month|year)s?\b")
+# A time of day doesn't change which dates a rule falls on: "every mon at 9am", "every day at 17:30"
+_AT_TIME = re.compile(r"\s+at\s+(?:\d{1,2}(?:[:.]\d{2})?\s*(?:am|pm)?|noon|midnight)$")
+_SHORTHAND = {"daily": "every day", "weekly": "every week", "monthly": "every month", "yearly": "every year"}
+
+
+def _add_months(day: date, months: int, anchor: int) -> date:
+    month = day.month - 1 + months
+    year = day.year + month // 12
+    month = month % 12 + 1
+    for candidate in (anchor, 30, 29, 28):
+        try:
+            return date(year, month, min(candidate, anchor))
+        except ValueError:
+            continue
+    raise ValueError(f"Cannot add {months} months to {day}")
+
+
+def recurrence(rule: str) -> Optional[Callable[[date], Iterator[date]]]:
+    """
+    Turn a Todoist recurrence string into a generator of occurrence dates from a first date.
+
+    Understands the common forms ("every day", "every 3 weeks", "every other month",
+    "every weekday", "every mon, fri", "daily"...), optionally with a time like "at 9am".
+    Returns None for anything else.
+    """
+    rule = _AT_TIME.sub("", rule.lower().strip())
+    rule = _SHORTHAND.get(rule, rule)
+
+    if re.match(r"^every!?\s+(weekday|workday)s?$", rule):
+        def weekdays(first: date) -> Iterator[date]:
+            day = first
+            while True:
+                if day.weekday() < 5:
+                    yield day
+                day += timedelta(days=1)
+        return weekdays
+
+    days_match = re.match(r"^every!?\s+(.+)$", rule)
+    if days_match:
+        names = [name.strip() for name in re.split(r",|\band\b", days_match.group(1)) if name.strip()]
+        if names and all(name in _WEEKDAYS for name in names):
+            wanted = {_WEEKDAYS[name] for name in names}
+
+            def on_weekdays(first: date) -> Iterator[date]:
+                day = first
+                while True:
+                    if day.weekday() in wanted:
+                        yield day
+                    day += timedelta(days=1)
+            return on_weekdays
+
+    interval = _INTERVAL.match(rule)
+    if not interval:
+        return None
+    count = 2 if interval.group(1) == "other" else int(interval.group(1) or 1)
+    unit = interval.group(2)
+
+    def every(first: date) -> Iterator[date]:
+        step = 0
+        while True:
+            if unit == "day":
+                yield first + timedelta(days=count * step)
+            elif unit == "week":
+                yield first + timedelta(weeks=count * step)
+            elif unit == "month":
+                yield _add_months(first, count * step, first.day)
+            else:
+                yield _add_months(first, 12 * count * step, first.day)
+            step += 1
+    return every
+
+
+def _due(task: Dict) -> Optional[Tuple[date, str]]:
+    due = task.get("due")
+    if not due or not due.get("date"):
+        return None
+    return date.fromisoformat(due["date"][:10]), due.get("datetime") or due["date"]
+
+
+class DueIndex:
+    """
+    Active tasks sorted by due date.
+
+    One-off tasks live in a sorted array searched with bisect, so a range query costs
+    O(log n + k). Recurring tasks are expanded lazily, only within the requested window, and
+    merged in date order with a heap.
+    """
+
+    def __init__(self, tasks: List[Dict]):
+        entries = []
+        self._recurring: List[Tuple[date, str, Callable, Dict]] = []
+        for task in tasks:
+            due = _due(task)
+            if due is None:
+                continue
+            rule = recurrence(task["due"].get("string", "")) if task["due"].get("is_recurring") else None
+            if rule:
+                self._recurring.append((due[0], due[1], rule, task))
+            else:
+                entries.append((due[0], due[1], task))
+
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+        self._dates = [entry[0] for entry in entries]
+        self._entries = entries
+
+    def _one_off(self, start: date, end: date) -> Iterator[Tuple[date, str, Dict]]:
+        low = bisect.bisect_left(self._dates, start)
+        high = bisect.bisect_right(self._dates, end)
+        return iter(self._entries[low:high])
+
+    def _expand(self, first: date, when: str, rule: Callable, task: Dict, start: date,
+                end: date) -> Iterator[Tuple[date, str, Dict]]:
+        time_part = when[10:]
+        for day in rule(first):
+            if day > end:
+                return
+            if day >= start:
+                yield day, day.isoformat() + time_part, task
+
+    def between(self, start: date, end: date) -> Iterator[Tuple[date, Dict]]:
+        """Yield (day, task) for every occurrence between start and end (inclusive), in order"""
+        streams = [self._one_off(start, end)]
+        streams.extend(self._expand(first, when, rule, task, start, end)
+                       for first, when, rule, task in self._recurring if first <= end)
+        for day, _, task in heapq.merge(*streams, key=lambda entry: (entry[0], entry[1])):
+            yield day, task
+
+    def overdue(self, before: date) -> Iterator[Dict]:
+        """Yield tasks whose (next) due date is before `before`, oldest first"""
+        overdue = [(entry[0], entry[1], entry[2]) for entry in self._one_off(date.min, before - timedelta(days=1))]
+        overdue.extend((first, when, task) for first, when, _, task in self._recurring if first < before)
+        overdue.sort(key=lambda entry: (entry[0], entry[1]))
+        for _, _, task in overdue:
+            yield task
@@ -0,0 +1,100 @@
+"""Small in-memory TTL cache used by TodoistClient for read-mostly data"""
+import asyncio
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from todoist_mcp_server.store import SharedStore
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Key/value cache whose entries expire after `ttl` seconds.
+
+    Concurrent loads of the same key are coalesced so a cold cache only costs one request.
+    With a `store`, JSON-serializable entries are also shared with other worker processes,
+    and invalidations reach every worker. Every hit on a shared entry then checks the store's
+    stamp for it, a blocking SQLite read (see SharedStore for its cost).
+    """
+
+    def __init__(self, ttl: float, store: Optional[SharedStore] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.store = store
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any, Optional[float]]] = {}
+        # asyncio locks belong to one event loop, so keep a separate set per loop. Each key maps
+        # to [lock, callers using it] and is dropped once the last caller is done with it.
+        self._locks = weakref.WeakKeyDictionary()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a fresh cached value or `default`"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] >= time.monotonic():
+            expires, value, stamp = entry
+            # Shared entries are only reused while no other worker has replaced or invalidated them
+            if stamp is None or self.store.stamp(key) == stamp:
+                return value
+
+        if self.store is not None:
+            shared = self.store.get(key)
+            if shared is not None:
+                stamp, value = shared
+                self._entries[key] = (time.monotonic() + (stamp - time.time()), value, stamp)
+                return value
+        return default
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the last value stored under `key` in this process, even if it has expired"""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        stamp = self.store.set(key, value, self.ttl) if self.store is not None else None
+        self._entries[key] = (time.monotonic() + self.ttl, value, stamp)
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones, until the cache fits in max_entries"""
+        now = time.monotonic()
+        for key in [key for key, entry in self._entries.items() if entry[0] < now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        if self.store is not None:
+            self.store.purge_expired()
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys, or everything when no keys are given"""
+        if self.store is not None:
+            self.store.delete(*keys)
+        # Entries are expired rather than dropped so peek() can still serve them as stale data
+        for key in keys or list(self._entries):
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (float("-inf"), entry[1], None)
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, calling `loader` at most once on a miss"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        entry = locks.get(key)
+        if entry is None:
+            entry = locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = await loader()
+                    self.set(key, value)
+                return value
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del locks[key]
@@ -0,0 +1,77 @@
+"""
+Deadline budgets for tool calls.
+
+Each tool runs under a deadline (TODOIST_TOOL_TIMEOUT, or TODOIST_TOOL_TIMEOUT_<TOOL NAME> for one
+tool). The deadline lives in a context variable, so every API request made on behalf of the tool
+(project resolution, listings, retries) sees the remaining budget and clamps its own timeouts
+to it. When the budget runs out, or the MCP client cancels the request, the in-flight HTTP
+request is cancelled rather than left to finish.
+"""
+import asyncio
+import functools
+import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("todoist_deadline", default=None)
+
+
+def tool_budget(tool_name: str) -> float:
+    """Seconds a tool may run for, from the environment"""
+    specific = os.getenv(f"TODOIST_TOOL_TIMEOUT_{tool_name.upper()}")
+    return float(specific or os.getenv("TODOIST_TOOL_TIMEOUT", "30"))
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when there is no deadline"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+@asynccontextmanager
+async def deadline(seconds: Optional[float]) -> AsyncIterator[None]:
+    """
+    Run the block with at most `seconds` of budget, raising TimeoutError when it runs out.
+
+    Nested deadlines can only shorten the enclosing one. `None` means no extra limit.
+    """
+    current = _deadline.get()
+    effective = current
+    if seconds is not None:
+        candidate = asyncio.get_running_loop().time() + seconds
+        effective = candidate if current is None else min(current, candidate)
+
+    token = _deadline.set(effective)
+    try:
+        async with asyncio.timeout_at(effective):
+            yield
+    finally:
+        _deadline.reset(token)
+
+
+def reserve(fraction: float = 0.1) -> Optional[float]:
+    """
+    Budget for a block that must leave `fraction` of the remaining time to its caller.
+
+    Tools use this around slow fetches so that, when the fetch overruns, there is still time
+    left to return partial or cached results.
+    """
+    left = remaining()
+    return None if left is None else left * (1 - fraction)
+
+
+def with_deadline(tool):
+    """Run a tool under its deadline budget and turn an overrun into an error result"""
+    @functools.wraps(tool)
+    async def bounded(*args, **kwargs):
+        budget = tool_budget(tool.__name__)
+        try:
+            async with deadline(budget):
+                return await tool(*args, **kwargs)
+        except TimeoutError:
+            return {"error": f"{tool.__name__} timed out after {budget:g}s", "timed_out": True}
+
+    return bounded
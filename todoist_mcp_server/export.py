@@ -0,0 +1,224 @@
+"""Streaming export of a whole Todoist account to NDJSON or CSV, resumable from a checkpoint"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from todoist_mcp_server.todoist_client import TodoistAPIError, TodoistClient
+
+FORMATS = ("ndjson", "csv")
+CSV_FIELDS = ["type", "id", "project_id", "section_id", "parent_id", "content", "description",
+              "priority", "labels", "due", "completed_at"]
+
+# The completed-tasks endpoint only accepts short time ranges, so history is fetched in windows
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_HISTORY_DAYS = 365
+
+Progress = Callable[[int, str], Awaitable[None]]
+
+
+def checkpoint_path(path: str) -> str:
+    return f"{path}.checkpoint"
+
+
+def resolve_export_path(path: str, directory: str) -> str:
+    """Resolve `path` relative to `directory`, refusing paths that end up outside it"""
+    directory = os.path.realpath(os.path.expanduser(directory))
+    target = os.path.realpath(os.path.join(directory, os.path.expanduser(path)))
+    if os.path.commonpath([directory, target]) != directory:
+        raise ValueError(f"Exports can only be written inside {directory}. Use a path relative to it")
+    return target
+
+
+def time_windows(since: str, until: str, days: int) -> Iterator[Tuple[str, str]]:
+    """Split [since, until] into consecutive (since, until) ISO ranges of at most `days` days"""
+    start, end = datetime.fromisoformat(since), datetime.fromisoformat(until)
+    while start < end:
+        stop = min(start + timedelta(days=days), end)
+        yield start.isoformat(), stop.isoformat()
+        start = stop
+
+
+def csv_row(record_type: str, item: Dict) -> Dict:
+    """Flatten a project or task into the fixed CSV columns"""
+    return {
+        "type": record_type,
+        "id": item.get("id"),
+        "project_id": item.get("project_id"),
+        "section_id": item.get("section_id"),
+        "parent_id": item.get("parent_id"),
+        "content": item.get("content", item.get("name")),
+        "description": item.get("description"),
+        "priority": item.get("priority"),
+        "labels": ";".join(item.get("labels") or []),
+        "due": (item.get("due") or {}).get("date"),
+        "completed_at": item.get("completed_at"),
+    }
+
+
+class AccountExport:
+    """
+    Streams projects, active tasks and completed tasks into one file, a page at a time.
+
+    After every page the file is flushed and a checkpoint (stage, time window, API cursor and
+    file offset) is written next to it. A later run with `resume` truncates the file back to the
+    checkpointed offset and carries on from there. The checkpoint is removed once the export
+    completes. An existing file without a matching checkpoint is only replaced when `resume` is
+    off, i.e. the caller asked to start over.
+    """
+
+    def __init__(self, client: TodoistClient, path: str, fmt: str = None, since: str = None,
+                 until: str = None, window_days: int = DEFAULT_WINDOW_DAYS, resume: bool = True):
+        self.client = client
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.checkpoint_path = checkpoint_path(self.path)
+
+        checkpoint = self._load_checkpoint() if resume else None
+        if checkpoint is not None:
+            requested = {"format": fmt, "since": since, "until": until}
+            conflicts = [key for key, value in requested.items() if value and value != checkpoint[key]]
+            if conflicts:
+                raise ValueError(f"An unfinished export to {self.path} used a different {', '.join(conflicts)}. "
+                                 "Start it over instead of resuming")
+            self.state = checkpoint
+            self.resumed = True
+            self.replace = False
+            return
+
+        if resume and os.path.exists(self.path):
+            raise ValueError(f"{self.path} already exists and is not an unfinished export. "
+                             "Restart to replace it, or choose another path")
+
+        fmt = fmt or ("csv" if self.path.endswith(".csv") else "ndjson")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'. Supported: {', '.join(FORMATS)}")
+        until = until or datetime.now().isoformat()
+        since = since or (datetime.fromisoformat(until) - timedelta(days=DEFAULT_HISTORY_DAYS)).isoformat()
+        self.state = {
+            "format": fmt, "since": since, "until": until, "window_days": window_days,
+            "stage": "projects", "window": 0, "cursor": None, "offset": 0,
+            "counts": {"project": 0, "task": 0, "completed_task": 0}
+        }
+        self.resumed = False
+        self.replace = not resume
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        """The unfinished export's state, unless its output file is gone or shorter than checkpointed"""
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as checkpoint_file:
+                checkpoint = json.load(checkpoint_file)
+            if os.path.getsize(self.path) < checkpoint["offset"]:
+                return None
+            return checkpoint
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_checkpoint(self) -> None:
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(self.state, checkpoint_file)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    @property
+    def total(self) -> int:
+        return sum(self.state["counts"].values())
+
+    def _encode(self, record_type: str, items: List[Dict]) -> bytes:
+        if self.state["format"] == "ndjson":
+            return "".join(json.dumps({"type": record_type, **item}) + "\n" for item in items).encode("utf-8")
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+        for item in items:
+            writer.writerow(csv_row(record_type, item))
+        return buffer.getvalue().encode("utf-8")
+
+    def _commit_page(self, out, record_type: str, items: List[Dict]) -> None:
+        """Append a page and checkpoint the position after it"""
+        out.write(self._encode(record_type, items))
+        out.flush()
+        os.fsync(out.fileno())
+        self.state["counts"][record_type] += len(items)
+        self.state["offset"] = out.tell()
+        self._save_checkpoint()
+
+    async def run(self, progress: Optional[Progress] = None) -> Dict:
+        """Export everything that is left, returning a summary"""
+        state = self.state
+        windows = list(time_windows(state["since"], state["until"], state["window_days"]))
+
+        async def report(message: str) -> None:
+            if progress is not None:
+                await progress(self.total, message)
+
+        # "xb" fails if a file appeared at the path since the export was set up
+        with open(self.path, "r+b" if self.resumed else "wb" if self.replace else "xb") as out:
+            if not self.resumed:
+                # Claim the new file right away, so a failure before the first page can be resumed
+                self._save_checkpoint()
+            # Drop anything written after the last checkpoint
+            out.truncate(state["offset"])
+            out.seek(state["offset"])
+            if state["format"] == "csv" and state["offset"] == 0:
+                out.write(",".join(CSV_FIELDS).encode("utf-8") + b"\r\n")
+
+            if state["stage"] == "projects":
+                projects = await self.client.get_projects()
+                if "error" in projects:
+                    raise TodoistAPIError(projects["error"])
+                state["stage"] = "tasks"
+                self._commit_page(out, "project", projects)
+                await report(f"Exported {len(projects)} projects")
+
+            if state["stage"] == "tasks":
+                async for tasks, cursor in self.client.task_pages(cursor=state["cursor"]):
+                    state["cursor"] = cursor
+                    if not cursor:
+                        state["stage"] = "completed"
+                    self._commit_page(out, "task", tasks)
+                    await report(f"Exported {state['counts']['task']} active tasks")
+
+            while state["stage"] == "completed" and state["window"] < len(windows):
+                since, until = windows[state["window"]]
+                async for tasks, cursor in self.client.completed_task_pages(since, until, cursor=state["cursor"]):
+                    state["cursor"] = cursor
+                    if not cursor:
+                        state["window"] += 1
+                    self._commit_page(out, "completed_task", tasks)
+                    await report(f"Exported {state['counts']['completed_task']} completed tasks "
+                                 f"(window {state['window']}/{len(windows)})")
+
+        os.remove(self.checkpoint_path)
+        return {"path": self.path, "format": state["format"], "counts": dict(state["counts"]),
+                "bytes": state["offset"], "resumed": self.resumed}
+
+
+async def _export(args) -> Dict:
+    async def progress(done: int, message: str) -> None:
+        print(message, flush=True)
+
+    async with TodoistClient() as client:
+        export = AccountExport(client, args.path, fmt=args.format, since=args.since, until=args.until,
+                               window_days=args.window_days, resume=not args.restart)
+        return await export.run(progress)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export all projects, active and completed tasks to a file")
+    parser.add_argument("path", help="Output file; a .csv suffix selects CSV")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default from the file suffix, else ndjson)")
+    parser.add_argument("--since", help="Start of completed history in ISO format (default one year ago)")
+    parser.add_argument("--until", help="End of completed history in ISO format (default now)")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS,
+                        help="Days of completed history fetched per window")
+    parser.add_argument("--restart", action="store_true", help="Start over, replacing an existing file or unfinished export")
+
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_export(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Forgiving name matching for projects, sections, labels and collaborators"""
+import difflib
+import heapq
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+# Only the best trigram candidates are re-scored with the (slower) sequence matcher
+_RERANK = 10
+
+# Score for a name whose words all appear in the query, and the cap for every such name when
+# the query contains several unrelated ones ("Personal Work" with Personal and Work)
+_CONTAINED = 0.8
+_AMBIGUOUS = 0.6
+
+
+def normalize(name: str) -> str:
+    """Lowercase and collapse punctuation/whitespace so "Work-Stuff " == "work stuff\""""
+    return _NON_ALNUM.sub(" ", name.lower()).strip()
+
+
+def trigrams(normalized: str) -> Set[str]:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Precomputed trigram index over item names.
+
+    Lookups only score items that share at least one trigram with the query, so ranking stays
+    fast even for thousands of names. Scores are in [0, 1], with 1 meaning an exact match.
+    """
+
+    def __init__(self, items: Iterable[Dict], key: Callable[[Dict], str] = lambda item: item["name"]):
+        self.items: List[Dict] = list(items)
+        self._names: List[str] = []
+        self._tokens: List[Set[str]] = []
+        self._grams: List[Set[str]] = []
+        self._exact: Dict[str, int] = {}
+        self._normalized: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._token_postings: Dict[str, List[int]] = defaultdict(list)
+
+        for position, item in enumerate(self.items):
+            name = normalize(key(item))
+            grams = trigrams(name)
+            self._names.append(name)
+            self._tokens.append(set(name.split()))
+            self._grams.append(grams)
+            self._exact.setdefault(key(item).lower(), position)
+            self._normalized.setdefault(name, position)
+            for gram in grams:
+                self._postings[gram].append(position)
+            for token in self._tokens[-1]:
+                self._token_postings[token].append(position)
+
+    def _contained(self, query_tokens: Set[str]) -> Set[int]:
+        """Positions of names whose words all appear in the query, e.g. "Work" for "work stuff"
+
+        A name inside a longer contained name ("Project" in "Side Project") yields to it.
+        """
+        contained = {position for token in query_tokens for position in self._token_postings.get(token, ())
+                     if self._tokens[position] <= query_tokens}
+        return {position for position in contained
+                if not any(self._tokens[position] < self._tokens[other] for other in contained)}
+
+    def _score(self, query: str, position: int, dice: float, containment: float) -> float:
+        ratio = difflib.SequenceMatcher(None, query, self._names[position]).ratio()
+        return max(dice, containment, ratio)
+
+    def _rank(self, query: str, limit: int) -> List[Tuple[int, float]]:
+        """Rank item positions by similarity to `query`, best first"""
+        normalized = normalize(query)
+        exact = self._exact.get(query.lower())
+        if exact is None:
+            exact = self._normalized.get(normalized)
+
+        query_grams = trigrams(normalized)
+        query_tokens = set(normalized.split())
+
+        # Trigrams shared by a large share of names ("pro" in "Project ...") say little about
+        # the match, so candidates come from the selective ones when there are any
+        common = max(64, len(self.items) // 20)
+        postings = [self._postings[gram] for gram in query_grams if gram in self._postings]
+        selective = [posting for posting in postings if len(posting) <= common] or postings
+        candidates = set().union(*selective)
+
+        contained = self._contained(query_tokens)
+        dice = {position: 2 * len(query_grams & self._grams[position]) /
+                (len(query_grams) + len(self._grams[position]))
+                for position in candidates | contained}
+        candidates = set(heapq.nlargest(max(_RERANK, limit), dice, key=dice.__getitem__)) | contained
+
+        scored = {position: self._score(normalized, position, dice[position],
+                                        _CONTAINED if position in contained else 0.0)
+                  for position in candidates}
+        if len({frozenset(self._tokens[position]) for position in contained}) > 1:
+            # The query names several items, so it can't be a confident match for any one of them
+            for position in contained:
+                if self._names[position] != normalized:
+                    scored[position] = min(scored[position], _AMBIGUOUS)
+        if exact is not None:
+            scored[exact] = 1.0
+
+        ranked = sorted(scored.items(), key=lambda entry: (-entry[1], entry[0] != exact))
+        return [(position, round(score, 3)) for position, score in ranked[:limit]]
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[Dict, float]]:
+        """Rank items by similarity to `query`, best first"""
+        return [(self.items[position], score) for position, score in self._rank(query, limit)]
+
+    def resolve(self, query: str, threshold: float = 0.75,
+                margin: float = 0.05) -> Tuple[Optional[Tuple[Dict, float]], List[Dict]]:
+        """
+        The item `query` unambiguously refers to.
+
+        The best match must clear `threshold` and beat the runner-up by `margin`; an exact match
+        only needs to be the only one. A truncated name that begins both ("chris p" for "Chris
+        Park" and "Chris Parker") is ambiguous too. Returns ((item, score), []) for a match,
+        (None, [best, runner-up]) when both fit about equally well, and (None, []) when nothing
+        matches.
+        """
+        normalized = normalize(query)
+        ranked = self._rank(query, limit=2)
+        if not ranked or ranked[0][1] < threshold:
+            return None, []
+        if len(ranked) > 1:
+            names = [self._names[position] for position, _ in ranked]
+            if names[0] == normalized:
+                ambiguous = names[1] == normalized
+            else:
+                ambiguous = (ranked[0][1] - ranked[1][1] < margin or
+                             all(name.startswith(normalized) for name in names))
+            if ambiguous:
+                return None, [self.items[position] for position, _ in ranked]
+        position, score = ranked[0]
+        return (self.items[position], score), []
+
+    def best(self, query: str, threshold: float = 0.75) -> Optional[Tuple[Dict, float]]:
+        """Return the best match and its score, or None when nothing clears `threshold`"""
+        ranked = self.search(query, limit=1)
+        if ranked and ranked[0][1] >= threshold:
+            return ranked[0]
+        return None
+
+
+def fuzzy_find(query: str, items: Iterable[Dict], key: Callable[[Dict], str] = lambda item: item["name"],
+               cutoff: float = 0.75) -> Optional[Dict]:
+    """Return the item whose name best matches `query`, or None below `cutoff`"""
+    match = NameIndex(items, key).best(query, cutoff)
+    return match[0] if match else None
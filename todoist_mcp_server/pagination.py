@@ -0,0 +1,40 @@
+"""Byte-budgeted pages over server-side result snapshots, addressed by opaque cursors"""
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+
+
+def encode_cursor(kind: str, snapshot_id: str, offset: int) -> str:
+    """Cursor into a snapshot of `kind` results (e.g. "active_tasks"); `kind` must not contain ':'"""
+    return base64.urlsafe_b64encode(f"{kind}:{snapshot_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, int]:
+    """Split a cursor into (kind, snapshot_id, offset); raises ValueError if it is malformed"""
+    try:
+        decoded = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        kind, rest = decoded.split(":", 1)
+        snapshot_id, offset = rest.rsplit(":", 1)
+        return kind, snapshot_id, int(offset)
+    except (UnicodeDecodeError, ValueError, base64.binascii.Error):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def paginate(items: List[Any], offset: int, max_bytes: int) -> Tuple[List[Any], Optional[int]]:
+    """
+    Take whole items from `offset` until their JSON size would exceed `max_bytes`.
+
+    At least one item is always returned so every page makes progress. Returns the page and
+    the offset of the next page, or None when the end was reached.
+    """
+    page = []
+    used = 0
+    position = offset
+    while position < len(items):
+        size = len(json.dumps(items[position], separators=(",", ":")))
+        if page and used + size > max_bytes:
+            break
+        page.append(items[position])
+        used += size
+        position += 1
+    return page, (position if position < len(items) else None)
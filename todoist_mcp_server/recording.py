@@ -0,0 +1,221 @@
+"""
+Record/replay of Todoist API traffic for offline performance testing.
+
+Set TODOIST_RECORD_PATH to capture every request/response pair made by TodoistClient into an
+NDJSON cassette (auth headers are never written and the API token is scrubbed from bodies).
+Set TODOIST_REPLAY_PATH to serve a cassette instead of talking to api.todoist.com, with the
+recorded latencies scaled by TODOIST_REPLAY_LATENCY_SCALE.
+
+Recorded tool-call sequences can then be replayed concurrently against the cassette:
+
+    python -m todoist_mcp_server.recording --cassette traffic.ndjson --calls calls.json --concurrency 20
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, List, Sequence
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+
+REDACTED = "REDACTED"
+
+
+def _canonical_query(query: bytes) -> str:
+    return urlencode(sorted(parse_qsl(query.decode())))
+
+
+def _request_body(request: httpx.Request):
+    if not request.content:
+        return None
+    try:
+        return json.loads(request.content)
+    except ValueError:
+        return request.content.decode(errors="replace")
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that appends every exchange, with its latency, to a cassette file"""
+
+    def __init__(self, wrapped: httpx.AsyncBaseTransport, path: str, secrets: Sequence[str] = ()):
+        self._wrapped = wrapped
+        self._path = path
+        self._secrets = [secret for secret in secrets if secret]
+        self._started = time.monotonic()
+
+    def _redact(self, text: str) -> str:
+        for secret in self._secrets:
+            text = text.replace(secret, REDACTED)
+        return text
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self._wrapped.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.monotonic() - started
+
+        interaction = {
+            "t": round(started - self._started, 4),
+            "method": request.method,
+            "path": request.url.path,
+            "query": _canonical_query(request.url.query),
+            "body": _request_body(request),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "response": content.decode(errors="replace"),
+            "elapsed": round(elapsed, 4),
+        }
+        line = self._redact(json.dumps(interaction, separators=(",", ":")))
+        with open(self._path, "a", encoding="utf-8") as cassette:
+            cassette.write(line + "\n")
+
+        # The body has already been decoded, so drop headers describing the wire encoding
+        headers = [(k, v) for k, v in response.headers.items()
+                   if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self) -> None:
+        await self._wrapped.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transport that serves responses from a cassette.
+
+    Requests are matched on method, path, query and body, falling back to method and path.
+    Repeated requests cycle through the recorded responses so a cassette can drive long runs.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        self.latency_scale = latency_scale
+        self._exact: Dict[tuple, deque] = {}
+        self._by_path: Dict[tuple, deque] = {}
+
+        with open(path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if not line.strip():
+                    continue
+                interaction = json.loads(line)
+                exact_key = (interaction["method"], interaction["path"], interaction["query"],
+                             json.dumps(interaction.get("body"), sort_keys=True))
+                self._exact.setdefault(exact_key, deque()).append(interaction)
+                self._by_path.setdefault((interaction["method"], interaction["path"]), deque()).append(interaction)
+
+    def _next(self, request: httpx.Request):
+        exact_key = (request.method, request.url.path, _canonical_query(request.url.query),
+                     json.dumps(_request_body(request), sort_keys=True))
+        candidates = self._exact.get(exact_key) or self._by_path.get((request.method, request.url.path))
+        if not candidates:
+            return None
+        interaction = candidates.popleft()
+        candidates.append(interaction)
+        return interaction
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self._next(request)
+        if interaction is None:
+            return httpx.Response(404, json={"error": f"No recorded interaction for {request.method} {request.url.path}"},
+                                  request=request)
+
+        if self.latency_scale > 0:
+            await asyncio.sleep(interaction["elapsed"] * self.latency_scale)
+
+        headers = {"content-type": interaction["content_type"]} if interaction["content_type"] else {}
+        return httpx.Response(interaction["status"], headers=headers,
+                              content=interaction["response"].encode(), request=request)
+
+
+def transport_from_env(api_token: str):
+    """Build the record or replay transport configured through the environment, if any"""
+    replay_path = os.getenv("TODOIST_REPLAY_PATH")
+    if replay_path:
+        return ReplayTransport(replay_path, float(os.getenv("TODOIST_REPLAY_LATENCY_SCALE", "1")))
+
+    record_path = os.getenv("TODOIST_RECORD_PATH")
+    if record_path:
+        return RecordingTransport(httpx.AsyncHTTPTransport(), record_path, secrets=[api_token])
+
+    return None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def run_load(sequences: List[List[Dict]], concurrency: int = 10, iterations: int = 1) -> Dict:
+    """
+    Replay tool-call sequences concurrently and report latency statistics.
+
+    Each sequence is one agent's plan: a list of {"tool": name, "arguments": {...}} calls that
+    are run in order, while up to `concurrency` sequences run at the same time.
+    """
+    from todoist_mcp_server import todoist
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def agent(sequence: List[Dict]):
+        nonlocal errors
+        async with semaphore:
+            for call in sequence:
+                started = time.perf_counter()
+                try:
+                    result = await getattr(todoist, call["tool"])(**call.get("arguments", {}))
+                    if isinstance(result, dict) and "error" in result:
+                        errors += 1
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(agent(sequence) for _ in range(iterations) for sequence in sequences))
+    wall_time = time.perf_counter() - started
+
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "wall_time": round(wall_time, 4),
+        "throughput": round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        "latency": {
+            "p50": round(percentile(latencies, 50), 4),
+            "p95": round(percentile(latencies, 95), 4),
+            "p99": round(percentile(latencies, 99), 4),
+            "max": round(max(latencies, default=0.0), 4),
+        },
+        "tuning": todoist.get_client().tuning_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded tool-call sequences against a cassette")
+    parser.add_argument("--cassette", required=True, help="NDJSON cassette recorded with TODOIST_RECORD_PATH")
+    parser.add_argument("--calls", required=True, help="JSON file with a list of tool-call sequences")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sequences to run at the same time")
+    parser.add_argument("--iterations", type=int, default=1, help="How many times to replay every sequence")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiplier for recorded latencies")
+
+    args = parser.parse_args()
+
+    os.environ["TODOIST_REPLAY_PATH"] = args.cassette
+    os.environ["TODOIST_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ.setdefault("TODOIST_API_TOKEN", REDACTED)
+
+    with open(args.calls, encoding="utf-8") as calls_file:
+        sequences = json.load(calls_file)
+
+    summary = asyncio.run(run_load(sequences, concurrency=args.concurrency, iterations=args.iterations))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
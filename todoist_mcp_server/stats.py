@@ -0,0 +1,66 @@
+"""Aggregations over streams of tasks, so tools can return counts instead of task lists"""
+from collections import Counter
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+ACTIVE_DIMENSIONS = ("project", "priority", "label", "due")
+COMPLETED_DIMENSIONS = ("project", "label", "completed_day")
+
+
+def due_bucket(task: Dict, today: date) -> str:
+    """Place a task into a coarse due-date bucket relative to today"""
+    due = task.get("due")
+    if not due or not due.get("date"):
+        return "no_date"
+
+    due_date = date.fromisoformat(due["date"][:10])
+    if due_date < today:
+        return "overdue"
+    if due_date == today:
+        return "today"
+    if due_date == today + timedelta(days=1):
+        return "tomorrow"
+    if due_date <= today + timedelta(days=7):
+        return "next_7_days"
+    return "later"
+
+
+class TaskStats:
+    """Incrementally computes group-by counts over tasks as they are streamed in"""
+
+    def __init__(self, group_by: List[str], project_names: Optional[Dict[str, str]] = None,
+                 today: Optional[date] = None):
+        self.group_by = group_by
+        self.project_names = project_names or {}
+        self.today = today or date.today()
+        self.total = 0
+        self.counters = {dimension: Counter() for dimension in group_by}
+
+    def _keys(self, task: Dict, dimension: str) -> List[str]:
+        if dimension == "project":
+            project_id = task.get("project_id")
+            return [self.project_names.get(project_id, project_id or "unknown")]
+        if dimension == "priority":
+            return [str(task.get("priority", 1))]
+        if dimension == "label":
+            return task.get("labels") or ["no_label"]
+        if dimension == "due":
+            return [due_bucket(task, self.today)]
+        if dimension == "completed_day":
+            completed_at = task.get("completed_at")
+            return [completed_at[:10] if completed_at else "unknown"]
+        raise ValueError(f"Unknown group_by dimension: {dimension}")
+
+    def add(self, task: Dict) -> None:
+        """Count a single task in every requested dimension"""
+        self.total += 1
+        for dimension in self.group_by:
+            self.counters[dimension].update(self._keys(task, dimension))
+
+    def result(self) -> Dict:
+        """Return the aggregates, most common groups first"""
+        return {
+            "total": self.total,
+            "groups": {f"by_{dimension}": dict(counter.most_common())
+                       for dimension, counter in self.counters.items()}
+        }
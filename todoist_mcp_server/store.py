@@ -0,0 +1,103 @@
+"""SQLite-backed cache shared by every worker process on a host"""
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Hashable, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+def _encode_key(key: Hashable) -> str:
+    return json.dumps(key)
+
+
+class SharedStore:
+    """
+    Cross-process key/value store with per-entry expiry.
+
+    Entries live in a SQLite database in WAL mode, so worker processes can read concurrently
+    while one writes. Entries are namespaced (by API token hash) so tenants never share data.
+    Values must be JSON-serializable.
+
+    The cache holds account data, so the directory is created private to the current user and
+    the database is only readable by its owner. A directory owned by another user is refused.
+
+    Access is synchronous and runs on the caller's thread, i.e. on the event loop. Reads are a
+    primary-key lookup in a local file and WAL readers never wait for writers, so they take
+    microseconds. Writes can wait up to the 5s busy timeout while another worker is writing,
+    which only happens on cache misses and invalidations.
+    """
+
+    def __init__(self, directory: str, namespace: str):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+            raise PermissionError(f"Cache directory {directory} belongs to another user")
+        self.path = os.path.join(directory, "todoist-cache.sqlite3")
+        self.namespace = namespace
+        self._connection = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared across fork(), so reconnect in each process
+        if self._connection is None or self._pid != os.getpid():
+            # Create the file owner-only before SQLite does; its journal files inherit the mode
+            os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+            self._connection = sqlite3.connect(self.path, timeout=5, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(_SCHEMA)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """Return (stamp, value) for a live entry, or None"""
+        row = self._connect().execute(
+            "SELECT expires, value FROM cache WHERE namespace = ? AND key = ? AND expires > ?",
+            (self.namespace, _encode_key(key), time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def stamp(self, key: Hashable) -> Optional[float]:
+        """Return the expiry of a live entry without decoding it; it changes on every write"""
+        row = self._connect().execute(
+            "SELECT expires FROM cache WHERE namespace = ? AND key = ? AND expires > ?",
+            (self.namespace, _encode_key(key), time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> Optional[float]:
+        """Store a value and return its stamp, or None (storing nothing) if it isn't JSON-serializable"""
+        try:
+            encoded = json.dumps(value, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        expires = time.time() + ttl
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, expires, value) VALUES (?, ?, ?, ?)",
+            (self.namespace, _encode_key(key), expires, encoded)
+        )
+        return expires
+
+    def delete(self, *keys: Hashable) -> None:
+        """Delete the given keys, or the whole namespace when no keys are given"""
+        connection = self._connect()
+        if not keys:
+            connection.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            return
+        connection.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?",
+                               [(self.namespace, _encode_key(key)) for key in keys])
+
+    def purge_expired(self) -> None:
+        self._connect().execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
@@ -1,9 +1,56 @@
-from typing import List
-from mcp.server.fastmcp import FastMCP
-from todoist_mcp_server.todoist_client import TodoistClient
-from datetime import datetime, timedelta
+from typing import List, AsyncIterator, Optional
+import argparse
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.server.transport_security import TransportSecuritySettings
+from todoist_mcp_server.todoist_client import TodoistClient, TodoistAPIError
+from todoist_mcp_server.export import AccountExport, resolve_export_path
+from todoist_mcp_server.stats import TaskStats, ACTIVE_DIMENSIONS, COMPLETED_DIMENSIONS
+from todoist_mcp_server.pagination import encode_cursor, decode_cursor, paginate
+from todoist_mcp_server.deadline import deadline, reserve, with_deadline
+from datetime import date, datetime, timedelta
 
-mcp = FastMCP("todoist")
+_client_scopes = 0
+
+
+@asynccontextmanager
+async def client_scope() -> AsyncIterator[None]:
+    """Keep the shared TodoistClient open while any scope is active and drain it when the last exits"""
+    global _client_scopes
+    _client_scopes += 1
+    try:
+        yield
+    finally:
+        _client_scopes -= 1
+        if _client_scopes == 0:
+            await TodoistClient.shutdown()
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """
+    Own the shared TodoistClient for the lifetime of a session.
+
+    Over stdio there is exactly one session. Over HTTP every session runs this lifespan, so
+    http_app() holds an extra scope for the lifetime of the app to keep pools warm between sessions.
+    """
+    async with client_scope():
+        yield {}
+
+
+mcp = FastMCP("todoist", lifespan=lifespan)
+
+# Default size budget for list responses, roughly 5k tokens
+DEFAULT_MAX_BYTES = int(os.getenv("TODOIST_RESPONSE_MAX_BYTES", "20000"))
+
+# Comment text included per task when listing tasks with comments
+COMMENT_MAX_CHARS = int(os.getenv("TODOIST_COMMENT_MAX_CHARS", "2000"))
+
+# export_account only writes below this directory
+EXPORT_DIR = os.getenv("TODOIST_EXPORT_DIR", os.path.join("~", "todoist-exports"))
 
 
 def get_client() -> TodoistClient:
@@ -11,10 +58,69 @@ def get_client() -> TodoistClient:
     return TodoistClient()
 
 
+def page_results(client: TodoistClient, kind: str, items: list, max_bytes: int, snapshot_id: str = None,
+                 offset: int = 0) -> tuple:
+    """Cut a page out of `kind` `items`, snapshotting them server-side if another page is needed"""
+    page, next_offset = paginate(items, offset, max_bytes)
+    if next_offset is None:
+        return page, None
+    if snapshot_id is None:
+        snapshot_id = client.save_snapshot(items, kind)
+    return page, encode_cursor(kind, snapshot_id, next_offset)
+
+
+def comment_entry(comment: dict, max_chars: int) -> dict:
+    """Compact view of a comment, with its content cut to `max_chars`"""
+    content = comment.get("content") or ""
+    entry = {"id": comment["id"], "content": content if len(content) <= max_chars else content[:max_chars] + "…",
+             "posted_at": comment.get("posted_at")}
+    attachment = comment.get("file_attachment")
+    if attachment:
+        entry["attachment"] = {key: attachment[key] for key in ("file_name", "file_type", "file_url")
+                               if attachment.get(key)}
+    return entry
+
+
+def with_comments(task: dict, comments, max_chars: int = COMMENT_MAX_CHARS) -> dict:
+    """Copy of `task` with its most recent comments, keeping their total text within `max_chars`"""
+    if "error" in comments:
+        return {**task, "comments_error": comments["error"]}
+
+    kept, budget = [], max_chars
+    for comment in reversed(comments):
+        if budget <= 0:
+            break
+        entry = comment_entry(comment, budget)
+        budget -= len(entry["content"])
+        kept.append(entry)
+
+    enriched = {**task, "comments": kept[::-1]}
+    if len(kept) < len(comments):
+        enriched["comments_omitted"] = len(comments) - len(kept)
+    return enriched
+
+
+def load_cursor(client: TodoistClient, cursor: str, kind: str) -> tuple:
+    """Resolve a continuation cursor for `kind` results to (items, snapshot_id, offset), or an error dict"""
+    try:
+        cursor_kind, snapshot_id, offset = decode_cursor(cursor)
+    except ValueError as e:
+        return {"error": str(e)}
+    if cursor_kind != kind:
+        return {"error": f"This cursor continues a list of {cursor_kind.replace('_', ' ')}, not "
+                         f"{kind.replace('_', ' ')}. Pass it to the tool that returned it."}
+    items = client.load_snapshot(snapshot_id, kind)
+    if items is None:
+        return {"error": "Cursor expired. Please repeat the query without a cursor."}
+    return items, snapshot_id, offset
+
+
 @mcp.tool()
+@with_deadline
 async def create_task(content: str, description: str = "", project_name: str = None, 
                       due_string: str = None, priority: int = 1, 
-                     labels: List[str] = None) -> dict:
+                     labels: List[str] = None, section_name: str = None, assignee: str = None,
+                     allow_new_labels: bool = False) -> dict:
     """
     Create a new task in Todoist.
 
@@ -32,7 +138,11 @@ async def create_task(content: str, description: str = "", project_name: str = N
         project_name: Project name to add task to
         due_string: Due date in natural language like "tomorrow", "next monday" (optional)
         priority: Priority level 1-4 (1=low, 2=medium, 3=high, 4=urgent)
-        labels: List of label names to add to the task (optional)
+        labels: List of label names to add to the task. Names are matched against existing
+            labels ignoring case and punctuation; near misses are reported, not replaced (optional)
+        section_name: Section of the project to add the task to; requires project_name (optional)
+        assignee: Name or email of a collaborator on a shared project to assign the task to (optional)
+        allow_new_labels: Create labels that don't exist yet instead of returning an error (default False)
     
     Returns:
         Dict containing the created task details or error message
@@ -40,14 +150,44 @@ async def create_task(content: str, description: str = "", project_name: str = N
     try:
         client = get_client()
         project_id = None
+        project = None
         
         if project_name:
-            project_id = await client.find_project_by_name(project_name)
-            if not project_id:
-                inbox_id = await client.find_project_by_name("Inbox")
-                if not inbox_id:
+            project = await client.resolve_project(project_name)
+            if not project:
+                project = await client.resolve_project("Inbox")
+                if not project:
                     return {"error": "Something went wrong."}
-                project_id = inbox_id
+            project_id = project["id"]
+
+        if section_name and not project_id:
+            return {"error": "A section requires its project. Please provide project_name."}
+        if assignee and not project_id:
+            return {"error": "An assignee requires a shared project. Please provide project_name."}
+
+        async def no_lookup():
+            return None
+
+        # Lookups are independent and served from cache once warm, so run them together
+        label_result, section, collaborator = await asyncio.gather(
+            client.resolve_labels(labels) if labels else no_lookup(),
+            client.resolve_section(section_name, project_id) if section_name else no_lookup(),
+            client.resolve_collaborator(assignee, project_id) if assignee else no_lookup()
+        )
+
+        if label_result:
+            labels, unknown_labels = label_result
+            if unknown_labels and not allow_new_labels:
+                unknown = [f"{name} (did you mean '{suggestion}'?)" if suggestion else name
+                           for name, suggestion in unknown_labels.items()]
+                return {"error": f"Unknown labels: {', '.join(unknown)}. "
+                                 f"Use existing labels or set allow_new_labels=True to create them."}
+        if section and "error" in section:
+            return section
+        if collaborator and "error" in collaborator:
+            return collaborator
+        section_id = section["id"] if section else None
+        assignee_id = collaborator["id"] if collaborator else None
         
         result = await client.create_task(
             content=content,
@@ -55,82 +195,191 @@ async def create_task(content: str, description: str = "", project_name: str = N
             project_id=project_id,
             due_string=due_string,
             priority=priority,
-            labels=labels
+            labels=labels,
+            section_id=section_id,
+            assignee_id=assignee_id
         )
         
         if "error" in result:
             return result
             
-        return {
+        response = {
             "success": True,
             "task": result,
             "url": result.get("url", ""),
             "message": f"Task '{content}' created successfully"
         }
+        if project:
+            # Name matching is forgiving, so show which project was picked and how confidently
+            response["project"] = project
+            response["message"] += f" in project '{project['name']}'"
+        return response
         
     except Exception as e:
         return {"error": f"Failed to create task: {str(e)}"}
 
 
 @mcp.tool()
+@with_deadline
+async def find_project(name: str) -> dict:
+    """
+    Find the project that best matches a name, with a confidence score.
+
+    Use this when unsure of a project's exact name. The other tools match project names the
+    same way, but silently fall back to the Inbox when the confidence is too low.
+
+    Args:
+        name: Approximate project name, like "work stuff"
+
+    Returns:
+        Dict containing the best match, its confidence (0-1) and other candidates, or error message
+    """
+    try:
+        client = get_client()
+        match = await client.match_project(name)
+
+        if not match:
+            return {"error": f"No project resembles '{name}'"}
+
+        result = {
+            "success": True,
+            "project": {"id": match["id"], "name": match["name"], "confidence": match["confidence"]},
+            "candidates": match["candidates"][1:],
+            "message": f"Best match for '{name}' is '{match['name']}' (confidence {match['confidence']})"
+        }
+        if client.circuit_open("projects"):
+            result["stale"] = True
+            result["message"] += " among cached projects that may be out of date"
+        return result
+
+    except Exception as e:
+        return {"error": f"Failed to find project: {str(e)}"}
+
+
+@mcp.tool()
+@with_deadline
 async def list_active_tasks(project_id: str = None, project_name: str = None, 
-                    filter_string: str = None, limit: int = 50) -> dict:
+                    filter_string: str = None, limit: int = 50, cursor: str = None,
+                    max_bytes: int = DEFAULT_MAX_BYTES, include_comments: bool = False) -> dict:
     """
     List tasks from Todoist
+
+    Large results are split into pages. When `next_cursor` is set in the response, pass it back
+    as `cursor` to get the next page; the other arguments are ignored then.
     
     Args:
         project_name: Filter tasks by project name (alternative to project_id)
         filter_string: Todoist filter string like "today", "overdue", "p1" (optional)
         limit: Maximum number of tasks to return (default 50)
+        cursor: Continuation cursor from a previous response (optional)
+        max_bytes: Approximate size budget for this response (default 20000)
+        include_comments: Attach each task's most recent comments and attachments (default False)
     
     Returns:
         Dict containing list of tasks or error message
     """
     try:
         client = get_client()
-        
-        # If project_name is provided, convert to project_id
-        if project_name and not project_id:
-            project_id = await client.find_project_by_name(project_name)
-            if not project_id:
-                inbox_id = await client.find_project_by_name("Inbox")
-                if not inbox_id:
-                    return {"error": "Something went wrong. Please create the project first."}
-                project_id = inbox_id
-                limit = 5 # default to 5 if no project_id is provided, i.e. pulling from inbox
-        
-        result = await client.get_tasks(
-            project_id=project_id,
-            filter_string=filter_string,
-            limit=limit
-        )
-        
-        if "error" in result:
-            return result
+        snapshot_id, offset = None, 0
+        stale = None
+        comments_skipped = False
+
+        if cursor:
+            loaded = load_cursor(client, cursor, "active_tasks")
+            if isinstance(loaded, dict):
+                return loaded
+            result, snapshot_id, offset = loaded
+        else:
+            # If project_name is provided, convert to project_id
+            if project_name and not project_id:
+                project_id = await client.find_project_by_name(project_name)
+                if not project_id:
+                    inbox_id = await client.find_project_by_name("Inbox")
+                    if not inbox_id:
+                        return {"error": "Something went wrong. Please create the project first."}
+                    project_id = inbox_id
+                    limit = 5 # default to 5 if no project_id is provided, i.e. pulling from inbox
             
-        return {
+            try:
+                async with deadline(reserve()):
+                    result = await client.get_tasks(
+                        project_id=project_id,
+                        filter_string=filter_string,
+                        limit=limit
+                    )
+                if "error" in result and result.get("circuit_open"):
+                    stale = "Todoist is unavailable"
+            except TimeoutError:
+                result = {"error": "Timed out listing tasks", "timed_out": True}
+                stale = "Todoist did not answer in time"
+
+            if stale:
+                # Fall back to the last task list we saw, if the query allows it. Filters are
+                # evaluated by Todoist, so filtered queries can't be answered from the cache.
+                cached = None if filter_string else client.cached_tasks()
+                if cached is None:
+                    if result.get("timed_out"):
+                        result["error"] += (". Filtered queries can't be answered from cached tasks; "
+                                            "try again or leave out filter_string" if filter_string
+                                            else " and no cached tasks are available")
+                    return result
+                result = [task for task in cached if not project_id or task.get("project_id") == project_id][:limit]
+            
+            if "error" in result:
+                return result
+
+            if include_comments:
+                # One concurrent batch of comment fetches instead of a call per task
+                try:
+                    async with deadline(reserve()):
+                        comments = await client.get_comments_for_tasks(result)
+                    result = [with_comments(task, comments[task["id"]]) if task["id"] in comments
+                              else {**task, "comments": []} for task in result]
+                except TimeoutError:
+                    comments_skipped = True
+
+        tasks, next_cursor = page_results(client, "active_tasks", result, max_bytes, snapshot_id, offset)
+            
+        response = {
             "success": True,
-            "tasks": result,
-            "count": len(result),
-            "message": f"Found {len(result)} tasks"
+            "tasks": tasks,
+            "count": len(tasks),
+            "total": len(result),
+            "next_cursor": next_cursor,
+            "message": f"Found {len(result)} tasks" +
+                       (f", returning {offset + 1}-{offset + len(tasks)}. Pass next_cursor to continue"
+                        if next_cursor or offset else "")
         }
+        if stale:
+            response["stale"] = True
+            response["message"] += f" ({stale}; these are cached and may be out of date)"
+        if comments_skipped:
+            response["message"] += ". Comments were left out because Todoist did not answer in time"
+        return response
         
     except Exception as e:
         return {"error": f"Failed to list tasks: {str(e)}"}
 
 
 @mcp.tool()
+@with_deadline
 async def list_completed_tasks(project_name: str = None, since: str = None, 
-                             until: str = None, limit: int = 30) -> dict:
+                             until: str = None, limit: int = 30, cursor: str = None,
+                             max_bytes: int = DEFAULT_MAX_BYTES) -> dict:
     """
     List completed tasks from Todoist within a timespan. Default is last 24 hours.
     Prefer not to provide `since` and `until` if you want to pull tasks from the last 24 hours.
 
+    Large results are split into pages. When `next_cursor` is set in the response, pass it back
+    as `cursor` to get the next page; the other arguments are ignored then.
+
     Args:
         project_name: Filter tasks by project name (optional)
         since: Start date in ISO format (YYYY-MM-DD) in the user's timezone (optional)
         until: End date in ISO format (YYYY-MM-DD) in the user's timezone (optional)
-        limit: Maximum number of tasks to return (default 30, max 200)
+        limit: Maximum number of tasks to return (default 30)
+        cursor: Continuation cursor from a previous response (optional)
+        max_bytes: Approximate size budget for this response (default 20000)
     
     Returns:
         Dict containing list of completed tasks or error message
@@ -138,49 +387,420 @@ async def list_completed_tasks(project_name: str = None, since: str = None,
     try:
         client = get_client()
         project_id = None
-        
-        # If project_name is provided, convert to project_id
-        if project_name:
-            project_id = await client.find_project_by_name(project_name)
-            if not project_id:
-                inbox_id = await client.find_project_by_name("Inbox")
-                if not inbox_id:
-                    return {"error": "Something went wrong. Please create the project first."}
-                project_id = inbox_id
-        
-        # If since and until are not provided, set them to the last 24 hours
-        if not since:
-            since = (datetime.now() - timedelta(days=1)).isoformat()
-        if not until:
-            until = datetime.now().isoformat() 
-        
-        result = await client.get_completed_tasks(
-            project_id=project_id,
-            since=since,
-            until=until,
-            limit=limit
-        )
-        
-        if "error" in result:
-            return result
+        snapshot_id, offset = None, 0
+
+        if cursor:
+            loaded = load_cursor(client, cursor, "completed_tasks")
+            if isinstance(loaded, dict):
+                return loaded
+            all_tasks, snapshot_id, offset = loaded
+        else:
+            # If project_name is provided, convert to project_id
+            if project_name:
+                project_id = await client.find_project_by_name(project_name)
+                if not project_id:
+                    inbox_id = await client.find_project_by_name("Inbox")
+                    if not inbox_id:
+                        return {"error": "Something went wrong. Please create the project first."}
+                    project_id = inbox_id
+            
+            # If since and until are not provided, set them to the last 24 hours
+            if not since:
+                since = (datetime.now() - timedelta(days=1)).isoformat()
+            if not until:
+                until = datetime.now().isoformat() 
+            
+            result = await client.get_completed_tasks(
+                project_id=project_id,
+                since=since,
+                until=until,
+                limit=limit
+            )
             
-        # The API returns an object with 'items' containing the tasks
-        tasks = result.get("items", [])
+            if "error" in result:
+                return result
+                
+            # The API returns an object with 'items' containing the tasks
+            all_tasks = result.get("items", [])
+
+        tasks, next_cursor = page_results(client, "completed_tasks", all_tasks, max_bytes, snapshot_id, offset)
         
         return {
             "success": True,
             "completed_tasks": tasks,
             "count": len(tasks),
-            "message": f"Found {len(tasks)} completed tasks"
+            "total": len(all_tasks),
+            "next_cursor": next_cursor,
+            "message": f"Found {len(all_tasks)} completed tasks" +
+                       (f", returning {offset + 1}-{offset + len(tasks)}. Pass next_cursor to continue"
+                        if next_cursor or offset else "")
         }
         
     except Exception as e:
         return {"error": f"Failed to list completed tasks: {str(e)}"}
 
 
+@mcp.tool()
+@with_deadline
+async def task_stats(group_by: List[str] = None, completed: bool = False, project_name: str = None,
+                     filter_string: str = None, since: str = None, until: str = None) -> dict:
+    """
+    Count tasks grouped by project, priority, label, due date or completion day without
+    returning the tasks themselves. Prefer this over listing tasks when you only need numbers,
+    e.g. "how many overdue tasks per project?" or "what did I complete this week by label?".
+
+    Args:
+        group_by: Dimensions to group by. Active tasks support "project", "priority", "label"
+            and "due" (overdue/today/tomorrow/next_7_days/later/no_date). Completed tasks
+            support "project", "label" and "completed_day". Defaults to all supported dimensions.
+        completed: Aggregate completed tasks instead of active tasks (default False)
+        project_name: Restrict to a single project (optional)
+        filter_string: Todoist filter string for active tasks like "overdue", "p1" (optional)
+        since: Start date in ISO format (YYYY-MM-DD) for completed tasks (default last 7 days)
+        until: End date in ISO format (YYYY-MM-DD) for completed tasks (default now)
+
+    Returns:
+        Dict containing the total and per-dimension counts or error message
+    """
+    try:
+        supported = COMPLETED_DIMENSIONS if completed else ACTIVE_DIMENSIONS
+        group_by = group_by or list(supported)
+        unsupported = [dimension for dimension in group_by if dimension not in supported]
+        if unsupported:
+            return {"error": f"Unsupported group_by for {'completed' if completed else 'active'} tasks: "
+                             f"{', '.join(unsupported)}. Supported: {', '.join(supported)}"}
+
+        client = get_client()
+        project_id = None
+
+        if project_name:
+            project_id = await client.find_project_by_name(project_name)
+            if not project_id:
+                return {"error": f"Project '{project_name}' not found"}
+
+        project_names = {}
+        if "project" in group_by:
+            projects = await client.get_projects()
+            if "error" not in projects:
+                project_names = {project["id"]: project["name"] for project in projects}
+
+        stats = TaskStats(group_by, project_names=project_names)
+
+        if completed:
+            if not since:
+                since = (datetime.now() - timedelta(days=7)).isoformat()
+            if not until:
+                until = datetime.now().isoformat()
+            tasks = client.iter_completed_tasks(project_id=project_id, since=since, until=until)
+        else:
+            tasks = client.iter_tasks(project_id=project_id, filter_string=filter_string)
+
+        partial = False
+        try:
+            async with deadline(reserve()):
+                async for task in tasks:
+                    stats.add(task)
+        except TimeoutError:
+            partial = True
+
+        return {
+            "success": True,
+            **stats.result(),
+            "partial": partial,
+            "message": f"Aggregated {stats.total} {'completed' if completed else 'active'} tasks" +
+                       (" before running out of time; counts are partial" if partial else "")
+        }
+
+    except Exception as e:
+        return {"error": f"Failed to compute task stats: {str(e)}"}
+
+
+def agenda_entry(task: dict) -> dict:
+    """Compact view of a task for agenda listings"""
+    entry = {"id": task["id"], "content": task.get("content", ""), "project_id": task.get("project_id")}
+    if task.get("priority", 1) > 1:
+        entry["priority"] = task["priority"]
+    due = task.get("due") or {}
+    if due.get("datetime"):
+        entry["time"] = due["datetime"][11:16]
+    if due.get("is_recurring"):
+        entry["recurring"] = due.get("string", True)
+    return entry
+
+
+@mcp.tool()
+@with_deadline
+async def agenda(start: str = None, days: int = 7, project_name: str = None,
+                 include_overdue: bool = True) -> dict:
+    """
+    Get tasks due in a date range, grouped by day. Prefer this over list_active_tasks with a
+    filter for questions like "what's due this week?". Recurring tasks appear on every day
+    they occur within the range.
+
+    Args:
+        start: First day in ISO format (YYYY-MM-DD) (default today)
+        days: Number of days to cover, 1-90 (default 7)
+        project_name: Only include tasks from this project (optional)
+        include_overdue: Also list tasks due before `start` (default True)
+
+    Returns:
+        Dict with tasks bucketed by day (and overdue tasks) or error message
+    """
+    try:
+        first_day = date.fromisoformat(start) if start else date.today()
+        last_day = first_day + timedelta(days=min(max(days, 1), 90) - 1)
+
+        client = get_client()
+        project_id = None
+        if project_name:
+            project_id = await client.find_project_by_name(project_name)
+            if not project_id:
+                return {"error": f"Project '{project_name}' not found"}
+
+        stale = False
+        try:
+            async with deadline(reserve()):
+                index = await client.get_due_index()
+            # While Todoist is unavailable the index is built from the last cached tasks
+            stale = client.circuit_open("tasks")
+        except TimeoutError:
+            index = client.cached_due_index()
+            if index is None:
+                return {"error": "Timed out loading tasks and no cached agenda is available", "timed_out": True}
+            stale = True
+
+        by_day = {}
+        for day, task in index.between(first_day, last_day):
+            if project_id and task.get("project_id") != project_id:
+                continue
+            by_day.setdefault(day.isoformat(), []).append(agenda_entry(task))
+
+        result = {
+            "success": True,
+            "start": first_day.isoformat(),
+            "end": last_day.isoformat(),
+            "days": by_day
+        }
+        count = sum(len(tasks) for tasks in by_day.values())
+
+        if include_overdue:
+            result["overdue"] = [agenda_entry(task) for task in index.overdue(first_day)
+                                 if not project_id or task.get("project_id") == project_id]
+
+        result["message"] = f"Found {count} tasks due between {first_day} and {last_day}" + (
+            f" and {len(result['overdue'])} overdue" if include_overdue else "")
+        if stale:
+            result["stale"] = True
+            result["message"] += " (from cached tasks that may be out of date)"
+        return result
+
+    except ValueError as e:
+        return {"error": f"Invalid date: {str(e)}"}
+    except Exception as e:
+        return {"error": f"Failed to build agenda: {str(e)}"}
+
+
+@mcp.tool()
+@with_deadline
+async def get_task_tree(root: str = None, max_depth: int = 3, max_nodes: int = 200) -> dict:
+    """
+    Get a structured overview of projects -> sections -> tasks -> subtasks in one call.
+
+    Nodes that are not expanded (because of max_depth or max_nodes) include a `children_count`.
+    Expand them with a follow-up call passing the node's ID as `root`.
+
+    Args:
+        root: Node ID to expand, like "project:123", "section:456" or "task:789" (default: all projects)
+        max_depth: How many levels below the root to expand (default 3)
+        max_nodes: Maximum number of nodes to return (default 200)
+
+    Returns:
+        Dict containing the nested tree or error message
+    """
+    try:
+        client = get_client()
+        stale = False
+        try:
+            async with deadline(reserve()):
+                tree = await client.get_task_tree()
+            stale = client.circuit_open("projects", "sections", "tasks")
+        except TimeoutError:
+            tree = client.cached_task_tree()
+            if tree is None:
+                return {"error": "Timed out loading the task tree and no cached tree is available",
+                        "timed_out": True}
+            stale = True
+
+        if root and root not in tree:
+            return {"error": f"Node '{root}' not found. Node IDs look like 'project:123', 'section:456' or 'task:789'"}
+
+        result = tree.render(root=root, max_depth=max(max_depth, 1), max_nodes=max(max_nodes, 1))
+
+        response = {
+            "success": True,
+            **result,
+            "message": f"Returned {result['node_count']} nodes" + (" (truncated)" if result["truncated"] else "")
+        }
+        if stale:
+            response["stale"] = True
+            response["message"] += " from a cached tree that may be out of date"
+        return response
+
+    except Exception as e:
+        return {"error": f"Failed to build task tree: {str(e)}"}
+
+
+@mcp.tool()
+@with_deadline
+async def export_account(path: str, format: str = None, since: str = None, until: str = None,
+                         restart: bool = False, ctx: Context = None) -> dict:
+    """
+    Export every project, active task and completed task to a file on the server, for backups
+    or analysis. Data is streamed page by page, so accounts of any size can be exported.
+
+    Large exports may not finish within one call. Progress is checkpointed, so call again with
+    the same path to continue where the previous call stopped.
+
+    Args:
+        path: File to write, relative to the server's export directory, like "backup.ndjson";
+            a .csv suffix selects CSV
+        format: "ndjson" or "csv" (default from the file suffix, else ndjson)
+        since: Start of completed history in ISO format (YYYY-MM-DD) (default one year ago)
+        until: End of completed history in ISO format (YYYY-MM-DD) (default now)
+        restart: Start over, replacing an existing file or unfinished export at this path (default False)
+
+    Returns:
+        Dict with the record counts written, or progress so far if the export must be continued
+    """
+    try:
+        path = resolve_export_path(path, EXPORT_DIR)
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        export = AccountExport(get_client(), path, fmt=format, since=since, until=until, resume=not restart)
+
+        async def progress(done: int, message: str) -> None:
+            if ctx is not None:
+                await ctx.report_progress(done, message=message)
+
+        try:
+            async with deadline(reserve()):
+                summary = await export.run(progress)
+        except (TimeoutError, TodoistAPIError) as e:
+            reason = "ran out of time" if isinstance(e, TimeoutError) else f"stopped: {str(e)}"
+            return {
+                "success": False,
+                "complete": False,
+                "path": export.path,
+                "counts": dict(export.state["counts"]),
+                "message": f"Export {reason} after {export.total} records. "
+                           "Call export_account again with the same path to continue"
+            }
+
+        counts = summary["counts"]
+        return {
+            "success": True,
+            "complete": True,
+            **summary,
+            "message": f"Exported {counts['project']} projects, {counts['task']} active tasks and "
+                       f"{counts['completed_task']} completed tasks to {summary['path']}"
+        }
+
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"Failed to export account: {str(e)}"}
+
+
+@mcp.resource("todoist://tuning", mime_type="application/json")
+def tuning() -> dict:
+    """Page size and prefetch depth chosen for each Todoist list endpoint, with the page latencies behind them"""
+    return get_client().tuning_stats()
+
+
+def transport_security(host: str) -> Optional[TransportSecuritySettings]:
+    """
+    Host and Origin checks for the HTTP transports bound to `host`.
+
+    Loopback binds keep FastMCP's DNS-rebinding protection. A server bound to another interface
+    is reached under names that can't be known here (e.g. behind a gateway), so like FastMCP
+    itself it doesn't check the Host header.
+    """
+    if host in ("127.0.0.1", "localhost", "::1"):
+        return TransportSecuritySettings(
+            enable_dns_rebinding_protection=True,
+            allowed_hosts=["127.0.0.1:*", "localhost:*", "[::1]:*"],
+            allowed_origins=["http://127.0.0.1:*", "http://localhost:*", "http://[::1]:*"],
+        )
+    return None
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory under the system temp dir, so users on a host never share one"""
+    user = os.getuid() if hasattr(os, "getuid") else os.getenv("USERNAME", "default")
+    return os.path.join(tempfile.gettempdir(), f"todoist-mcp-cache-{user}")
+
+
+def http_app():
+    """
+    Build the ASGI app for the streamable HTTP transport.
+
+    Used as the uvicorn app factory, so every worker process builds its own app. With more than
+    one worker, sessions can't be pinned to a process, so the app runs in stateless mode.
+    """
+    if int(os.getenv("TODOIST_WORKERS", "1")) > 1:
+        mcp.settings.stateless_http = True
+    mcp.settings.host = os.getenv("TODOIST_HOST", mcp.settings.host)
+    mcp.settings.transport_security = transport_security(mcp.settings.host)
+
+    app = mcp.streamable_http_app()
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def app_lifespan(app):
+        async with client_scope():
+            async with session_lifespan(app):
+                yield
+
+    app.router.lifespan_context = app_lifespan
+    return app
+
+
 def main():
     """Run the MCP server"""
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Todoist MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default="stdio",
+                        help="Transport to serve (default stdio)")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind for network transports")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind for network transports")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("TODOIST_WORKERS", "1")),
+                        help="Worker processes for the streamable-http transport (default 1)")
+
+    args = parser.parse_args()
+
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers requires --transport streamable-http")
+
+    if args.transport == "stdio":
+        mcp.run()
+        return
+
+    if args.transport == "sse":
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        mcp.settings.transport_security = transport_security(args.host)
+        mcp.run(transport="sse")
+        return
+
+    import uvicorn
+
+    # Worker processes are spawned fresh, so settings travel through the environment
+    os.environ["TODOIST_WORKERS"] = str(args.workers)
+    os.environ["TODOIST_HOST"] = args.host
+    if args.workers > 1:
+        os.environ.setdefault("TODOIST_CACHE_DIR", default_cache_dir())
+
+    uvicorn.run("todoist_mcp_server.todoist:http_app", factory=True, host=args.host, port=args.port,
+                workers=args.workers if args.workers > 1 else None,
+                log_level=mcp.settings.log_level.lower())
 
 if __name__ == "__main__":
     main()
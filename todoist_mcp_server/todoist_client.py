@@ -1,8 +1,32 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Callable, Hashable, Optional, AsyncIterator, Tuple
+import asyncio
+import hashlib
 import httpx
 import os
+import secrets
+import time
+import uuid
+import warnings
+import weakref
 from datetime import datetime
 from enum import Enum
+from todoist_mcp_server.breaker import CircuitBreaker, CLOSED
+from todoist_mcp_server.cache import TTLCache
+from todoist_mcp_server.store import SharedStore
+from todoist_mcp_server.recording import transport_from_env
+from todoist_mcp_server.tree import TaskTree
+from todoist_mcp_server.tuning import PageTuner, prefetched
+from todoist_mcp_server.agenda import DueIndex
+from todoist_mcp_server.deadline import remaining
+from todoist_mcp_server.matching import NameIndex, normalize
+
+class TodoistAPIError(Exception):
+    """Raised by streaming helpers when the Todoist API returns an error"""
+
+
+class CircuitOpenError(TodoistAPIError):
+    """Raised by streaming helpers when requests to an endpoint are short-circuited"""
+
 
 class TodoistClient:
     _instance = None
@@ -15,85 +39,512 @@ class TodoistClient:
                 raise ValueError("TODOIST_API_TOKEN environment variable is required")
 
             self.api_token = api_token
-            self.base_url = "https://api.todoist.com/api/v1"
+            self.base_url = os.getenv("TODOIST_API_BASE_URL", "https://api.todoist.com/api/v1").rstrip("/")
             self.headers = {
                 "Authorization": f"Bearer {api_token}",
                 "Content-Type": "application/json"
             }
 
-            self._http_client = None
+            # One connection pool per event loop, since httpx pools can't be shared across loops
+            self._http_clients = weakref.WeakKeyDictionary()
+            self._in_flight = set()
+            self._closing = False
+            self.drain_timeout = float(os.getenv("TODOIST_DRAIN_TIMEOUT", "10"))
+
+            # Timeouts are split so that connect/read/write can be tuned independently
+            self.timeout = httpx.Timeout(
+                connect=float(os.getenv("TODOIST_CONNECT_TIMEOUT", "5")),
+                read=float(os.getenv("TODOIST_READ_TIMEOUT", "15")),
+                write=float(os.getenv("TODOIST_WRITE_TIMEOUT", "10")),
+                pool=float(os.getenv("TODOIST_POOL_TIMEOUT", "5"))
+            )
+            self.max_retries = int(os.getenv("TODOIST_MAX_RETRIES", "2"))
+            self.retry_backoff = float(os.getenv("TODOIST_RETRY_BACKOFF", "0.5"))
+
+            # One circuit breaker per endpoint class ("projects", "tasks", ...), so an endpoint that
+            # keeps failing is short-circuited instead of costing every caller a full timeout
+            self.breaker_threshold = int(os.getenv("TODOIST_BREAKER_THRESHOLD", "5"))
+            self.breaker_reset = float(os.getenv("TODOIST_BREAKER_RESET", "30"))
+            self._breakers: Dict[str, CircuitBreaker] = {}
+
+            # Page sizes and prefetch depth are tuned per endpoint from measured page latencies
+            self._tuners: Dict[str, PageTuner] = {}
 
             self.endpoints = Enum("Endpoints", [
                 ('GET_PROJECTS', "projects"), 
                 ('CREATE_TASK', "tasks"), 
                 ('GET_COMPLETED_TASKS', "tasks/completed/by_completion_date"), 
                 ('GET_TASKS', "tasks"),
-                ('COMPLETE_TASK', "tasks/{task_id}/close")
+                ('COMPLETE_TASK', "tasks/{task_id}/close"),
+                ('GET_SECTIONS', "sections"),
+                ('GET_LABELS', "labels"),
+                ('GET_COLLABORATORS', "projects/{project_id}/collaborators"),
+                ('GET_COMMENTS', "comments")
             ]) # Enum for endpoints
 
+            # Read-mostly data (projects, sections, the active task list) is cached for a short while.
+            # With TODOIST_CACHE_DIR the cache is shared by all worker processes on the host,
+            # namespaced by token so different accounts never see each other's data.
+            cache_dir = os.getenv("TODOIST_CACHE_DIR")
+            namespace = hashlib.sha256(api_token.encode()).hexdigest()[:16]
+            store = SharedStore(cache_dir, namespace) if cache_dir else None
+            self._cache = TTLCache(float(os.getenv("TODOIST_CACHE_TTL", "60")), store=store)
+
+            # Result snapshots that tool continuation cursors point into
+            snapshot_store = SharedStore(cache_dir, f"{namespace}:snapshots") if cache_dir else None
+            self._snapshots = TTLCache(float(os.getenv("TODOIST_SNAPSHOT_TTL", "600")), store=snapshot_store,
+                                       max_entries=int(os.getenv("TODOIST_MAX_SNAPSHOTS", "256")))
+
+            # Comments are keyed by the task's updated_at, so they can be kept much longer than listings
+            comment_store = SharedStore(cache_dir, f"{namespace}:comments") if cache_dir else None
+            self._comments = TTLCache(float(os.getenv("TODOIST_COMMENT_CACHE_TTL", "600")), store=comment_store,
+                                      max_entries=int(os.getenv("TODOIST_COMMENT_CACHE_SIZE", "1024")))
+            self.comment_concurrency = int(os.getenv("TODOIST_COMMENT_CONCURRENCY", "8"))
+
+            # Indexes derived from cached listings, rebuilt only when those listings change.
+            # Name indexes map a key like "projects" or ("sections", project_id) to (listing, index).
+            self._name_indexes: Dict[Hashable, Tuple[List[Dict], NameIndex]] = {}
+            self._task_tree = None
+            self._due_index = None
+            self.match_threshold = float(os.getenv("TODOIST_MATCH_THRESHOLD", "0.75"))
+            self.match_margin = float(os.getenv("TODOIST_MATCH_MARGIN", "0.05"))
+
             TodoistClient._initialized = True
 
-    async def _get_http_client(self):
-        """Get or create HTTP client with connection pooling"""
-        if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient()
-        return self._http_client
-    
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled HTTP client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            self._reap_leaked_pools()
+            # Optional record/replay transport (TODOIST_RECORD_PATH / TODOIST_REPLAY_PATH)
+            client = httpx.AsyncClient(timeout=self.timeout, transport=transport_from_env(self.api_token))
+            self._http_clients[loop] = client
+        return client
+
+    def _reap_leaked_pools(self) -> None:
+        """Forget pools whose event loop was closed without closing the client first"""
+        for loop, client in list(self._http_clients.items()):
+            if loop.is_closed():
+                if not client.is_closed:
+                    warnings.warn("TodoistClient connection pool leaked: its event loop was closed "
+                                  "before the client. Use 'async with TodoistClient()' or call aclose().",
+                                  ResourceWarning, stacklevel=3)
+                del self._http_clients[loop]
+
+    async def aclose(self, timeout: float = None) -> None:
+        """
+        Drain in-flight requests and close every connection pool.
+
+        New requests are rejected while draining. Requests on this loop that outlive `timeout`
+        are cancelled. The client can be used again afterwards; pools are reopened lazily.
+        """
+        timeout = self.drain_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        self._closing = True
+        try:
+            current = asyncio.current_task()
+            pending = {task for task in self._in_flight
+                       if task is not current and not task.done() and task.get_loop() is loop}
+            if pending:
+                _, pending = await asyncio.wait(pending, timeout=timeout)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+
+            self._reap_leaked_pools()
+            for pool_loop, client in list(self._http_clients.items()):
+                if pool_loop is loop:
+                    await client.aclose()
+                elif pool_loop.is_running():
+                    # Pools must be closed on the loop that owns them
+                    future = asyncio.run_coroutine_threadsafe(client.aclose(), pool_loop)
+                    await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+                elif not client.is_closed:
+                    warnings.warn("TodoistClient connection pool leaked: its event loop is not running, "
+                                  "so the pool cannot be closed.", ResourceWarning, stacklevel=2)
+            self._http_clients.clear()
+        finally:
+            self._closing = False
+
+    async def __aenter__(self) -> "TodoistClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """Close the shared client, if one was created, and forget it"""
+        if cls._instance is not None and cls._initialized:
+            await cls._instance.aclose()
+        cls._instance = None
+        cls._initialized = False
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    async def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None) -> Dict:
-        """Make HTTP request to Todoist API"""
+    async def _make_request(self, method: str, endpoint: str, data: Dict = None, params: Dict = None,
+                            request_id: str = None, metrics: Dict = None) -> Dict:
+        """
+        Make HTTP request to Todoist API
+
+        Every logical operation carries a single X-Request-Id across all of its attempts, which
+        lets Todoist deduplicate mutating requests. That makes it safe to retry POSTs as well as
+        GETs on network errors and 5xx responses. When `metrics` is given, the size of the final
+        response body is stored in it under "bytes".
+        """
         url = f"{self.base_url}/{endpoint}"
-        
-        async with httpx.AsyncClient() as client:
+        method = method.upper()
+        if method not in ("GET", "POST", "DELETE"):
+            return {"error": f"Request failed: Unsupported HTTP method: {method}"}
+
+        if self._closing:
+            return {"error": "Request failed: Todoist client is shutting down"}
+
+        breaker_name = endpoint.split("/")[0]
+        breaker = self._breaker(breaker_name)
+        probe = breaker.state != CLOSED
+        if not breaker.allow():
+            return {"error": f"Todoist API unavailable: {breaker_name} requests keep failing, "
+                             f"retrying in {breaker.retry_after():.0f}s",
+                    "circuit_open": True}
+
+        headers = {**self.headers, "X-Request-Id": request_id or uuid.uuid4().hex}
+
+        task = asyncio.current_task()
+        self._in_flight.add(task)
+        try:
+            client = await self._get_http_client()
+            return await self._send_with_retries(client, breaker, method, url, headers, data, params, metrics)
+        finally:
+            if probe:
+                # A cancelled probe has no outcome; let the next request probe instead
+                breaker.release()
+            self._in_flight.discard(task)
+
+    def _breaker(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return breaker
+
+    def circuit_open(self, *names: str) -> bool:
+        """Whether requests to any of the given endpoint classes (or any at all) are short-circuited"""
+        breakers = [self._breakers[name] for name in names if name in self._breakers] if names \
+            else list(self._breakers.values())
+        return any(breaker.state != CLOSED for breaker in breakers)
+
+    def _request_timeout(self) -> httpx.Timeout:
+        """Configured timeouts, clamped to what is left of the current tool's deadline"""
+        left = remaining()
+        if left is None:
+            return self.timeout
+        return httpx.Timeout(connect=min(self.timeout.connect, left), read=min(self.timeout.read, left),
+                             write=min(self.timeout.write, left), pool=min(self.timeout.pool, left))
+
+    def _can_retry(self, attempt: int) -> bool:
+        """Retry only while attempts remain and the backoff fits in the deadline"""
+        if attempt >= self.max_retries:
+            return False
+        left = remaining()
+        return left is None or left > self.retry_backoff * 2 ** attempt
+
+    async def _send_with_retries(self, client: httpx.AsyncClient, breaker: CircuitBreaker, method: str,
+                                 url: str, headers: Dict, data: Dict = None, params: Dict = None,
+                                 metrics: Dict = None) -> Dict:
+        attempt = 0
+        while True:
             try:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=self.headers, params=params)
-                elif method.upper() == "POST":
-                    response = await client.post(url, headers=self.headers, json=data, params=params)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url, headers=self.headers)
+                timeout = self._request_timeout()
+                if method == "GET":
+                    response = await client.get(url, headers=headers, params=params, timeout=timeout)
+                elif method == "POST":
+                    response = await client.post(url, headers=headers, json=data, params=params, timeout=timeout)
                 else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
+                    response = await client.delete(url, headers=headers, timeout=timeout)
+
+                if response.status_code >= 500 and self._can_retry(attempt):
+                    attempt += 1
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                    continue
+
+                # Server errors and rate limiting count against the endpoint, client errors don't
+                if response.status_code >= 500 or response.status_code == 429:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
                 response.raise_for_status()
-                
+
+                if metrics is not None:
+                    metrics["bytes"] = len(response.content)
+
                 # Handle empty responses (like for task completion)
                 if response.status_code == 204 or not response.content:
                     return {"success": True}
-                
+
                 return response.json()
-                
+
+            except httpx.TransportError as e:
+                if self._can_retry(attempt):
+                    attempt += 1
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                    continue
+                breaker.record_failure()
+                return {"error": f"HTTP error: {str(e)}"}
             except httpx.HTTPError as e:
                 return {"error": f"HTTP error: {str(e)}"}
             except Exception as e:
                 return {"error": f"Request failed: {str(e)}"}
 
+    async def _collect(self, endpoint: str, params: Dict = None) -> List[Dict]:
+        """Fetch every page of a paginated endpoint into a list"""
+        return [item async for item in self._iter_pages(endpoint, params or {}, "results")]
+
+    async def _cached(self, key, loader, cache: TTLCache = None) -> List[Dict]:
+        """Load a listing through the cache; while its circuit is open, serve the last copy instead"""
+        cache = cache or self._cache
+        try:
+            return await cache.get_or_load(key, loader)
+        except CircuitOpenError as e:
+            stale = cache.peek(key)
+            if stale is not None:
+                return stale
+            return {"error": str(e), "circuit_open": True}
+        except TodoistAPIError as e:
+            return {"error": str(e)}
+
     async def get_projects(self) -> List[Dict]:
-        """Get all projects"""
-        result = await self._make_request("GET", self.endpoints.GET_PROJECTS.value)
-        if "error" in result:
-            return result
-        return result
+        """Get all projects (cached)"""
+        return await self._cached("projects", lambda: self._collect(self.endpoints.GET_PROJECTS.value))
 
-    async def find_project_by_name(self, name: str) -> Optional[str]:
-        """Find project ID by name (case-insensitive)"""
+    async def get_sections(self) -> List[Dict]:
+        """Get all sections across projects (cached)"""
+        return await self._cached("sections", lambda: self._collect(self.endpoints.GET_SECTIONS.value))
+
+    async def get_labels(self) -> List[Dict]:
+        """Get all personal labels (cached)"""
+        return await self._cached("labels", lambda: self._collect(self.endpoints.GET_LABELS.value))
+
+    async def get_collaborators(self, project_id: str) -> List[Dict]:
+        """Get the collaborators of a shared project (cached per project)"""
+        endpoint = self.endpoints.GET_COLLABORATORS.value.format(project_id=project_id)
+        return await self._cached(("collaborators", project_id), lambda: self._collect(endpoint))
+
+    async def get_comments(self, task_id: str, updated_at: str = None) -> List[Dict]:
+        """Get the comments on a task (cached until the task's `updated_at` changes)"""
+        params = {"task_id": task_id}
+        return await self._cached(("comments", task_id, updated_at),
+                                  lambda: self._collect(self.endpoints.GET_COMMENTS.value, params), self._comments)
+
+    async def get_comments_for_tasks(self, tasks: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Get the comments on many tasks at once, keyed by task ID.
+
+        Fetches run concurrently, at most `comment_concurrency` at a time. Tasks whose
+        `note_count` says they have no comments are skipped.
+        """
+        semaphore = asyncio.BoundedSemaphore(self.comment_concurrency)
+
+        async def fetch(task: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.get_comments(task["id"], task.get("updated_at"))
+
+        wanted = [task for task in tasks if task.get("note_count", 1)]
+        results = await asyncio.gather(*(fetch(task) for task in wanted))
+        return {task["id"]: result for task, result in zip(wanted, results)}
+
+    def save_snapshot(self, items: List[Dict], kind: str) -> str:
+        """Keep a `kind` result list server-side so it can be paged through without re-querying the API"""
+        snapshot_id = secrets.token_urlsafe(9)
+        self._snapshots.set(("snapshot", kind, snapshot_id), items)
+        return snapshot_id
+
+    def load_snapshot(self, snapshot_id: str, kind: str) -> Optional[List[Dict]]:
+        """Return a saved `kind` result list, or None if it expired or holds another kind"""
+        return self._snapshots.get(("snapshot", kind, snapshot_id))
+
+    def invalidate_cache(self, *keys) -> None:
+        """Drop cached listings ("projects", "sections", "labels", "tasks"), or everything"""
+        self._cache.invalidate(*keys)
+
+    async def get_all_tasks(self) -> List[Dict]:
+        """Get every active task (cached, invalidated when tasks are created or completed)"""
+        return await self._cached("tasks", lambda: self._collect(self.endpoints.GET_TASKS.value))
+
+    async def get_task_tree(self) -> TaskTree:
+        """Get the project/section/task tree index, rebuilt only when a cached listing changes"""
+        projects, sections, tasks = await asyncio.gather(
+            self.get_projects(), self.get_sections(), self.get_all_tasks())
+        for result in (projects, sections, tasks):
+            if "error" in result:
+                raise TodoistAPIError(result["error"])
+
+        sources = (projects, sections, tasks)
+        if self._task_tree is None or any(a is not b for a, b in zip(self._task_tree[0], sources)):
+            self._task_tree = (sources, TaskTree(projects, sections, tasks))
+        return self._task_tree[1]
+
+    async def get_due_index(self) -> DueIndex:
+        """Get the due-date index over active tasks, rebuilt only when the cached task list changes"""
+        tasks = await self.get_all_tasks()
+        if "error" in tasks:
+            raise TodoistAPIError(tasks["error"])
+
+        if self._due_index is None or self._due_index[0] is not tasks:
+            self._due_index = (tasks, DueIndex(tasks))
+        return self._due_index[1]
+
+    def cached_tasks(self) -> Optional[List[Dict]]:
+        """The last fetched active task list, even if it has expired, or None"""
+        return self._cache.peek("tasks")
+
+    def cached_due_index(self) -> Optional[DueIndex]:
+        """The last built due-date index, even if the task list has changed since, or None"""
+        return self._due_index[1] if self._due_index else None
+
+    def cached_task_tree(self) -> Optional[TaskTree]:
+        """The last built task tree, even if a listing has changed since, or None"""
+        return self._task_tree[1] if self._task_tree else None
+
+    def _invalidate_tasks(self, result: Dict) -> None:
+        if "error" not in result:
+            self._cache.invalidate("tasks")
+
+    def _name_index(self, key: Hashable, listing: List[Dict],
+                    keep: Callable[[Dict], bool] = None) -> NameIndex:
+        """
+        Name index over the items of `listing` that `keep` accepts (default: all), cached under `key`.
+
+        The index is rebuilt only when the cached `listing` it was built from is replaced.
+        """
+        cached = self._name_indexes.get(key)
+        if cached is None or cached[0] is not listing:
+            items = listing if keep is None else [item for item in listing if keep(item)]
+            cached = self._name_indexes[key] = (listing, NameIndex(items))
+        return cached[1]
+
+    def _resolve_name(self, index: NameIndex, name: str, kind: str) -> Dict:
+        """Resolve `name` with the match threshold and margin, or explain why it can't be"""
+        match, close = index.resolve(name, self.match_threshold, self.match_margin)
+        if match:
+            item, score = match
+            return {"id": item["id"], "name": item["name"], "confidence": score}
+        if close:
+            options = " or ".join(f"'{item['name']}'" for item in close)
+            return {"error": f"{kind} '{name}' is ambiguous. Did you mean {options}?"}
+        return {"error": f"{kind} '{name}' not found"}
+
+    async def match_project(self, name: str, limit: int = 5) -> Optional[Dict]:
+        """
+        Rank projects by similarity to `name`.
+
+        Returns the best match with a confidence score in [0, 1] plus the runner-up candidates,
+        or None if the projects can't be fetched or nothing resembles the name.
+        """
         projects = await self.get_projects()
         if "error" in projects:
             return None
-        
-        name_lower = name.lower()
-        for project in projects:
-            if project["name"].lower() == name_lower:
-                return project["id"]
-        return None
+
+        ranked = self._name_index("projects", projects).search(name, limit=limit)
+        if not ranked:
+            return None
+
+        candidates = [{"id": project["id"], "name": project["name"], "confidence": score}
+                      for project, score in ranked]
+        return {**candidates[0], "candidates": candidates}
+
+    async def resolve_project(self, name: str) -> Optional[Dict]:
+        """
+        Find the project `name` refers to, tolerating case, punctuation, typos and extra words.
+
+        Returns the match (id, name, confidence) if it clears the match threshold and beats the
+        runner-up by the match margin; otherwise None.
+        """
+        projects = await self.get_projects()
+        if "error" in projects:
+            return None
+        project = self._resolve_name(self._name_index("projects", projects), name, "Project")
+        return None if "error" in project else project
+
+    async def find_project_by_name(self, name: str) -> Optional[str]:
+        """Find project ID by name, tolerating case, punctuation, typos and extra words"""
+        project = await self.resolve_project(name)
+        return project["id"] if project else None
+
+    async def resolve_section(self, name: str, project_id: str = None) -> Dict:
+        """
+        Find the section `name` refers to, optionally within a project.
+
+        Returns the match (id, name, confidence), or an error when no section or more than one
+        section matches.
+        """
+        sections = await self.get_sections()
+        if "error" in sections:
+            return sections
+
+        in_project = (lambda section: section.get("project_id") == project_id) if project_id else None
+        return self._resolve_name(self._name_index(("sections", project_id), sections, in_project),
+                                  name, "Section")
+
+    async def find_section_by_name(self, name: str, project_id: str = None) -> Optional[str]:
+        """Find section ID by fuzzy name, optionally within a project"""
+        section = await self.resolve_section(name, project_id)
+        return section.get("id")
+
+    async def resolve_collaborator(self, name: str, project_id: str) -> Dict:
+        """
+        Find the project collaborator `name` refers to, by exact email or fuzzy name.
+
+        Returns the match (id, name, confidence), or an error when no collaborator or more than
+        one collaborator matches.
+        """
+        collaborators = await self.get_collaborators(project_id)
+        if "error" in collaborators:
+            return collaborators
+
+        for collaborator in collaborators:
+            if collaborator.get("email", "").lower() == name.lower():
+                return {"id": collaborator["id"], "name": collaborator["name"], "confidence": 1.0}
+        return self._resolve_name(self._name_index(("collaborators", project_id), collaborators),
+                                  name, "Collaborator")
+
+    async def find_collaborator_by_name(self, name: str, project_id: str) -> Optional[str]:
+        """Find a project collaborator's user ID by fuzzy name or exact email"""
+        collaborator = await self.resolve_collaborator(name, project_id)
+        return collaborator.get("id")
+
+    async def resolve_labels(self, names: List[str]) -> Tuple[List[str], Dict[str, Optional[str]]]:
+        """
+        Map label names onto existing labels, ignoring case and punctuation.
+
+        Returns the resolved names (existing labels use their canonical spelling) and the names
+        that matched no existing label, each with the closest existing label as a suggestion
+        (or None). Unknown names are passed through unchanged and would create a new label on use.
+        """
+        labels = await self.get_labels()
+        if "error" in labels:
+            return list(names), {}
+
+        existing = {normalize(label["name"]): label["name"] for label in labels}
+        resolved, unknown = [], {}
+        for name in names:
+            label = existing.get(normalize(name))
+            if label:
+                resolved.append(label)
+            else:
+                resolved.append(name)
+                suggestion = self._name_index("labels", labels).best(name)
+                unknown[name] = suggestion[0]["name"] if suggestion else None
+        return resolved, unknown
 
     async def create_task(self, content: str, description: Optional[str] = "", project_id: str = None, 
-                         due_string: str = None, priority: int = 1, labels: List[str] = None) -> Dict:
-        """Create a new task"""
+                         due_string: str = None, priority: int = 1, labels: List[str] = None,
+                         section_id: str = None, assignee_id: str = None, request_id: str = None) -> Dict:
+        """Create a new task. Pass the same request_id to safely retry a create."""
         data = {
             "content": content,
             "priority": priority
@@ -107,23 +558,31 @@ class TodoistClient:
             data["due_string"] = due_string
         if labels:
             data["labels"] = labels
+        if section_id:
+            data["section_id"] = section_id
+        if assignee_id:
+            data["assignee_id"] = assignee_id
             
-        return await self._make_request("POST", self.endpoints.CREATE_TASK.value, data)
+        result = await self._make_request("POST", self.endpoints.CREATE_TASK.value, data, request_id=request_id)
+        self._invalidate_tasks(result)
+        if labels and "error" not in result:
+            cached = self._cache.get("labels") or []
+            if not {label["name"] for label in cached}.issuperset(labels):
+                # Todoist created new labels as a side effect
+                self._cache.invalidate("labels")
+        return result
 
     async def get_tasks(self, project_id: str = None, filter_string: str = None, limit: int = 50) -> List[Dict]:
-        """Get tasks with optional filtering"""
-        params = {"limit": limit}
-        
-        if project_id:
-            params["project_id"] = project_id
-        if filter_string:
-            params["filter"] = filter_string
-            
-        return await self._make_request("GET", self.endpoints.GET_TASKS.value, params=params)
+        """Get up to `limit` tasks with optional filtering, in tuned page sizes"""
+        params = self._task_params(project_id, filter_string)
+        return await self._take(self.endpoints.GET_TASKS.value, params, "results", limit)
 
-    async def complete_task(self, task_id: str) -> Dict:
+    async def complete_task(self, task_id: str, request_id: str = None) -> Dict:
         """Mark a task as completed"""
-        return await self._make_request("POST", self.endpoints.COMPLETE_TASK.value.format(task_id=task_id))
+        result = await self._make_request("POST", self.endpoints.COMPLETE_TASK.value.format(task_id=task_id),
+                                          request_id=request_id)
+        self._invalidate_tasks(result)
+        return result
 
     async def get_completed_tasks(self, project_id: str = None, since: str = None, 
                                 until: str = None, limit: int = 30) -> Dict:
@@ -134,18 +593,141 @@ class TodoistClient:
             project_id: Filter by project ID (optional)
             since: Start date in ISO format (YYYY-MM-DD) or datetime string (optional)
             until: End date in ISO format (YYYY-MM-DD) or datetime string (optional)
-            limit: Maximum number of tasks to return (default 30, max 200)
+            limit: Maximum number of tasks to return (default 30)
             
         Returns:
-            Dict containing completed tasks or error message
+            Dict containing completed tasks under "items" or error message
         """
-        params = {"limit": min(limit, 200)}  # API max is 200
-        
+        params = self._completed_params(project_id, since, until)
+        items = await self._take(self.endpoints.GET_COMPLETED_TASKS.value, params, "items", limit)
+        return items if "error" in items else {"items": items}
+
+    def _tuner(self, endpoint: str) -> PageTuner:
+        tuner = self._tuners.get(endpoint)
+        if tuner is None:
+            tuner = self._tuners[endpoint] = PageTuner()
+        return tuner
+
+    def tuning_stats(self) -> Dict[str, Dict]:
+        """Measured page latencies and the page size and prefetch depth chosen for each endpoint"""
+        return {endpoint: tuner.snapshot() for endpoint, tuner in self._tuners.items()}
+
+    async def _fetch_pages(self, endpoint: str, params: Dict, items_key: str, cursor: str,
+                           wanted: Optional[int], tuner: PageTuner) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        params = dict(params)
+        page_size = params.get("limit")
+        if cursor:
+            params["cursor"] = cursor
+        fetched = 0
+        while True:
+            still_wanted = None if wanted is None else wanted - fetched
+            limit = page_size or tuner.choose(still_wanted)
+            params["limit"] = limit if still_wanted is None else min(limit, still_wanted)
+
+            metrics = {}
+            started = time.perf_counter()
+            result = await self._make_request("GET", endpoint, params=params, metrics=metrics)
+            if "bytes" in metrics:
+                tuner.observe(params["limit"], time.perf_counter() - started, metrics["bytes"])
+
+            if isinstance(result, list):
+                # Unpaginated response, everything arrived at once
+                yield result, None
+                return
+            if "error" in result:
+                raise (CircuitOpenError if result.get("circuit_open") else TodoistAPIError)(result["error"])
+
+            items = result.get(items_key, [])
+            fetched += len(items)
+            cursor = result.get("next_cursor")
+            if not cursor:
+                tuner.observe_total(fetched)
+            yield items, cursor
+            if not cursor or (wanted is not None and fetched >= wanted):
+                return
+            params["cursor"] = cursor
+
+    async def _pages(self, endpoint: str, params: Dict, items_key: str, cursor: str = None,
+                     wanted: int = None) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """
+        Follow next_cursor through a paginated endpoint, yielding (items, next_cursor) per page.
+
+        Unless `params` fixes a "limit", every page is sized by the endpoint's tuner for the
+        `wanted` items still to come (None: all of them), and pages may be fetched ahead of the
+        caller when it spends long enough on each one.
+        """
+        tuner = self._tuner(endpoint)
+        pages = self._fetch_pages(endpoint, params, items_key, cursor, wanted, tuner)
+        depth = 0 if "limit" in params else tuner.prefetch(tuner.choose(wanted), wanted)
+        if depth:
+            pages = prefetched(pages, depth)
+        try:
+            async for page in pages:
+                started = time.perf_counter()
+                yield page
+                tuner.observe_consumer(time.perf_counter() - started)
+        finally:
+            await pages.aclose()
+
+    async def _take(self, endpoint: str, params: Dict, items_key: str, limit: int) -> List[Dict]:
+        """Collect up to `limit` items from a paginated endpoint, or an error dict"""
+        items = []
+        try:
+            async for page, _ in self._pages(endpoint, params, items_key, wanted=max(limit, 1)):
+                items.extend(page)
+        except CircuitOpenError as e:
+            return {"error": str(e), "circuit_open": True}
+        except TodoistAPIError as e:
+            return {"error": str(e)}
+        return items[:limit]
+
+    async def _iter_pages(self, endpoint: str, params: Dict, items_key: str) -> AsyncIterator[Dict]:
+        """Follow next_cursor through a paginated endpoint, yielding one item at a time"""
+        async for items, _ in self._pages(endpoint, params, items_key):
+            for item in items:
+                yield item
+
+    def _task_params(self, project_id: str = None, filter_string: str = None, page_size: int = None) -> Dict:
+        params = {"limit": page_size} if page_size else {}
+        if project_id:
+            params["project_id"] = project_id
+        if filter_string:
+            params["filter"] = filter_string
+        return params
+
+    def _completed_params(self, project_id: str = None, since: str = None, until: str = None,
+                          page_size: int = None) -> Dict:
+        params = {"limit": min(page_size, 200)} if page_size else {}  # API max is 200
         if project_id:
             params["project_id"] = project_id
         if since:
             params["since"] = since
         if until:
             params["until"] = until
-            
-        return await self._make_request("GET", self.endpoints.GET_COMPLETED_TASKS.value, params=params)
\ No newline at end of file
+        return params
+
+    async def iter_tasks(self, project_id: str = None, filter_string: str = None,
+                         page_size: int = None) -> AsyncIterator[Dict]:
+        """Stream all active tasks page by page without holding them in memory (page size tuned unless given)"""
+        params = self._task_params(project_id, filter_string, page_size)
+        async for task in self._iter_pages(self.endpoints.GET_TASKS.value, params, "results"):
+            yield task
+
+    async def iter_completed_tasks(self, project_id: str = None, since: str = None,
+                                   until: str = None, page_size: int = None) -> AsyncIterator[Dict]:
+        """Stream all completed tasks within a timespan page by page"""
+        params = self._completed_params(project_id, since, until, page_size)
+        async for task in self._iter_pages(self.endpoints.GET_COMPLETED_TASKS.value, params, "items"):
+            yield task
+
+    def task_pages(self, cursor: str = None,
+                   page_size: int = None) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """Stream all active tasks as (tasks, next_cursor) pages, starting from a saved cursor if given"""
+        return self._pages(self.endpoints.GET_TASKS.value, self._task_params(page_size=page_size), "results",
+                           cursor)
+
+    def completed_task_pages(self, since: str, until: str, cursor: str = None,
+                             page_size: int = None) -> AsyncIterator[Tuple[List[Dict], Optional[str]]]:
+        """Stream completed tasks within a timespan as (tasks, next_cursor) pages"""
+        params = self._completed_params(since=since, until=until, page_size=page_size)
+        return self._pages(self.endpoints.GET_COMPLETED_TASKS.value, params, "items", cursor)
@@ -0,0 +1,102 @@
+"""Project -> section -> task -> subtask tree, materialized once from flat API listings"""
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Within a parent, sub-projects come first, then tasks without a section, then sections
+_KIND_RANK = {"project": 0, "task": 1, "section": 2}
+
+
+def _task_node(task: Dict) -> Dict:
+    node = {"id": f"task:{task['id']}", "content": task.get("content", "")}
+    if task.get("priority", 1) > 1:
+        node["priority"] = task["priority"]
+    if task.get("due"):
+        node["due"] = task["due"].get("date")
+    return node
+
+
+class TaskTree:
+    """
+    Parent/child index over projects, sections and tasks.
+
+    Node IDs are prefixed with their kind ("project:123", "section:456", "task:789") so any
+    node can be used as the root of a lazily expanded subtree.
+    """
+
+    def __init__(self, projects: List[Dict], sections: List[Dict], tasks: List[Dict]):
+        self.nodes: Dict[str, Dict] = {}
+        self.children: Dict[Optional[str], List[str]] = defaultdict(list)
+        self._order: Dict[str, tuple] = {}
+
+        # First pass registers every node, second pass links it to its parent
+        edges = []
+        for project in projects:
+            node_id = f"project:{project['id']}"
+            self._add(node_id, "project", {"id": node_id, "name": project.get("name", "")},
+                      project.get("child_order", project.get("order", 0)))
+            parent = project.get("parent_id")
+            edges.append((node_id, f"project:{parent}" if parent else None, None))
+        for section in sections:
+            node_id = f"section:{section['id']}"
+            self._add(node_id, "section", {"id": node_id, "name": section.get("name", "")},
+                      section.get("section_order", section.get("order", 0)))
+            edges.append((node_id, f"project:{section.get('project_id')}", None))
+        for task in tasks:
+            node_id = f"task:{task['id']}"
+            self._add(node_id, "task", _task_node(task), task.get("child_order", task.get("order", 0)))
+            project = f"project:{task.get('project_id')}"
+            if task.get("parent_id"):
+                parent = f"task:{task['parent_id']}"
+            elif task.get("section_id"):
+                parent = f"section:{task['section_id']}"
+            else:
+                parent = project
+            edges.append((node_id, parent, project))
+
+        for node_id, parent, fallback in edges:
+            # Orphans (e.g. subtasks of a task we did not receive) are attached to their project
+            if parent is not None and parent not in self.nodes:
+                parent = fallback if fallback in self.nodes else None
+            self.children[parent].append(node_id)
+
+        for child_ids in self.children.values():
+            child_ids.sort(key=self._order.__getitem__)
+
+    def _add(self, node_id: str, kind: str, node: Dict, order) -> None:
+        self.nodes[node_id] = node
+        self._order[node_id] = (_KIND_RANK[kind], order or 0)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.nodes
+
+    def render(self, root: str = None, max_depth: int = 3, max_nodes: int = 200) -> Dict:
+        """
+        Render the subtree under `root` (or the whole account) as nested dicts.
+
+        Nodes beyond `max_depth` or past the `max_nodes` budget are not expanded; they carry a
+        `children_count` so the caller can expand them later by passing their ID as `root`.
+        """
+        state = {"budget": max_nodes, "truncated": False}
+        nodes = self._render_children(root, 1, max_depth, state)
+        return {"root": root, "nodes": nodes, "node_count": max_nodes - state["budget"],
+                "truncated": state["truncated"]}
+
+    def _render_children(self, parent: Optional[str], depth: int, max_depth: int, state: Dict) -> List[Dict]:
+        rendered = []
+        for child_id in self.children.get(parent, []):
+            if state["budget"] <= 0:
+                state["truncated"] = True
+                break
+            state["budget"] -= 1
+            node = dict(self.nodes[child_id])
+            grandchildren = self.children.get(child_id)
+            if grandchildren:
+                children = []
+                if depth < max_depth:
+                    children = self._render_children(child_id, depth + 1, max_depth, state)
+                if children:
+                    node["children"] = children
+                if len(children) < len(grandchildren):
+                    node["children_count"] = len(grandchildren)
+            rendered.append(node)
+        return rendered
@@ -0,0 +1,132 @@
+"""Page-size and prefetch autotuning for paginated list endpoints"""
+import asyncio
+import math
+from contextlib import suppress
+from typing import AsyncIterator, Dict, Optional, Sequence
+
+# Page sizes the tuner chooses between; 200 is the API maximum
+PAGE_SIZES = (25, 50, 100, 200)
+
+
+class PageTuner:
+    """
+    Chooses page sizes for one paginated endpoint from measured page latencies.
+
+    Every page size keeps exponentially weighted averages of its latency and response size.
+    Each page of a listing is sized to minimize the estimated time to fetch the remaining
+    items, ceil(remaining / size) * latency(size). Sizes that haven't been measured yet are
+    tried once, which costs at most one page per size.
+
+    Cursor pagination is sequential, so prefetching means fetching the next page while the
+    caller is still busy with the current one. That only pays off when the caller does real
+    work per page, and extra depth only helps absorb jittery latencies.
+    """
+
+    def __init__(self, sizes: Sequence[int] = PAGE_SIZES, alpha: float = 0.3, max_prefetch: int = 2):
+        self.sizes = sorted(sizes)
+        self.alpha = alpha
+        self.max_prefetch = max_prefetch
+        self.latency: Dict[int, float] = {}
+        self.jitter: Dict[int, float] = {}
+        self.bytes: Dict[int, float] = {}
+        self.pages: Dict[int, int] = {}
+        self.consumer: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def _average(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.alpha * (sample - current)
+
+    def bucket(self, limit: int) -> int:
+        """The smallest tuned size that covers `limit`"""
+        return next((size for size in self.sizes if size >= limit), self.sizes[-1])
+
+    def observe(self, limit: int, latency: float, nbytes: int) -> None:
+        """Record how long a page requested with `limit` took and how big it was"""
+        size = self.bucket(limit)
+        previous = self.latency.get(size)
+        if previous is not None:
+            self.jitter[size] = self._average(self.jitter.get(size), abs(latency - previous))
+        self.latency[size] = self._average(previous, latency)
+        self.bytes[size] = self._average(self.bytes.get(size), nbytes)
+        self.pages[size] = self.pages.get(size, 0) + 1
+
+    def observe_consumer(self, seconds: float) -> None:
+        """Record how long the caller spent on a page before asking for the next one"""
+        self.consumer = self._average(self.consumer, seconds)
+
+    def observe_total(self, items: int) -> None:
+        """Record the length of a listing that was read to the end"""
+        self.total = self._average(self.total, items)
+
+    def estimate(self, size: int, remaining: int) -> Optional[float]:
+        """Estimated seconds to fetch `remaining` items with pages of `size`, None if unmeasured"""
+        latency = self.latency.get(size)
+        return None if latency is None else math.ceil(remaining / size) * latency
+
+    def choose(self, remaining: Optional[int] = None) -> int:
+        """Page size for the next page, given how many items are still wanted (None: all of them)"""
+        if remaining is None:
+            remaining = round(self.total) if self.total else self.sizes[-1]
+        # Pages bigger than what is still wanted can't be faster than the one that just covers it
+        candidates = [size for size in self.sizes if size <= self.bucket(remaining)]
+
+        unmeasured = [size for size in candidates if size not in self.latency]
+        if unmeasured:
+            return unmeasured[-1]
+        return min(candidates, key=lambda size: (self.estimate(size, remaining), -size))
+
+    def prefetch(self, size: int, remaining: Optional[int] = None) -> int:
+        """How many pages to fetch ahead of the caller"""
+        latency = self.latency.get(size)
+        if (remaining is not None and remaining <= size) or not latency or not self.consumer:
+            return 0
+        if self.consumer < 0.1 * latency:
+            return 0
+        if self.jitter.get(size, 0.0) > 0.5 * latency:
+            return min(2, self.max_prefetch)
+        return min(1, self.max_prefetch)
+
+    def snapshot(self) -> Dict:
+        """Current measurements and choices, for instrumentation"""
+        size = self.choose()
+        return {
+            "page_size": size,
+            "prefetch": self.prefetch(size),
+            "typical_total": round(self.total) if self.total is not None else None,
+            "consumer_seconds": round(self.consumer, 4) if self.consumer is not None else None,
+            "sizes": {
+                str(size): {"pages": self.pages[size], "latency": round(self.latency[size], 4),
+                            "bytes": round(self.bytes[size])}
+                for size in self.sizes if size in self.pages
+            }
+        }
+
+
+async def prefetched(pages: AsyncIterator, depth: int) -> AsyncIterator:
+    """Iterate `pages` from a background task that runs up to `depth` pages ahead"""
+    queue = asyncio.Queue(maxsize=depth)
+    done = object()
+
+    async def produce():
+        try:
+            async for page in pages:
+                await queue.put((page, None))
+            await queue.put((done, None))
+        except Exception as e:
+            await queue.put((done, e))
+        finally:
+            await pages.aclose()
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            page, error = await queue.get()
+            if page is done:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        producer.cancel()
+        with suppress(asyncio.CancelledError):
+            await producer